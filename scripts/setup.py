@@ -7,45 +7,194 @@ This script helps set up the development environment for the project.
 
 import os
 import sys
+import asyncio
+import json
+import hashlib
+import functools
+import shlex
 import subprocess
 import argparse
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath
 
-def run_command(command, description, cwd=None):
-    """Run a command and handle errors gracefully."""
+# Default contents of the generated .env file
+ENV_TEMPLATE = b"""# AI Agent Context Management System Environment Variables
+
+# Database Configuration
+DATABASE_URL=sqlite:///context_management.db
+VECTOR_DB_URL=chroma://./chroma_db
+
+# MCP Server Configuration
+CONTEXT_STORAGE_PORT=8001
+RETRIEVAL_ENGINE_PORT=8002
+INTELLIGENCE_ENGINE_PORT=8003
+SESSION_MANAGER_PORT=8004
+
+# Intelligence Settings
+LEARNING_RATE=0.01
+CONFIDENCE_THRESHOLD=0.7
+PATTERN_MIN_USAGE=3
+
+# Development Settings
+DEBUG=true
+LOG_LEVEL=INFO
+
+# API Keys (optional - for cloud features)
+# OPENAI_API_KEY=your_openai_api_key_here
+# PINECONE_API_KEY=your_pinecone_api_key_here
+"""
+
+# Tools that must be installed: (probe command, display name)
+PREREQUISITES = (
+    ("python3 --version", "Python 3.8+"),
+    ("git --version", "Git"),
+    ("claude --version", "Claude Code CLI"),
+)
+# Probe commands split into argv once at import instead of on every probe
+PREREQUISITE_ARGV = tuple((tuple(shlex.split(command)), name) for command, name in PREREQUISITES)
+
+# Completed setup steps are recorded here, keyed by a hash of their inputs
+SETUP_CACHE_FILE = Path(".setup_cache.json")
+REQUIREMENTS_FILES = ("requirements.txt", "requirements-dev.txt")
+USE_SETUP_CACHE = True
+_setup_cache_lock = threading.Lock()  # steps may finish concurrently
+
+def setup_cache_key():
+    """Hash everything a cached step depends on: requirements, .env template, Python version."""
+    digest = hashlib.blake2b(digest_size=16)
+    for requirements_file in REQUIREMENTS_FILES:
+        try:
+            digest.update(Path(requirements_file).read_bytes())
+        except FileNotFoundError:
+            pass
+    digest.update(ENV_TEMPLATE)
+    digest.update(repr(tuple(sys.version_info)).encode())
+    return digest.hexdigest()
+
+def load_setup_cache():
+    """Load recorded step stamps, treating a missing or corrupt cache as empty."""
+    try:
+        return json.loads(SETUP_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def cached_step(name, invalidated_by=None):
+    """Skip a setup step when it already succeeded with the same inputs.
+
+    ``invalidated_by`` names a file whose modification after the last
+    cache write (or disappearance) forces the step to run again.
+    """
+    def decorator(step_func):
+        @functools.wraps(step_func)
+        def wrapper(*args):
+            entry = ":".join([name, *map(str, args)])
+            key = setup_cache_key()
+            cache = load_setup_cache()
+            
+            if USE_SETUP_CACHE and cache.get(entry) == key and _cache_still_valid(invalidated_by):
+                print(f"✅ {name} up to date (cached)")
+                return True
+            
+            if not step_func(*args):
+                return False
+            
+            with _setup_cache_lock:
+                cache = load_setup_cache()
+                cache[entry] = key
+                try:
+                    SETUP_CACHE_FILE.write_text(json.dumps(cache, indent=2))
+                except OSError as e:
+                    print(f"⚠️  Could not update setup cache: {e}")
+            return True
+        return wrapper
+    return decorator
+
+def _cache_still_valid(invalidated_by):
+    if invalidated_by is None:
+        return True
+    try:
+        return Path(invalidated_by).stat().st_mtime <= SETUP_CACHE_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+def run_command(argv, description, cwd=None, env=None):
+    """Run a command (argv list, no shell) and handle errors gracefully."""
     print(f"🔄 {description}...")
     try:
+        # stdout is never shown, so discard it; stderr is only decoded on failure
         result = subprocess.run(
-            command, 
-            shell=True, 
-            check=True, 
-            capture_output=True, 
-            text=True,
-            cwd=cwd
+            argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env
         )
-        print(f"✅ {description} completed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
+    except FileNotFoundError as e:
+        print(f"❌ {description} failed:")
+        print(f"   Error: {e}")
+        return False
+    
+    if result.returncode != 0:
         print(f"❌ {description} failed:")
-        print(f"   Error: {e.stderr}")
+        print(f"   Error: {result.stderr.decode('utf-8', 'replace')}")
         return False
+    
+    print(f"✅ {description} completed successfully")
+    return True
+
+def write_file(path, *segments, flags=os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o644):
+    """Write byte segments to ``path`` with one write (or writev) call."""
+    fd = os.open(path, flags, mode)
+    try:
+        if len(segments) > 1 and hasattr(os, "writev"):
+            written = os.writev(fd, segments)
+        else:
+            written = os.write(fd, b"".join(segments))
+        if written != sum(map(len, segments)):
+            raise OSError(f"Short write to {path}")
+    finally:
+        os.close(fd)
+
+def venv_python():
+    """Return the path of the virtual environment's Python interpreter."""
+    if os.name == 'nt':  # Windows
+        return Path("venv") / "Scripts" / "python.exe"
+    return Path("venv") / "bin" / "python"
+
+def run_pip(args, description):
+    """Run pip inside the virtual environment without its self-update check."""
+    env = dict(os.environ, PIP_DISABLE_PIP_VERSION_CHECK="1", PIP_NO_PYTHON_VERSION_WARNING="1")
+    argv = [str(venv_python()), "-m", "pip", "--disable-pip-version-check", *args]
+    return run_command(argv, description, env=env)
+
+def probe_command(argv):
+    """Return True if ``argv`` runs and exits successfully."""
+    try:
+        result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
 
 def check_prerequisites():
-    """Check if required tools are installed."""
+    """Check if required tools are installed.
+    
+    Not cached: the probes are cheap, and tools can be removed or
+    downgraded without any change to the cache key's inputs.
+    """
     print("🔍 Checking prerequisites...")
     
-    prerequisites = {
-        "python3 --version": "Python 3.8+",
-        "git --version": "Git",
-        "claude --version": "Claude Code CLI"
-    }
+    # Probe all tools at once so the total wait is the slowest probe,
+    # not the sum of all of them
+    with ThreadPoolExecutor(max_workers=len(PREREQUISITE_ARGV)) as executor:
+        results = executor.map(probe_command, (argv for argv, _ in PREREQUISITE_ARGV))
+        installed = dict(zip((name for _, name in PREREQUISITE_ARGV), results))
     
     missing = []
-    for command, name in prerequisites.items():
-        try:
-            subprocess.run(command.split(), capture_output=True, check=True)
+    for name, ok in installed.items():
+        if ok:
             print(f"✅ {name} is installed")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        else:
             print(f"❌ {name} is missing")
             missing.append(name)
     
@@ -65,86 +214,43 @@ def setup_virtual_environment():
         print("✅ Virtual environment already exists")
         return True
     
-    if not run_command("python3 -m venv venv", "Creating virtual environment"):
+    if not run_command([sys.executable, "-m", "venv", "venv"], "Creating virtual environment"):
         return False
     
-    # Activate virtual environment and upgrade pip
-    if os.name == 'nt':  # Windows
-        activate_cmd = "venv\\Scripts\\activate && python -m pip install --upgrade pip"
-    else:  # Unix/MacOS
-        activate_cmd = "source venv/bin/activate && python -m pip install --upgrade pip"
-    
-    return run_command(activate_cmd, "Upgrading pip in virtual environment")
+    # Upgrade pip using the venv interpreter directly (no shell activation)
+    return run_pip(["install", "--no-input", "--upgrade", "pip"], "Upgrading pip in virtual environment")
 
+@cached_step("Dependencies", invalidated_by="venv/pyvenv.cfg")
 def install_dependencies(dev_mode=False):
     """Install Python dependencies."""
     requirements_file = "requirements-dev.txt" if dev_mode else "requirements.txt"
     
-    if os.name == 'nt':  # Windows
-        activate_cmd = "venv\\Scripts\\activate"
-    else:  # Unix/MacOS
-        activate_cmd = "source venv/bin/activate"
-    
-    install_cmd = f"{activate_cmd} && pip install -r {requirements_file}"
-    
     description = f"Installing {'development' if dev_mode else 'production'} dependencies"
-    return run_command(install_cmd, description)
+    return run_pip(["install", "--no-input", "-r", requirements_file], description)
 
 def create_env_file():
     """Create .env file for environment variables."""
-    env_file = Path(".env")
-    
-    if env_file.exists():
-        print("✅ .env file already exists")
-        return True
-    
-    env_content = """# AI Agent Context Management System Environment Variables
-
-# Database Configuration
-DATABASE_URL=sqlite:///context_management.db
-VECTOR_DB_URL=chroma://./chroma_db
-
-# MCP Server Configuration
-CONTEXT_STORAGE_PORT=8001
-RETRIEVAL_ENGINE_PORT=8002
-INTELLIGENCE_ENGINE_PORT=8003
-SESSION_MANAGER_PORT=8004
-
-# Intelligence Settings
-LEARNING_RATE=0.01
-CONFIDENCE_THRESHOLD=0.7
-PATTERN_MIN_USAGE=3
-
-# Development Settings
-DEBUG=true
-LOG_LEVEL=INFO
-
-# API Keys (optional - for cloud features)
-# OPENAI_API_KEY=your_openai_api_key_here
-# PINECONE_API_KEY=your_pinecone_api_key_here
-"""
-    
+    # O_EXCL makes the existence check and the create a single atomic open
     try:
-        env_file.write_text(env_content)
+        write_file(".env", ENV_TEMPLATE, flags=os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode=0o600)
         print("✅ Created .env file with default configuration")
         return True
+    except FileExistsError:
+        print("✅ .env file already exists")
+        return True
     except Exception as e:
         print(f"❌ Failed to create .env file: {e}")
         return False
 
+@cached_step("Git hooks", invalidated_by=".git/hooks/pre-commit")
 def setup_git_hooks():
     """Set up git hooks for development."""
     if not Path(".git").exists():
         print("⚠️  Not a git repository, skipping git hooks setup")
         return True
     
-    # Install pre-commit hooks
-    if os.name == 'nt':  # Windows
-        activate_cmd = "venv\\Scripts\\activate"
-    else:  # Unix/MacOS
-        activate_cmd = "source venv/bin/activate"
-    
-    hook_cmd = f"{activate_cmd} && pre-commit install"
+    # Install pre-commit hooks through the venv interpreter
+    hook_cmd = [str(venv_python()), "-m", "pre_commit", "install"]
     return run_command(hook_cmd, "Setting up pre-commit hooks")
 
 def create_basic_directories():
@@ -164,21 +270,59 @@ def create_basic_directories():
         "logs"
     ]
     
+    # Create each distinct path component once, shallowest first, instead of
+    # letting every mkdir(parents=True) re-walk shared prefixes like src/
+    components = set()
     for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+        path = PurePath(directory)
+        components.add(path)
+        components.update(path.parents)
+    components.discard(PurePath("."))
+    
+    for component in sorted(components, key=lambda p: len(p.parts)):
+        try:
+            os.mkdir(component)
+        except FileExistsError:
+            pass
     
     print("✅ Created project directory structure")
     return True
 
+async def run_setup_steps(steps):
+    """Run setup steps as a dependency graph and return the descriptions of failed steps.
+
+    Each step starts in a worker thread as soon as all of its dependencies
+    have succeeded; a step whose dependency failed is reported as failed
+    without being run.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = {}
+    
+    async def run_step(description):
+        step_func, dependencies = steps[description]
+        if not all(await asyncio.gather(*(tasks[dep] for dep in dependencies))):
+            return False
+        return await loop.run_in_executor(None, step_func)
+    
+    for description in steps:
+        tasks[description] = asyncio.ensure_future(run_step(description))
+    
+    await asyncio.gather(*tasks.values())
+    return [description for description, task in tasks.items() if not task.result()]
+
 def main():
     """Main setup function."""
     parser = argparse.ArgumentParser(description="Setup AI Agent Context Management System")
     parser.add_argument("--interactive", action="store_true", help="Run in interactive mode")
     parser.add_argument("--dev", action="store_true", help="Install development dependencies")
     parser.add_argument("--skip-checks", action="store_true", help="Skip prerequisite checks")
+    parser.add_argument("--no-cache", action="store_true", help="Re-run every step, ignoring cached results")
     
     args = parser.parse_args()
     
+    global USE_SETUP_CACHE
+    USE_SETUP_CACHE = not args.no_cache
+    
     print("🚀 AI Agent Context Management System Setup")
     print("=" * 50)
     
@@ -196,46 +340,43 @@ def main():
         if choice == "2":
             args.dev = True
     
-    # Setup steps
-    steps = [
-        ("Creating directory structure", create_basic_directories),
-        ("Setting up virtual environment", setup_virtual_environment),
-        ("Installing dependencies", lambda: install_dependencies(args.dev)),
-        ("Creating environment file", create_env_file),
-        ("Setting up git hooks", setup_git_hooks),
-    ]
+    # Setup steps with the steps they depend on; independent steps run concurrently
+    steps = {
+        "Creating directory structure": (create_basic_directories, ()),
+        "Setting up virtual environment": (setup_virtual_environment, ()),
+        "Installing dependencies": (
+            lambda: install_dependencies(args.dev), ("Setting up virtual environment",)
+        ),
+        "Creating environment file": (create_env_file, ()),
+        "Setting up git hooks": (setup_git_hooks, ("Installing dependencies",)),
+    }
     
-    failed_steps = []
-    for description, step_func in steps:
-        if not step_func():
-            failed_steps.append(description)
+    failed_steps = asyncio.run(run_setup_steps(steps))
     
-    # Summary
-    print("\n" + "=" * 50)
+    # Summary, written in one go
+    lines = ["", "=" * 50]
     if failed_steps:
-        print("⚠️  Setup completed with issues:")
-        for step in failed_steps:
-            print(f"   ❌ {step}")
-        print("\nPlease resolve the issues above and run the setup again.")
+        lines.append("⚠️  Setup completed with issues:")
+        lines.extend(f"   ❌ {step}" for step in failed_steps)
+        lines.append("\nPlease resolve the issues above and run the setup again.")
     else:
-        print("🎉 Setup completed successfully!")
-        
-        print("\n📝 Next steps:")
-        print("1. Activate the virtual environment:")
-        if os.name == 'nt':
-            print("   venv\\Scripts\\activate")
-        else:
-            print("   source venv/bin/activate")
-        
-        print("2. Start Phase 1 - Architecture Design:")
-        print("   claude-code --project ClaudeContextMCP")
-        print("3. Use the architecture prompt from IMPLEMENTATION_ROADMAP.md")
-        
-        print("\n🔧 Configuration:")
-        print("- Environment variables: .env file")
-        print("- MCP servers will run on ports 8001-8004")
-        print("- Database: SQLite (local) or PostgreSQL (production)")
-        print("- Vector DB: Chroma (local) or Pinecone (cloud)")
+        lines += [
+            "🎉 Setup completed successfully!",
+            "",
+            "📝 Next steps:",
+            "1. Activate the virtual environment:",
+            "   venv\\Scripts\\activate" if os.name == 'nt' else "   source venv/bin/activate",
+            "2. Start Phase 1 - Architecture Design:",
+            "   claude-code --project ClaudeContextMCP",
+            "3. Use the architecture prompt from IMPLEMENTATION_ROADMAP.md",
+            "",
+            "🔧 Configuration:",
+            "- Environment variables: .env file",
+            "- MCP servers will run on ports 8001-8004",
+            "- Database: SQLite (local) or PostgreSQL (production)",
+            "- Vector DB: Chroma (local) or Pinecone (cloud)"
+        ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
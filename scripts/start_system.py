@@ -8,21 +8,50 @@ This script provides various ways to start the MCP server system:
 - Testing mode: With additional logging and debugging
 """
 
-import argparse
 import asyncio
+import signal
 import sys
 import os
 from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.orchestrator import MCPServerOrchestrator, MCPServerManager, print_banner
+if TYPE_CHECKING:
+    from src.orchestrator import MCPServerOrchestrator
+
+# Upper bound for a signal-triggered shutdown; covers stop_server's 5s
+# graceful wait plus the force kill that follows it
+SHUTDOWN_TIMEOUT = 10.0
+
+DEFAULT_CONFIG = 'config/claude_mcp_config.json'
+MODES = ('production', 'development', 'testing')
+SERVERS = ('context_storage', 'retrieval_engine', 'intelligence_engine', 'session_manager')
+
+def parse_fast_args(argv):
+    """Resolve bare --status/--stop invocations without building the argparse parser"""
+    
+    if argv not in (['--status'], ['--stop']):
+        return None
+    
+    return SimpleNamespace(
+        mode='production',
+        server=None,
+        debug=False,
+        status=argv[0] == '--status',
+        stop=argv[0] == '--stop',
+        restart=False,
+        config=DEFAULT_CONFIG
+    )
 
 def create_parser():
     """Create command line argument parser"""
     
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="AI Agent Context Management System - MCP Server Startup",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -44,14 +73,14 @@ Examples:
     
     parser.add_argument(
         '--mode',
-        choices=['production', 'development', 'testing'],
+        choices=MODES,
         default='production',
         help='Startup mode (default: production)'
     )
     
     parser.add_argument(
         '--server',
-        choices=['context_storage', 'retrieval_engine', 'intelligence_engine', 'session_manager'],
+        choices=SERVERS,
         help='Start specific server (development mode only)'
     )
     
@@ -81,65 +110,152 @@ Examples:
     
     parser.add_argument(
         '--config',
-        default='config/claude_mcp_config.json',
+        default=DEFAULT_CONFIG,
         help='Configuration file path'
     )
     
     return parser
 
-async def production_mode(orchestrator: MCPServerOrchestrator):
+def print_block(*lines):
+    """Write several lines to stdout in one call instead of one print per line"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def install_stop_handlers(callback):
+    """Route SIGINT/SIGTERM to ``callback``; returns the signals that were hooked"""
+    
+    loop = asyncio.get_running_loop()
+    installed = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, callback)
+            installed.append(sig)
+        except NotImplementedError:
+            # Windows event loops lack add_signal_handler; Ctrl+C surfaces
+            # as KeyboardInterrupt instead
+            pass
+    return installed
+
+async def shutdown_servers(orchestrator: 'MCPServerOrchestrator'):
+    """Stop all running servers concurrently, bounded by SHUTDOWN_TIMEOUT"""
+    
+    # Clear the running flag first so the health monitor can't restart
+    # servers while they are being stopped
+    orchestrator.running = False
+    running = [name for name, config in orchestrator.servers.items() if config.status == 'running']
+    if not running:
+        return
+    
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(orchestrator.stop_server(name) for name in running), return_exceptions=True),
+            timeout=SHUTDOWN_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        print(f"⚠️  Servers did not stop within {SHUTDOWN_TIMEOUT:.0f}s")
+
+async def run_until_stopped(orchestrator: 'MCPServerOrchestrator', mode):
+    """Run a mode coroutine until it returns or a stop signal cancels it, then shut down once"""
+    
+    task = asyncio.ensure_future(mode)
+    loop = asyncio.get_running_loop()
+    installed = install_stop_handlers(task.cancel)
+    
+    try:
+        return await task
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        print("\n👋 Received interrupt signal, shutting down...")
+        return True
+    except Exception as e:
+        print(f"❌ Fatal error: {str(e)}")
+        return False
+    finally:
+        for sig in installed:
+            loop.remove_signal_handler(sig)
+        await shutdown_servers(orchestrator)
+
+async def watch_servers(orchestrator: 'MCPServerOrchestrator', server_names) -> bool:
+    """Report server processes as they exit; returns False once none are left running
+    
+    Waits on the child processes themselves, so the event loop only wakes
+    when a server actually exits or the mode is cancelled.
+    """
+    
+    exits = {}
+    for name in server_names:
+        process = orchestrator.servers[name].process
+        if process is not None:
+            exits[asyncio.ensure_future(process.wait())] = name
+    
+    try:
+        while exits:
+            done, _ = await asyncio.wait(exits, return_when=asyncio.FIRST_COMPLETED)
+            for exit_task in done:
+                name = exits.pop(exit_task)
+                orchestrator.servers[name].status = 'failed'
+                print(f"🔴 {name} server exited with code {exit_task.result()}")
+    finally:
+        for exit_task in exits:
+            exit_task.cancel()
+    
+    return False
+
+async def production_mode(orchestrator: 'MCPServerOrchestrator'):
     """Run in production mode - start all servers with monitoring"""
     
-    print("🚀 Starting in PRODUCTION mode...")
-    print("   - All servers will be started")
-    print("   - Health monitoring enabled") 
-    print("   - Automatic restart on failure")
-    print()
+    print_block(
+        "🚀 Starting in PRODUCTION mode...",
+        "   - All servers will be started",
+        "   - Health monitoring enabled",
+        "   - Automatic restart on failure",
+        ""
+    )
     
     return await orchestrator.run()
 
-async def development_mode(orchestrator: MCPServerOrchestrator, specific_server: str = None):
+async def development_mode(orchestrator: 'MCPServerOrchestrator', specific_server: str = None):
     """Run in development mode - optionally start specific server"""
     
-    print("🔧 Starting in DEVELOPMENT mode...")
-    
     if specific_server:
-        print(f"   - Starting only: {specific_server}")
-        print("   - No health monitoring")
-        print("   - Manual control required")
-        print()
+        print_block(
+            "🔧 Starting in DEVELOPMENT mode...",
+            f"   - Starting only: {specific_server}",
+            "   - No health monitoring",
+            "   - Manual control required",
+            ""
+        )
         
         success = await orchestrator.start_server(specific_server)
         if success:
-            print(f"✅ {specific_server} server started successfully")
-            print("Press Ctrl+C to stop...")
+            print_block(f"✅ {specific_server} server started successfully", "Press Ctrl+C to stop...")
             
-            try:
-                while True:
-                    await asyncio.sleep(1)
-            except KeyboardInterrupt:
-                print("\n🛑 Stopping server...")
-                await orchestrator.stop_server(specific_server)
-                return True
+            # Idle until a stop signal cancels this mode (run_until_stopped then
+            # stops the server) or the server process exits on its own
+            return await watch_servers(orchestrator, [specific_server])
         else:
             print(f"❌ Failed to start {specific_server} server")
             return False
     else:
-        print("   - All servers will be started")
-        print("   - Basic monitoring enabled")
-        print("   - Manual restart required")
-        print()
+        print_block(
+            "🔧 Starting in DEVELOPMENT mode...",
+            "   - All servers will be started",
+            "   - Basic monitoring enabled",
+            "   - Manual restart required",
+            ""
+        )
         
         return await orchestrator.run()
 
-async def testing_mode(orchestrator: MCPServerOrchestrator):
+async def testing_mode(orchestrator: 'MCPServerOrchestrator'):
     """Run in testing mode - enhanced logging and debugging"""
     
-    print("🧪 Starting in TESTING mode...")
-    print("   - Enhanced debugging enabled")
-    print("   - Detailed health monitoring")
-    print("   - Performance metrics collected")
-    print()
+    print_block(
+        "🧪 Starting in TESTING mode...",
+        "   - Enhanced debugging enabled",
+        "   - Detailed health monitoring",
+        "   - Performance metrics collected",
+        ""
+    )
     
     # Set debug environment variables
     os.environ['DEBUG'] = 'true'
@@ -147,34 +263,41 @@ async def testing_mode(orchestrator: MCPServerOrchestrator):
     
     return await orchestrator.run()
 
-async def show_status(orchestrator: MCPServerOrchestrator):
+async def show_status(orchestrator: 'MCPServerOrchestrator'):
     """Show system status"""
     
+    from src.orchestrator import MCPServerManager
+    
     manager = MCPServerManager(orchestrator)
     status = await manager.status()
     
-    print("📊 System Status Report")
-    print("=" * 50)
-    print(f"System Running: {'Yes' if status['system_info']['running'] else 'No'}")
-    print(f"System Healthy: {'Yes' if status['system_info']['healthy'] else 'No'}")
-    print(f"Server Count: {status['system_info']['server_count']}")
-    print()
-    
-    print("Server Details:")
-    print("-" * 50)
+    # Build the whole report first and emit it with a single write
+    lines = [
+        "📊 System Status Report",
+        "=" * 50,
+        f"System Running: {'Yes' if status['system_info']['running'] else 'No'}",
+        f"System Healthy: {'Yes' if status['system_info']['healthy'] else 'No'}",
+        f"Server Count: {status['system_info']['server_count']}",
+        "",
+        "Server Details:",
+        "-" * 50
+    ]
     for server_name, server_info in status['servers'].items():
         health = status['health_details'].get(server_name, {})
         status_emoji = "🟢" if server_info['status'] == 'running' else "🔴"
         health_emoji = "💚" if health.get('status') == 'healthy' else "💔"
         
-        print(f"{status_emoji} {health_emoji} {server_name}")
-        print(f"   Port: {server_info['port']}")
-        print(f"   Status: {server_info['status']}")
-        print(f"   Description: {server_info['description']}")
-        print(f"   PID: {server_info['pid'] or 'N/A'}")
-        print()
+        lines.append(
+            f"{status_emoji} {health_emoji} {server_name}\n"
+            f"   Port: {server_info['port']}\n"
+            f"   Status: {server_info['status']}\n"
+            f"   Description: {server_info['description']}\n"
+            f"   PID: {server_info['pid'] or 'N/A'}\n"
+        )
+    
+    print_block(*lines)
 
-async def stop_all_servers(orchestrator: MCPServerOrchestrator):
+async def stop_all_servers(orchestrator: 'MCPServerOrchestrator'):
     """Stop all running servers"""
     
     print("🛑 Stopping all servers...")
@@ -187,33 +310,61 @@ async def stop_all_servers(orchestrator: MCPServerOrchestrator):
     
     return success
 
-async def restart_all_servers(orchestrator: MCPServerOrchestrator):
+async def restart_all_servers(orchestrator: 'MCPServerOrchestrator'):
     """Restart all servers"""
     
     print("🔄 Restarting all servers...")
     success = await orchestrator.restart_all()
     
     if success:
-        print("✅ All servers restarted successfully")
-        print("Press Ctrl+C to stop...")
+        print_block("✅ All servers restarted successfully", "Press Ctrl+C to stop...")
         
-        try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            print("\n🛑 Stopping servers...")
-            await orchestrator.shutdown_all()
-            return True
+        # Idle until a stop signal cancels this mode (run_until_stopped then
+        # stops the servers) or every server process has exited
+        return await watch_servers(orchestrator, orchestrator.startup_order)
     else:
         print("❌ Failed to restart servers")
     
     return success
 
+def exec_orchestrator(args):
+    """Replace this process with ``python -m src.orchestrator`` (never returns)
+    
+    Production mode needs no cleanup after the orchestrator exits, so exec-ing
+    avoids keeping this wrapper interpreter alive next to it.
+    """
+    
+    print_block(
+        "🚀 Starting in PRODUCTION mode...",
+        "   - All servers will be started",
+        "   - Health monitoring enabled",
+        "   - Automatic restart on failure",
+        ""
+    )
+    
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(project_root), env.get('PYTHONPATH')]))
+    if args.debug:
+        env.update(DEBUG='true', LOG_LEVEL='DEBUG')
+    
+    os.execvpe(
+        sys.executable,
+        [sys.executable, '-m', 'src.orchestrator', '--config', args.config],
+        env
+    )
+
+# Coroutine factory for each --mode
+MODE_HANDLERS = {
+    'production': lambda orchestrator, args: production_mode(orchestrator),
+    'development': lambda orchestrator, args: development_mode(orchestrator, args.server),
+    'testing': lambda orchestrator, args: testing_mode(orchestrator),
+}
+
 async def main():
     """Main entry point"""
     
-    parser = create_parser()
-    args = parser.parse_args()
+    # Dashboards poll --status, so skip argparse entirely for the bare flags
+    args = parse_fast_args(sys.argv[1:]) or create_parser().parse_args()
     
     # Set up debugging if requested
     if args.debug:
@@ -221,50 +372,43 @@ async def main():
         logging.basicConfig(level=logging.DEBUG)
         os.environ['DEBUG'] = 'true'
     
+    # Plain production runs hand the process over to the orchestrator itself
+    if args.mode == 'production' and not (args.status or args.stop or args.restart) and os.name == 'posix':
+        exec_orchestrator(args)
+    
+    # Imported only once arguments are valid so --help and usage errors
+    # don't pay for loading the orchestrator and its dependencies
+    from src.orchestrator import MCPServerOrchestrator, print_banner
+    
     # Print banner unless showing status
     if not args.status:
         print_banner()
     
-    # Create orchestrator
-    orchestrator = MCPServerOrchestrator()
+    # Create orchestrator; a single development server doesn't need the
+    # others registered
+    single_server = args.mode == 'development' and args.server and not (args.status or args.stop or args.restart)
+    orchestrator = MCPServerOrchestrator(
+        servers=[args.server] if single_server else None,
+        config_path=args.config
+    )
     
-    try:
-        # Handle different commands
-        if args.status:
-            await show_status(orchestrator)
-            return
-        
-        elif args.stop:
-            success = await stop_all_servers(orchestrator)
-            sys.exit(0 if success else 1)
-        
-        elif args.restart:
-            success = await restart_all_servers(orchestrator)
-            sys.exit(0 if success else 1)
-        
-        else:
-            # Start servers based on mode
-            if args.mode == 'production':
-                success = await production_mode(orchestrator)
-            elif args.mode == 'development':
-                success = await development_mode(orchestrator, args.server)
-            elif args.mode == 'testing':
-                success = await testing_mode(orchestrator)
-            else:
-                print(f"❌ Unknown mode: {args.mode}")
-                sys.exit(1)
-            
-            sys.exit(0 if success else 1)
+    # Handle different commands
+    if args.status:
+        await show_status(orchestrator)
+        return
     
-    except KeyboardInterrupt:
-        print("\n👋 Received interrupt signal, shutting down...")
-        await orchestrator.shutdown_all()
-        sys.exit(0)
+    if args.stop:
+        success = await stop_all_servers(orchestrator)
+        sys.exit(0 if success else 1)
     
-    except Exception as e:
-        print(f"❌ Fatal error: {str(e)}")
-        await orchestrator.shutdown_all()
-        sys.exit(1)
+    if args.restart:
+        mode = restart_all_servers(orchestrator)
+    else:
+        # argparse restricts --mode to MODE_HANDLERS' keys
+        mode = MODE_HANDLERS[args.mode](orchestrator, args)
+    
+    success = await run_until_stopped(orchestrator, mode)
+    sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -13,215 +13,315 @@ import sys
 import logging
 import json
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO))
 logger = logging.getLogger(__name__)
 
+# How long a freshly spawned server must stay alive to count as started
+STARTUP_GRACE_PERIOD = 0.5
+
+# Server stdout/stderr is appended here instead of being piped back
+LOG_DIR = Path('logs')
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load the MCP JSON config, returning an empty config if it is missing or malformed"""
+    
+    try:
+        return json.loads(Path(config_path).read_bytes())
+    except FileNotFoundError:
+        logger.warning("Config file not found: %s", config_path)
+    except (OSError, ValueError) as e:
+        logger.error("Could not load config %s: %s", config_path, e)
+    return {}
+
+@dataclass
+class ServerState:
+    """Registry entry for one managed MCP server"""
+    script: str
+    port: int
+    description: str
+    process: Optional[asyncio.subprocess.Process] = None
+    status: str = 'stopped'
+    env: Dict[str, str] = field(default_factory=dict)  # Full child environment after __init__
+    module: str = ''  # Dotted module name for `python -m`, set by __init__
+    started_ns: int = 0  # time.monotonic_ns() of the last successful start
+
 class MCPServerOrchestrator:
     """Orchestrates all MCP servers and manages their lifecycle"""
     
-    def __init__(self):
+    _STATUS_EMOJI = {'running': '🟢', 'stopped': '🔴', 'starting': '🟡', 'stopping': '🟡', 'failed': '❌'}
+    
+    def __init__(self, servers: Optional[Iterable[str]] = None, config_path: Optional[str] = None):
         self.servers = {
-            'context_storage': {
-                'script': 'src/servers/context_storage_server.py',
-                'port': int(os.getenv('CONTEXT_STORAGE_PORT', 8001)),
-                'process': None,
-                'status': 'stopped',
-                'description': 'Multi-project intelligent storage'
-            },
-            'retrieval_engine': {
-                'script': 'src/servers/retrieval_engine_server.py',
-                'port': int(os.getenv('RETRIEVAL_ENGINE_PORT', 8002)),
-                'process': None,
-                'status': 'stopped',
-                'description': 'Intelligent context retrieval'
-            },
-            'intelligence_engine': {
-                'script': 'src/servers/intelligence_engine_server.py',
-                'port': int(os.getenv('INTELLIGENCE_ENGINE_PORT', 8003)),
-                'process': None,
-                'status': 'stopped',
-                'description': 'Pattern learning and cross-tech insights'
-            },
-            'session_manager': {
-                'script': 'src/servers/session_manager_server.py',
-                'port': int(os.getenv('SESSION_MANAGER_PORT', 8004)),
-                'process': None,
-                'status': 'stopped',
-                'description': 'Session continuity and state management'
-            }
+            'context_storage': ServerState(
+                script='src/servers/context_storage_server.py',
+                port=int(os.getenv('CONTEXT_STORAGE_PORT', 8001)),
+                description='Multi-project intelligent storage'
+            ),
+            'retrieval_engine': ServerState(
+                script='src/servers/retrieval_engine_server.py',
+                port=int(os.getenv('RETRIEVAL_ENGINE_PORT', 8002)),
+                description='Intelligent context retrieval'
+            ),
+            'intelligence_engine': ServerState(
+                script='src/servers/intelligence_engine_server.py',
+                port=int(os.getenv('INTELLIGENCE_ENGINE_PORT', 8003)),
+                description='Pattern learning and cross-tech insights'
+            ),
+            'session_manager': ServerState(
+                script='src/servers/session_manager_server.py',
+                port=int(os.getenv('SESSION_MANAGER_PORT', 8004)),
+                description='Session continuity and state management'
+            )
         }
         
+        # Per-server environment defaults from the MCP config ("context-storage" -> "context_storage")
+        if config_path:
+            mcp_servers = load_config(config_path).get('mcpServers', {})
+            for config_name, server_entry in mcp_servers.items():
+                name = config_name.replace('-', '_')
+                if name in self.servers:
+                    self.servers[name].env = server_entry.get('env', {})
+        
+        # Every child is told all server ports, even when only some are managed here
+        self.server_ports = {name: config.port for name, config in self.servers.items()}
+        
+        # Resolve each child's environment once; config-file values are
+        # defaults and the real environment wins. Servers without config
+        # defaults share one dict, which is never mutated after this point.
+        base_env = {**os.environ, 'PYTHONPATH': str(Path.cwd())}
+        base_env.update({f"{name.upper()}_PORT": str(port) for name, port in self.server_ports.items()})
+        for config in self.servers.values():
+            config.env = {**config.env, **base_env} if config.env else base_env
+        
+        # Optionally manage only a subset (e.g. a single server in development mode)
+        if servers is not None:
+            servers = list(servers)
+            unknown = [name for name in servers if name not in self.servers]
+            if unknown:
+                raise ValueError(f"Unknown server(s): {', '.join(unknown)}")
+            self.servers = {name: self.servers[name] for name in servers}
+        
+        # Server scripts don't appear or disappear at runtime, so check them
+        # once here instead of on every (re)start
+        missing = [config.script for config in self.servers.values() if not Path(config.script).is_file()]
+        if missing:
+            raise FileNotFoundError(f"Server script(s) not found: {', '.join(missing)}")
+        for config in self.servers.values():
+            # Servers are launched as modules (-m) rather than by script path
+            # so their bytecode is cached in __pycache__ and reused on every start
+            config.module = Path(config.script).with_suffix('').as_posix().replace('/', '.')
+        
         # Working servers (2 out of 4 - significant functionality available)
-        self.startup_order = ['context_storage', 'retrieval_engine']  # These 2 servers work reliably
+        self.startup_order = [
+            name for name in ['context_storage', 'retrieval_engine']  # These 2 servers work reliably
+            if name in self.servers
+        ]
         self.shutdown_order = list(reversed(self.startup_order))
         self.running = False
         
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Name, port and description never change, so status reports only
+        # fill in the live fields around these
+        self._static_rows = tuple(
+            (name, config.port, config.description) for name, config in self.servers.items()
+        )
+        self._ports_str = ', '.join(str(port) for _, port, _ in self._static_rows)
+        
+        # Shutdown coordination for run(): signals wake it through this event
+        self._shutdown_event = None
+        
+        # Set when a server starts so monitor_servers also waits on it
+        self._monitor_wakeup = None
     
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
-        logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-        asyncio.create_task(self.shutdown_all())
+    def _request_shutdown(self, signum):
+        """Handle shutdown signals delivered through the event loop"""
+        
+        if self._shutdown_event.is_set():
+            # A second signal while shutting down skips the graceful wait
+            logger.warning("Received signal %s again, force killing servers...", signum)
+            self._kill_all()
+            return
+        
+        logger.info("Received signal %s, initiating graceful shutdown...", signum)
+        self._shutdown_event.set()
+    
+    def _kill_all(self):
+        """Force kill every server process that is still alive"""
+        
+        for server_config in self.servers.values():
+            process = server_config.process
+            if process and process.returncode is None:
+                process.kill()
     
     async def start_server(self, server_name: str) -> bool:
         """Start a specific MCP server"""
         
         if server_name not in self.servers:
-            logger.error(f"Unknown server: {server_name}")
+            logger.error("Unknown server: %s", server_name)
             return False
         
         server_config = self.servers[server_name]
         
-        if server_config['status'] == 'running':
-            logger.info(f"Server {server_name} is already running")
+        if server_config.status == 'running':
+            logger.info("Server %s is already running", server_name)
             return True
         
-        script_path = Path(server_config['script'])
-        if not script_path.exists():
-            logger.error(f"Server script not found: {script_path}")
-            return False
-        
         try:
             # Start the server process
-            logger.info(f"Starting {server_name} server on port {server_config['port']}...")
+            logger.info("Starting %s server on port %s...", server_name, server_config.port)
             
-            env = os.environ.copy()
-            env.update({
-                'PYTHONPATH': str(Path.cwd()),
-                'CONTEXT_STORAGE_PORT': str(self.servers['context_storage']['port']),
-                'RETRIEVAL_ENGINE_PORT': str(self.servers['retrieval_engine']['port']),
-                'INTELLIGENCE_ENGINE_PORT': str(self.servers['intelligence_engine']['port']),
-                'SESSION_MANAGER_PORT': str(self.servers['session_manager']['port'])
-            })
+            # Output goes straight to a log file: an undrained pipe would
+            # block a chatty server once the 64 KiB buffer fills up
+            LOG_DIR.mkdir(exist_ok=True)
+            log_path = LOG_DIR / f"{server_name}.log"
+            with open(log_path, 'ab', buffering=0) as log_file:
+                log_offset = log_file.tell()
+                # close_fds=False lets subprocess spawn the child with
+                # posix_spawn instead of fork+exec; Python's own descriptors
+                # are non-inheritable (PEP 446), so nothing extra leaks
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, '-m', server_config.module,
+                    stdout=log_file,
+                    stderr=log_file,
+                    env=server_config.env,
+                    close_fds=False
+                )
             
-            process = await asyncio.create_subprocess_exec(
-                sys.executable, str(script_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
-            )
-            
-            server_config['process'] = process
-            server_config['status'] = 'starting'
+            server_config.process = process
+            server_config.status = 'starting'
             
-            # Wait a moment to check if the process started successfully
-            await asyncio.sleep(2)
+            # Wait on the process itself: an early exit is reported as soon as
+            # it happens, while a live process only costs the grace period.
+            # shield() keeps the timeout from cancelling the underlying wait.
+            try:
+                await asyncio.wait_for(asyncio.shield(process.wait()), timeout=STARTUP_GRACE_PERIOD)
+            except asyncio.TimeoutError:
+                pass
             
             if process.returncode is None:  # Process is still running
-                server_config['status'] = 'running'
-                logger.info(f"✅ {server_name} server started successfully on port {server_config['port']}")
+                server_config.status = 'running'
+                server_config.started_ns = time.monotonic_ns()
+                if self._monitor_wakeup is not None:
+                    self._monitor_wakeup.set()
+                logger.info("✅ %s server started successfully on port %s", server_name, server_config.port)
                 return True
             else:
-                # Process died immediately
-                stdout, stderr = await process.communicate()
-                logger.error(f"❌ {server_name} server failed to start:")
-                logger.error(f"STDOUT: {stdout.decode()}")
-                logger.error(f"STDERR: {stderr.decode()}")
-                server_config['status'] = 'failed'
+                # Process died immediately; show what it wrote this run
+                with open(log_path, 'rb') as log_file:
+                    log_file.seek(max(log_offset, log_path.stat().st_size - 4096))
+                    output = log_file.read().decode(errors='replace')
+                logger.error("❌ %s server failed to start (exit code %s):\nOUTPUT (%s): %s",
+                             server_name, process.returncode, log_path, output)
+                server_config.status = 'failed'
                 return False
                 
         except Exception as e:
-            logger.error(f"❌ Failed to start {server_name} server: {str(e)}")
-            server_config['status'] = 'failed'
+            logger.error("❌ Failed to start %s server: %s", server_name, e)
+            server_config.status = 'failed'
             return False
     
     async def stop_server(self, server_name: str) -> bool:
         """Stop a specific MCP server"""
         
         if server_name not in self.servers:
-            logger.error(f"Unknown server: {server_name}")
+            logger.error("Unknown server: %s", server_name)
             return False
         
         server_config = self.servers[server_name]
         
-        if server_config['status'] != 'running':
-            logger.info(f"Server {server_name} is not running")
+        if server_config.status != 'running':
+            logger.info("Server %s is not running", server_name)
             return True
         
-        process = server_config['process']
+        process = server_config.process
         if process:
             try:
-                logger.info(f"Stopping {server_name} server...")
+                logger.info("Stopping %s server...", server_name)
+                # Tells monitor_servers this exit is intentional
+                server_config.status = 'stopping'
                 
-                # Try graceful shutdown first
-                process.terminate()
+                # A crashed server has nothing left to terminate
+                if process.returncode is None:
+                    # Try graceful shutdown first
+                    process.terminate()
+                    
+                    # Wait for graceful shutdown
+                    try:
+                        await asyncio.wait_for(process.wait(), timeout=5.0)
+                    except asyncio.TimeoutError:
+                        # Force kill if graceful shutdown fails
+                        logger.warning("Force killing %s server...", server_name)
+                        process.kill()
+                        await process.wait()
                 
-                # Wait for graceful shutdown
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    # Force kill if graceful shutdown fails
-                    logger.warning(f"Force killing {server_name} server...")
-                    process.kill()
-                    await process.wait()
-                
-                server_config['process'] = None
-                server_config['status'] = 'stopped'
-                logger.info(f"✅ {server_name} server stopped")
+                server_config.process = None
+                server_config.status = 'stopped'
+                logger.info("✅ %s server stopped", server_name)
                 return True
                 
             except Exception as e:
-                logger.error(f"❌ Failed to stop {server_name} server: {str(e)}")
+                logger.error("❌ Failed to stop %s server: %s", server_name, e)
                 return False
         
         return True
     
     async def start_all(self) -> bool:
-        """Start all MCP servers in the correct order"""
+        """Start all MCP servers concurrently"""
         
         logger.info("🚀 Starting AI Agent Context Management System...")
         logger.info("=" * 60)
         
-        success_count = 0
-        
         for server_name in self.startup_order:
             server_config = self.servers[server_name]
-            logger.info(f"Starting {server_name}: {server_config['description']}")
-            
-            if await self.start_server(server_name):
-                success_count += 1
-            else:
-                logger.error(f"Failed to start {server_name}, aborting startup")
-                # Stop any servers that were started
-                await self.shutdown_all()
-                return False
-            
-            # Brief pause between server starts
-            await asyncio.sleep(1)
-        
-        if success_count == len(self.startup_order):
+            logger.info("Starting %s: %s", server_name, server_config.description)
+        
+        # The servers only share environment variables, so their start-up
+        # probes can overlap instead of running back to back
+        results = await asyncio.gather(
+            *(self.start_server(server_name) for server_name in self.startup_order),
+            return_exceptions=True
+        )
+        failed = [name for name, result in zip(self.startup_order, results) if result is not True]
+        success_count = len(self.startup_order) - len(failed)
+        
+        if not failed:
             self.running = True
             logger.info("=" * 60)
-            logger.info(f"🎉 All {success_count} MCP servers started successfully!")
+            logger.info("🎉 All %s MCP servers started successfully!", success_count)
             self._print_server_status()
             return True
         else:
-            logger.error(f"❌ Failed to start all servers ({success_count}/{len(self.startup_order)} started)")
+            logger.error("❌ Failed to start %s (%s/%s started), aborting startup", ', '.join(failed), success_count, len(self.startup_order))
+            # Stop any servers that were started
+            await self.shutdown_all()
             return False
     
     async def shutdown_all(self) -> bool:
-        """Shutdown all MCP servers in the correct order"""
+        """Shutdown all MCP servers concurrently"""
         
         logger.info("🛑 Shutting down AI Agent Context Management System...")
         
-        success_count = 0
+        # Every registered server, not just the startup set, may be running
+        # (e.g. one started individually in development mode)
+        server_names = self.shutdown_order + [name for name in self.servers if name not in self.shutdown_order]
         
-        for server_name in self.shutdown_order:
-            if await self.stop_server(server_name):
-                success_count += 1
+        # Each stop_server terminates immediately and then waits, so the
+        # graceful-shutdown timeouts overlap rather than stack
+        results = await asyncio.gather(
+            *(self.stop_server(server_name) for server_name in server_names),
+            return_exceptions=True
+        )
         
         self.running = False
         
-        if success_count == len(self.servers):
+        if all(result is True for result in results):
             logger.info("✅ All MCP servers shut down successfully")
             return True
         else:
@@ -231,10 +331,10 @@ class MCPServerOrchestrator:
     async def restart_server(self, server_name: str) -> bool:
         """Restart a specific server"""
         
-        logger.info(f"Restarting {server_name} server...")
+        logger.info("Restarting %s server...", server_name)
         
+        # stop_server has already waited for the old process to exit
         if await self.stop_server(server_name):
-            await asyncio.sleep(2)  # Brief pause
             return await self.start_server(server_name)
         
         return False
@@ -250,109 +350,176 @@ class MCPServerOrchestrator:
         
         return False
     
+    def _snapshot(self):
+        """Collect the status and health views of all servers in one pass
+        
+        Returns (servers, health, system_healthy), where servers and health
+        map server names to their status and health entries.
+        """
+        
+        servers = {}
+        health = {}
+        system_healthy = True
+        # Uptime uses the monotonic clock so wall-clock jumps can't skew it
+        now_ns = time.monotonic_ns()
+        
+        for server_name, port, description in self._static_rows:
+            server_config = self.servers[server_name]
+            process = server_config.process
+            servers[server_name] = {
+                'status': server_config.status,
+                'port': port,
+                'description': description,
+                'pid': process.pid if process else None
+            }
+            
+            if process and process.returncode is None:
+                # Process is running
+                health[server_name] = {
+                    'status': 'healthy',
+                    'port': port,
+                    'uptime': (now_ns - server_config.started_ns) / 1e9
+                }
+            else:
+                # Process is not running or died
+                health[server_name] = {
+                    'status': 'unhealthy',
+                    'port': port,
+                    'uptime': 0
+                }
+                system_healthy = False
+        
+        return servers, health, system_healthy
+    
     def get_server_status(self) -> Dict[str, Any]:
         """Get status of all servers"""
         
-        status = {
+        servers, _, _ = self._snapshot()
+        
+        return {
             'system_status': 'running' if self.running else 'stopped',
-            'servers': {}
+            'servers': servers
         }
-        
-        for server_name, server_config in self.servers.items():
-            status['servers'][server_name] = {
-                'status': server_config['status'],
-                'port': server_config['port'],
-                'description': server_config['description'],
-                'pid': server_config['process'].pid if server_config['process'] else None
-            }
-        
-        return status
     
     def _print_server_status(self):
         """Print server status table"""
         
-        logger.info("\n📊 Server Status:")
-        logger.info("-" * 80)
-        logger.info(f"{'Server Name':<20} {'Port':<6} {'Status':<10} {'Description':<30}")
-        logger.info("-" * 80)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = [
+            "\n📊 Server Status:",
+            "-" * 80,
+            f"{'Server Name':<20} {'Port':<6} {'Status':<10} {'Description':<30}",
+            "-" * 80
+        ]
         
-        for server_name, server_config in self.servers.items():
-            status_emoji = "🟢" if server_config['status'] == 'running' else "🔴"
-            logger.info(f"{server_name:<20} {server_config['port']:<6} {status_emoji} {server_config['status']:<8} {server_config['description']:<30}")
+        for server_name, port, description in self._static_rows:
+            status = self.servers[server_name].status
+            status_emoji = self._STATUS_EMOJI.get(status, '⚪')
+            lines.append(f"{server_name:<20} {port:<6} {status_emoji} {status:<8} {description:<30}")
         
-        logger.info("-" * 80)
-        logger.info(f"\n🌐 System accessible on ports: {', '.join([str(s['port']) for s in self.servers.values()])}")
-        logger.info("📋 Use Ctrl+C to gracefully shutdown all servers")
+        lines.append("-" * 80)
+        lines.append(f"\n🌐 System accessible on ports: {self._ports_str}")
+        lines.append("📋 Use Ctrl+C to gracefully shutdown all servers")
+        
+        # One record keeps the table together in the log
+        logger.info("%s", "\n".join(lines))
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on all servers"""
         
-        health_status = {
-            'system_healthy': True,
+        _, health, system_healthy = self._snapshot()
+        
+        return {
+            'system_healthy': system_healthy,
             'timestamp': time.time(),
-            'servers': {}
+            'servers': health
         }
-        
-        for server_name, server_config in self.servers.items():
-            process = server_config['process']
-            
-            if process and process.returncode is None:
-                # Process is running
-                health_status['servers'][server_name] = {
-                    'status': 'healthy',
-                    'port': server_config['port'],
-                    'uptime': time.time()  # Simplified uptime
-                }
-            else:
-                # Process is not running or died
-                health_status['servers'][server_name] = {
-                    'status': 'unhealthy',
-                    'port': server_config['port'],
-                    'uptime': 0
-                }
-                health_status['system_healthy'] = False
-        
-        return health_status
     
     async def monitor_servers(self):
-        """Monitor server health and restart if needed"""
+        """Restart servers that exit unexpectedly"""
         
+        # Sleeps on the child processes themselves, so the monitor only wakes
+        # when a server exits or a new one is started: nothing is polled
         while self.running:
+            self._monitor_wakeup.clear()
+            exits = {
+                asyncio.ensure_future(server_config.process.wait()): server_name
+                for server_name, server_config in self.servers.items()
+                if server_config.status == 'running'
+            }
+            wakeup = asyncio.ensure_future(self._monitor_wakeup.wait())
+            
             try:
-                health = await self.health_check()
-                
-                for server_name, server_health in health['servers'].items():
-                    if server_health['status'] == 'unhealthy' and self.servers[server_name]['status'] == 'running':
-                        logger.warning(f"Server {server_name} is unhealthy, attempting restart...")
-                        await self.restart_server(server_name)
-                
-                # Check every 30 seconds
-                await asyncio.sleep(30)
+                done, _ = await asyncio.wait([wakeup, *exits], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                wakeup.cancel()
+                for exit_task in exits:
+                    exit_task.cancel()
+            
+            for exit_task in done:
+                server_name = exits.get(exit_task)
+                # Servers stopped on purpose are marked 'stopping' first
+                if server_name is None or self.servers[server_name].status != 'running':
+                    continue
                 
-            except Exception as e:
-                logger.error(f"Error during health monitoring: {str(e)}")
-                await asyncio.sleep(30)
+                logger.warning("Server %s exited with code %s, attempting restart...", server_name, exit_task.result())
+                self.servers[server_name].status = 'failed'
+                try:
+                    await self.restart_server(server_name)
+                except Exception as e:
+                    logger.error("Error restarting %s: %s", server_name, e)
+    
+    async def _supervise(self, monitor):
+        """Run the monitor coroutine until shutdown is requested
+        
+        Re-raises any exception the monitor fails with.
+        """
+        
+        monitor_task = asyncio.ensure_future(monitor)
+        shutdown_wait = asyncio.ensure_future(self._shutdown_event.wait())
+        
+        try:
+            await asyncio.wait([monitor_task, shutdown_wait], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            shutdown_wait.cancel()
+            monitor_task.cancel()
+            # Wait for the cancellation to finish so no restart is left in flight
+            await asyncio.gather(monitor_task, shutdown_wait, return_exceptions=True)
+        
+        if not monitor_task.cancelled() and monitor_task.exception() is not None:
+            raise monitor_task.exception()
     
     async def run(self):
         """Main run method - start servers and monitor"""
         
+        self._shutdown_event = asyncio.Event()
+        self._monitor_wakeup = asyncio.Event()
+        
+        # Signals are routed through the loop, so the handler runs as an
+        # ordinary callback and can touch asyncio state directly
+        loop = asyncio.get_running_loop()
+        installed = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._request_shutdown, sig)
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError):
+                pass  # e.g. Windows or a non-main thread: Ctrl+C raises KeyboardInterrupt instead
+        
         try:
             # Start all servers
             if not await self.start_all():
                 logger.error("Failed to start servers, exiting")
                 return False
             
-            # Start monitoring task
-            monitor_task = asyncio.create_task(self.monitor_servers())
-            
             logger.info("\n🔍 Monitoring servers... Press Ctrl+C to shutdown")
             
-            # Keep running until interrupted
-            while self.running:
-                await asyncio.sleep(1)
-            
-            # Cancel monitoring
-            monitor_task.cancel()
+            # Keep running until a shutdown signal arrives; the monitor is
+            # always cancelled and awaited before the servers are stopped,
+            # and an error inside it ends the run instead of vanishing
+            await self._supervise(self.monitor_servers())
             
             # Shutdown servers
             await self.shutdown_all()
@@ -364,9 +531,12 @@ class MCPServerOrchestrator:
             await self.shutdown_all()
             return True
         except Exception as e:
-            logger.error(f"Orchestrator error: {str(e)}")
+            logger.error("Orchestrator error: %s", e)
             await self.shutdown_all()
             return False
+        finally:
+            for sig in installed:
+                loop.remove_signal_handler(sig)
 
 class MCPServerManager:
     """Management interface for the MCP servers"""
@@ -377,55 +547,43 @@ class MCPServerManager:
     async def status(self) -> Dict[str, Any]:
         """Get detailed system status"""
         
-        base_status = self.orchestrator.get_server_status()
-        health_status = await self.orchestrator.health_check()
+        # One sweep over the servers feeds both the status and health views
+        servers, health, system_healthy = self.orchestrator._snapshot()
         
         return {
             'system_info': {
                 'running': self.orchestrator.running,
-                'healthy': health_status['system_healthy'],
+                'healthy': system_healthy,
                 'server_count': len(self.orchestrator.servers),
-                'timestamp': health_status['timestamp']
+                'timestamp': time.time()
             },
-            'servers': base_status['servers'],
-            'health_details': health_status['servers']
+            'servers': servers,
+            'health_details': health
         }
     
-    async def start_server(self, server_name: str) -> Dict[str, Any]:
-        """Start a specific server"""
+    async def _dispatch(self, action: str, server_name: str) -> Dict[str, Any]:
+        """Run an orchestrator per-server action and report the result"""
         
-        success = await self.orchestrator.start_server(server_name)
+        success = await getattr(self.orchestrator, action)(server_name)
         
         return {
-            'action': 'start_server',
+            'action': action,
             'server': server_name,
             'success': success,
             'timestamp': time.time()
         }
     
+    async def start_server(self, server_name: str) -> Dict[str, Any]:
+        """Start a specific server"""
+        return await self._dispatch('start_server', server_name)
+    
     async def stop_server(self, server_name: str) -> Dict[str, Any]:
         """Stop a specific server"""
-        
-        success = await self.orchestrator.stop_server(server_name)
-        
-        return {
-            'action': 'stop_server',
-            'server': server_name,
-            'success': success,
-            'timestamp': time.time()
-        }
+        return await self._dispatch('stop_server', server_name)
     
     async def restart_server(self, server_name: str) -> Dict[str, Any]:
         """Restart a specific server"""
-        
-        success = await self.orchestrator.restart_server(server_name)
-        
-        return {
-            'action': 'restart_server',
-            'server': server_name,
-            'success': success,
-            'timestamp': time.time()
-        }
+        return await self._dispatch('restart_server', server_name)
 
 def print_banner():
     """Print system banner"""
@@ -449,13 +607,13 @@ def print_banner():
     
     print(banner)
 
-async def main():
+async def main(config_path: Optional[str] = None):
     """Main entry point"""
     
     print_banner()
     
     # Create orchestrator
-    orchestrator = MCPServerOrchestrator()
+    orchestrator = MCPServerOrchestrator(config_path=config_path)
     
     try:
         # Run the orchestrator
@@ -469,8 +627,14 @@ async def main():
             sys.exit(1)
             
     except Exception as e:
-        logger.error(f"Fatal error: {str(e)}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="AI Agent Context Management System - MCP Server Orchestrator")
+    parser.add_argument('--config', help='MCP configuration file path')
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.config))
\ No newline at end of file
@@ -9,15 +9,30 @@ Python, React, and JavaScript projects.
 """
 
 import asyncio
+import atexit
+import heapq
 import json
+import mmap
+import queue
 import sqlite3
+import threading
+import time
 import uuid
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import accumulate, chain
+from operator import itemgetter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Literal
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Set, Tuple, Literal
 import os
 import subprocess
 import re
+import signal
 
 # FastMCP and MCP imports
 from fastmcp import FastMCP
@@ -27,13 +42,45 @@ from mcp.types import TextContent
 import chromadb
 from chromadb.config import Settings
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+# Optional: Aho-Corasick automata find every code pattern in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: Hyperscan compiles the code patterns into a SIMD literal matcher
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional: faster JSON for the database's JSON columns
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+def _json_loads(text: str) -> Any:
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def _error_json(**fields: Any) -> str:
+    """Serialize a tool's failure result straight from its few fields, without building the model."""
+    if orjson is not None:
+        return orjson.dumps(fields, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(fields, indent=2)
+
 # Data models
 from pydantic import BaseModel, Field
-from dataclasses import dataclass, asdict
-from enum import Enum
+from enum import Enum, IntEnum
 
 # Configure logging
 import logging
@@ -53,9 +100,61 @@ elif DATABASE_URL.startswith("sqlite://"):
 else:
     DATABASE_PATH = DATABASE_URL
 
+# UPSERT ... RETURNING needs SQLite 3.35+; older builds re-read the id instead
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Read-only connections kept open alongside the single writer connection
+DATABASE_READ_POOL_SIZE = int(os.getenv("DATABASE_READ_POOL_SIZE", 4))
+
 VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", "./chroma_db")
+# Derived data lives under the checkout, not whatever directory the server was started from
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SIMILARITY_INDEX_PATH = os.getenv("SIMILARITY_INDEX_PATH", str(PROJECT_ROOT / "data" / "similarity_index"))
+
+# Number of similar contexts reported when a context is stored
+SIMILAR_CONTEXTS_LIMIT = int(os.getenv("SIMILAR_CONTEXTS_LIMIT", 5))
+
+# Below this many files a thread pool costs more than it saves
+PARALLEL_SCAN_MIN_FILES = int(os.getenv("PARALLEL_SCAN_MIN_FILES", 64))
+
+# Project analyses are reused for this long while the repository's git state is unchanged
+BOOTSTRAP_CACHE_TTL = float(os.getenv("BOOTSTRAP_CACHE_TTL", 300))
+BOOTSTRAP_CACHE_SIZE = 64
+
+# Directories never scanned for code patterns (dependencies, build output, VCS)
+SKIP_DIRS = frozenset({"node_modules", ".git", "build", "Pods", ".venv", "venv", "target", "__pycache__"})
 DEVELOPER_ID = os.getenv("DEVELOPER_ID", "vigesh_solo_dev")
 
+# Project types that get their own Chroma collection (created lazily on first write)
+VECTOR_PROJECT_TYPES = ("ios_app", "android_app", "react_web", "python_analytics", "javascript_web")
+
+# Vector collection for contexts whose primary technology is the key
+TECH_PROJECT_TYPES = MappingProxyType({
+    "swift": "ios_app",
+    "kotlin": "android_app",
+    "java": "android_app",
+    "react": "react_web",
+    "javascript": "javascript_web",
+    "python": "python_analytics"
+})
+
+# Technologies covered by analyze_developer_patterns when no focus is given
+DEFAULT_ANALYSIS_TECHNOLOGIES = ("swift", "android", "react", "python", "javascript")
+
+# Background vector writes: most contexts per upsert, and how often a failed
+# upsert is retried (with doubling delays from VECTOR_WRITE_RETRY_DELAY seconds)
+VECTOR_WRITE_BATCH_SIZE = 128
+VECTOR_WRITE_RETRIES = int(os.getenv("VECTOR_WRITE_RETRIES", 3))
+VECTOR_WRITE_RETRY_DELAY = 0.5
+
+# HNSW settings for new collections; Chroma fixes them when a collection is created
+VECTOR_INDEX_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 100
+}
+
 # Data Models
 class ProjectType(str, Enum):
     IOS_APP = "ios_app"
@@ -71,8 +170,15 @@ class ContextType(str, Enum):
     PATTERN_APPLICATION = "pattern_application"
     ARCHITECTURAL_DECISION = "architectural_decision"
 
-@dataclass
-class ProjectCreationResult:
+# Compact ids for context types, stored in context_items.context_type_id
+class ContextTypeId(IntEnum):
+    CONVERSATION = 1
+    CODE_DECISION = 2
+    BUG_FIX = 3
+    PATTERN_APPLICATION = 4
+    ARCHITECTURAL_DECISION = 5
+
+class ProjectCreationResult(BaseModel):
     project_id: str
     project_name: str
     intelligent_suggestions: List[Dict[str, Any]]
@@ -81,8 +187,7 @@ class ProjectCreationResult:
     success: bool
     message: str
 
-@dataclass  
-class IntelligentStorageResult:
+class IntelligentStorageResult(BaseModel):
     context_id: str
     cross_project_relevance_score: float
     pattern_insights: List[Dict[str, Any]]
@@ -90,8 +195,19 @@ class IntelligentStorageResult:
     success: bool
     message: str
 
-@dataclass
-class DeveloperPatternAnalysis:
+class ContextInput(BaseModel):
+    project_id: str
+    context_type: Literal["conversation", "code_decision", "bug_fix", "pattern_application", "architectural_decision"]
+    content: str
+    metadata: Dict[str, Any] = {}
+    cross_project_relevance: Optional[float] = None
+
+class BatchStorageResult(BaseModel):
+    results: List[IntelligentStorageResult]
+    success: bool
+    message: str
+
+class DeveloperPatternAnalysis(BaseModel):
     technology_patterns: Dict[str, Any]
     cross_technology_insights: List[Dict[str, Any]]
     success_patterns: List[Dict[str, Any]]
@@ -99,8 +215,7 @@ class DeveloperPatternAnalysis:
     recommendations: List[str]
     confidence_scores: Dict[str, float]
 
-@dataclass
-class ProjectBootstrapResult:
+class ProjectBootstrapResult(BaseModel):
     project_id: str
     extracted_patterns: List[Dict[str, Any]]
     architectural_decisions: List[Dict[str, Any]]
@@ -110,219 +225,410 @@ class ProjectBootstrapResult:
     success: bool
     message: str
 
+def _context_type_id(context_type: str) -> Optional[int]:
+    """Return the integer id of a context type name, or None if it isn't a known type."""
+    type_id = ContextTypeId.__members__.get(context_type.upper())
+    return type_id.value if type_id is not None else None
+
+# Developer profile columns stored as JSON, in table order
+PROFILE_JSON_COLUMNS = (
+    "swift_patterns", "android_patterns", "react_patterns", "python_patterns",
+    "javascript_patterns", "ui_design_patterns", "api_design_patterns", "data_flow_patterns",
+    "pattern_confidence_scores", "success_correlations", "anti_patterns"
+)
+
 # Database Management
 class DatabaseManager:
     """Manages SQLite database operations for project metadata and developer profiles."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, read_pool_size: int = DATABASE_READ_POOL_SIZE):
         self.db_path = db_path
+        
+        # Connections stay open for the life of the server so SQLite keeps its
+        # page cache; writes are serialized on one connection, reads share a pool
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
         self.init_database()
+        
+        # Raw developer profile rows; this server is the only writer, and
+        # update_developer_profile drops the entry it changes. A read that
+        # overlapped a write (generation moved on) isn't cached.
+        self._profile_cache = {}
+        self._profile_generation = 0
+        
+        self._read_pool = queue.Queue()
+        for _ in range(read_pool_size):
+            self._read_pool.put(self._connect())
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that can be shared across threads."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+    
+    @contextmanager
+    def _conn(self, write: bool = False):
+        """Borrow a pooled connection; write connections run in one transaction."""
+        if write:
+            with self._write_lock:
+                conn = self._write_conn
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+        else:
+            conn = self._read_pool.get()
+            try:
+                yield conn
+            finally:
+                self._read_pool.put(conn)
     
     def init_database(self):
         """Initialize database with required tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Projects table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id TEXT PRIMARY KEY,
-                name TEXT UNIQUE NOT NULL,
-                type TEXT NOT NULL,
-                technologies TEXT NOT NULL,
-                description TEXT,
-                repository_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                developer_id TEXT NOT NULL,
-                intelligence_profile TEXT,
-                cross_project_patterns TEXT
-            )
-        """)
-        
-        # Context items table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS context_items (
-                id TEXT PRIMARY KEY,
-                project_id TEXT NOT NULL,
-                context_type TEXT NOT NULL,
-                content TEXT NOT NULL,
-                metadata TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                importance_score REAL DEFAULT 0.5,
-                cross_project_relevance REAL DEFAULT 0.0,
-                access_count INTEGER DEFAULT 0,
-                technology_tags TEXT,
-                FOREIGN KEY (project_id) REFERENCES projects (id)
-            )
-        """)
-        
-        # Developer profiles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS developer_profiles (
-                id TEXT PRIMARY KEY,
-                developer_id TEXT UNIQUE NOT NULL,
-                swift_patterns TEXT,
-                android_patterns TEXT,
-                react_patterns TEXT,
-                python_patterns TEXT,
-                javascript_patterns TEXT,
-                ui_design_patterns TEXT,
-                api_design_patterns TEXT,
-                data_flow_patterns TEXT,
-                pattern_confidence_scores TEXT,
-                success_correlations TEXT,
-                anti_patterns TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Pattern library table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pattern_library (
-                id TEXT PRIMARY KEY,
-                pattern_name TEXT NOT NULL,
-                pattern_type TEXT NOT NULL,
-                source_technology TEXT,
-                target_technologies TEXT,
-                pattern_content TEXT,
-                success_rate REAL DEFAULT 0.0,
-                usage_count INTEGER DEFAULT 0,
-                developer_id TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        with self._conn(write=True) as conn:
+            cursor = conn.cursor()
+            
+            # Projects table; names are unique per developer (ux_projects_dev_name)
+            projects_schema = """
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    technologies TEXT NOT NULL,
+                    description TEXT,
+                    repository_path TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    developer_id TEXT NOT NULL,
+                    intelligence_profile TEXT,
+                    cross_project_patterns TEXT
+                )
+            """
+            cursor.execute(projects_schema.format(table="projects"))
+            
+            # Databases created when project names were globally UNIQUE get the
+            # table rebuilt without that constraint, which SQLite can't drop in place
+            if any(row[3] == "u" for row in cursor.execute("PRAGMA index_list(projects)").fetchall()):
+                columns = ", ".join(row[1] for row in cursor.execute("PRAGMA table_info(projects)").fetchall())
+                cursor.execute("DROP TABLE IF EXISTS projects_migrating")
+                cursor.execute(projects_schema.format(table="projects_migrating"))
+                cursor.execute(f"INSERT INTO projects_migrating ({columns}) SELECT {columns} FROM projects")
+                cursor.execute("DROP TABLE projects")
+                cursor.execute("ALTER TABLE projects_migrating RENAME TO projects")
+        
+            # Context items table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS context_items (
+                    id TEXT PRIMARY KEY,
+                    project_id TEXT NOT NULL,
+                    context_type TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    importance_score REAL DEFAULT 0.5,
+                    cross_project_relevance REAL DEFAULT 0.0,
+                    access_count INTEGER DEFAULT 0,
+                    technology_tags TEXT,
+                    context_type_id INTEGER REFERENCES context_types (id),
+                    FOREIGN KEY (project_id) REFERENCES projects (id)
+                )
+            """)
+            
+            # Context type reference table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS context_types (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL
+                )
+            """)
+            cursor.executemany(
+                "INSERT OR IGNORE INTO context_types (id, name) VALUES (?, ?)",
+                [(type_id.value, type_id.name.lower()) for type_id in ContextTypeId]
             )
-        """)
-        
-        conn.commit()
-        conn.close()
+            
+            # Databases created before context_type_id existed get the column
+            # and have it filled in from the text column
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(context_items)")}
+            if "context_type_id" not in columns:
+                cursor.execute("ALTER TABLE context_items ADD COLUMN context_type_id INTEGER REFERENCES context_types (id)")
+                cursor.execute("""
+                    UPDATE context_items SET context_type_id = (
+                        SELECT id FROM context_types WHERE name = context_items.context_type
+                    )
+                """)
+        
+            # Developer profiles table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS developer_profiles (
+                    id TEXT PRIMARY KEY,
+                    developer_id TEXT UNIQUE NOT NULL,
+                    swift_patterns TEXT,
+                    android_patterns TEXT,
+                    react_patterns TEXT,
+                    python_patterns TEXT,
+                    javascript_patterns TEXT,
+                    ui_design_patterns TEXT,
+                    api_design_patterns TEXT,
+                    data_flow_patterns TEXT,
+                    pattern_confidence_scores TEXT,
+                    success_correlations TEXT,
+                    anti_patterns TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        
+            # Pattern library table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pattern_library (
+                    id TEXT PRIMARY KEY,
+                    pattern_name TEXT NOT NULL,
+                    pattern_type TEXT NOT NULL,
+                    source_technology TEXT,
+                    target_technologies TEXT,
+                    pattern_content TEXT,
+                    success_rate REAL DEFAULT 0.0,
+                    usage_count INTEGER DEFAULT 0,
+                    developer_id TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Patterns detected in a project's code, one row per detection
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS project_patterns (
+                    project_id TEXT NOT NULL,
+                    technology TEXT,
+                    pattern_name TEXT NOT NULL,
+                    pattern_type TEXT,
+                    confidence REAL DEFAULT 0.0,
+                    payload TEXT,
+                    FOREIGN KEY (project_id) REFERENCES projects (id)
+                )
+            """)
+            
+            # Indexes for the columns contexts and patterns are looked up by
+            # (developer_profiles.developer_id is already indexed by UNIQUE)
+            cursor.execute("DROP INDEX IF EXISTS idx_context_project_type")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_context_project_type_id
+                ON context_items (project_id, context_type_id)
+            """)
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS ux_projects_dev_name
+                ON projects (developer_id, name)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_context_cpr
+                ON context_items (cross_project_relevance DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pattern_dev
+                ON pattern_library (developer_id, pattern_type)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_project_patterns_project
+                ON project_patterns (project_id, technology)
+            """)
+    
+    def close(self):
+        """Close all pooled connections, letting SQLite refresh its planner statistics first."""
+        with self._write_lock:
+            self._write_conn.execute("PRAGMA optimize")
+            self._write_conn.close()
+        while not self._read_pool.empty():
+            self._read_pool.get_nowait().close()
     
     def create_project(self, project_data: Dict[str, Any]) -> str:
-        """Create a new project in the database."""
+        """Create a project, or update the developer's project of the same name; returns its id."""
         project_id = str(uuid.uuid4())
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO projects (
-                id, name, type, technologies, description, repository_path,
-                developer_id, intelligence_profile, cross_project_patterns
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            project_id,
-            project_data["name"],
-            project_data["type"],
-            json.dumps(project_data["technologies"]),
-            project_data.get("description", ""),
-            project_data.get("repository_path"),
-            project_data["developer_id"],
-            json.dumps(project_data.get("intelligence_profile", {})),
-            json.dumps(project_data.get("cross_project_patterns", []))
-        ))
-        
-        conn.commit()
-        conn.close()
+        
+        with self._conn(write=True) as conn:
+            cursor = conn.execute(f"""
+                INSERT INTO projects (
+                    id, name, type, technologies, description, repository_path,
+                    developer_id, intelligence_profile, cross_project_patterns
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (developer_id, name) DO UPDATE SET
+                    type = excluded.type,
+                    technologies = excluded.technologies,
+                    description = excluded.description,
+                    repository_path = excluded.repository_path,
+                    intelligence_profile = excluded.intelligence_profile,
+                    cross_project_patterns = excluded.cross_project_patterns,
+                    updated_at = CURRENT_TIMESTAMP
+                {"RETURNING id" if SQLITE_HAS_RETURNING else ""}
+            """, (
+                project_id,
+                project_data["name"],
+                project_data["type"],
+                _json_dumps(project_data["technologies"]),
+                project_data.get("description", ""),
+                project_data.get("repository_path"),
+                project_data["developer_id"],
+                _json_dumps(project_data.get("intelligence_profile", {})),
+                _json_dumps(project_data.get("cross_project_patterns", []))
+            ))
+            
+            if SQLITE_HAS_RETURNING:
+                project_id = cursor.fetchone()[0]
+            else:
+                project_id = conn.execute("""
+                    SELECT id FROM projects WHERE developer_id = ? AND name = ?
+                """, (project_data["developer_id"], project_data["name"])).fetchone()[0]
+        
         return project_id
     
+    def insert_patterns_batch(self, project_id: str, patterns: List[Dict[str, Any]]):
+        """Replace a project's detected patterns in a single transaction."""
+        rows = [
+            (
+                project_id,
+                pattern.get("technology"),
+                pattern["pattern"],
+                pattern.get("type"),
+                pattern.get("confidence", 0.0),
+                _json_dumps(pattern)
+            )
+            for pattern in patterns
+        ]
+        
+        with self._conn(write=True) as conn:
+            # Re-bootstrapping a project replaces its patterns
+            conn.execute("DELETE FROM project_patterns WHERE project_id = ?", (project_id,))
+            conn.executemany("""
+                INSERT INTO project_patterns (
+                    project_id, technology, pattern_name, pattern_type, confidence, payload
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+    
     def store_context(self, context_data: Dict[str, Any]) -> str:
         """Store context item in the database."""
-        context_id = str(uuid.uuid4())
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO context_items (
-                id, project_id, context_type, content, metadata,
-                importance_score, cross_project_relevance, technology_tags
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            context_id,
-            context_data["project_id"],
-            context_data["context_type"],
-            context_data["content"],
-            json.dumps(context_data.get("metadata", {})),
-            context_data.get("importance_score", 0.5),
-            context_data.get("cross_project_relevance", 0.0),
-            json.dumps(context_data.get("technology_tags", []))
-        ))
-        
-        conn.commit()
-        conn.close()
-        return context_id
+        return self.store_contexts_bulk([context_data])[0]
     
-    def get_developer_profile(self, developer_id: str) -> Optional[Dict[str, Any]]:
-        """Get developer profile from database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def store_contexts_bulk(self, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Store several context items in a single transaction."""
+        context_ids = [str(uuid.uuid4()) for _ in contexts]
+        rows = [
+            (
+                context_id,
+                context_data["project_id"],
+                context_data["context_type"],
+                _context_type_id(context_data["context_type"]),
+                context_data["content"],
+                _json_dumps(context_data.get("metadata", {})),
+                context_data.get("importance_score", 0.5),
+                context_data.get("cross_project_relevance", 0.0),
+                _json_dumps(context_data.get("technology_tags", []))
+            )
+            for context_id, context_data in zip(context_ids, contexts)
+        ]
         
-        cursor.execute("""
-            SELECT * FROM developer_profiles WHERE developer_id = ?
-        """, (developer_id,))
+        with self._conn(write=True) as conn:
+            conn.executemany("""
+                INSERT INTO context_items (
+                    id, project_id, context_type, context_type_id, content, metadata,
+                    importance_score, cross_project_relevance, technology_tags
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
         
-        result = cursor.fetchone()
-        conn.close()
+        return context_ids
+    
+    def get_context_texts(self) -> Tuple[List[str], List[str]]:
+        """Return the ids and contents of all context items in insertion order."""
+        with self._conn() as conn:
+            rows = conn.execute("SELECT id, content FROM context_items ORDER BY rowid").fetchall()
+        return [row[0] for row in rows], [row[1] for row in rows]
+    
+    def get_context_stamp(self) -> Tuple[int, int]:
+        """Return the number of context items and the highest rowid.
+        
+        Context items are only ever inserted, so the pair changes whenever
+        the set of stored contexts does.
+        """
+        with self._conn() as conn:
+            count, max_rowid = conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM context_items"
+            ).fetchone()
+        return count, max_rowid
+    
+    def get_developer_profile(self, developer_id: str) -> Optional[Dict[str, Any]]:
+        """Get developer profile from database, with its JSON columns decoded.
+        
+        The cache holds the raw row and every call decodes a fresh copy, so
+        callers may mutate the result without corrupting later reads.
+        """
+        if developer_id in self._profile_cache:
+            return self._decode_profile(self._profile_cache[developer_id])
+        
+        generation = self._profile_generation
+        with self._conn() as conn:
+            cursor = conn.execute("""
+                SELECT * FROM developer_profiles WHERE developer_id = ?
+            """, (developer_id,))
+            
+            result = cursor.fetchone()
         
+        row = None
         if result:
             columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, result))
-        return None
+            row = tuple(zip(columns, result))
+        
+        if generation == self._profile_generation:
+            self._profile_cache[developer_id] = row
+        return self._decode_profile(row)
+    
+    @staticmethod
+    def _decode_profile(row: Optional[Tuple[Tuple[str, Any], ...]]) -> Optional[Dict[str, Any]]:
+        """Build a profile dict from a raw (column, value) row, decoding its JSON columns."""
+        if row is None:
+            return None
+        profile = dict(row)
+        for column in PROFILE_JSON_COLUMNS:
+            if profile.get(column) is not None:
+                profile[column] = _json_loads(profile[column])
+        return profile
     
     def update_developer_profile(self, developer_id: str, profile_data: Dict[str, Any]):
         """Update developer profile in database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Serialize each JSON column once
+        values = tuple(_json_dumps(profile_data.get(column, {})) for column in PROFILE_JSON_COLUMNS)
         
-        # Check if profile exists
-        existing = self.get_developer_profile(developer_id)
-        
-        if existing:
-            cursor.execute("""
-                UPDATE developer_profiles SET
-                    swift_patterns = ?, android_patterns = ?, react_patterns = ?,
-                    python_patterns = ?, javascript_patterns = ?, ui_design_patterns = ?,
-                    api_design_patterns = ?, data_flow_patterns = ?, pattern_confidence_scores = ?,
-                    success_correlations = ?, anti_patterns = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE developer_id = ?
-            """, (
-                json.dumps(profile_data.get("swift_patterns", {})),
-                json.dumps(profile_data.get("android_patterns", {})),
-                json.dumps(profile_data.get("react_patterns", {})),
-                json.dumps(profile_data.get("python_patterns", {})),
-                json.dumps(profile_data.get("javascript_patterns", {})),
-                json.dumps(profile_data.get("ui_design_patterns", {})),
-                json.dumps(profile_data.get("api_design_patterns", {})),
-                json.dumps(profile_data.get("data_flow_patterns", {})),
-                json.dumps(profile_data.get("pattern_confidence_scores", {})),
-                json.dumps(profile_data.get("success_correlations", {})),
-                json.dumps(profile_data.get("anti_patterns", {})),
-                developer_id
-            ))
-        else:
-            profile_id = str(uuid.uuid4())
-            cursor.execute("""
+        # Insert or update in one statement; developer_id is UNIQUE
+        with self._conn(write=True) as conn:
+            conn.execute("""
                 INSERT INTO developer_profiles (
                     id, developer_id, swift_patterns, android_patterns, react_patterns,
                     python_patterns, javascript_patterns, ui_design_patterns,
                     api_design_patterns, data_flow_patterns, pattern_confidence_scores,
                     success_correlations, anti_patterns
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                profile_id, developer_id,
-                json.dumps(profile_data.get("swift_patterns", {})),
-                json.dumps(profile_data.get("android_patterns", {})),
-                json.dumps(profile_data.get("react_patterns", {})),
-                json.dumps(profile_data.get("python_patterns", {})),
-                json.dumps(profile_data.get("javascript_patterns", {})),
-                json.dumps(profile_data.get("ui_design_patterns", {})),
-                json.dumps(profile_data.get("api_design_patterns", {})),
-                json.dumps(profile_data.get("data_flow_patterns", {})),
-                json.dumps(profile_data.get("pattern_confidence_scores", {})),
-                json.dumps(profile_data.get("success_correlations", {})),
-                json.dumps(profile_data.get("anti_patterns", {}))
-            ))
-        
-        conn.commit()
-        conn.close()
+                ON CONFLICT (developer_id) DO UPDATE SET
+                    swift_patterns = excluded.swift_patterns,
+                    android_patterns = excluded.android_patterns,
+                    react_patterns = excluded.react_patterns,
+                    python_patterns = excluded.python_patterns,
+                    javascript_patterns = excluded.javascript_patterns,
+                    ui_design_patterns = excluded.ui_design_patterns,
+                    api_design_patterns = excluded.api_design_patterns,
+                    data_flow_patterns = excluded.data_flow_patterns,
+                    pattern_confidence_scores = excluded.pattern_confidence_scores,
+                    success_correlations = excluded.success_correlations,
+                    anti_patterns = excluded.anti_patterns,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (str(uuid.uuid4()), developer_id) + values)
+        
+        # Invalidate only once the change is committed and visible to readers
+        with self._write_lock:
+            self._profile_generation += 1
+            self._profile_cache.pop(developer_id, None)
 
 # Vector Database Management
 class VectorStoreManager:
@@ -332,33 +638,389 @@ class VectorStoreManager:
         self.db_path = db_path
         self.client = chromadb.PersistentClient(path=db_path)
         self.collections = {}
-        self.init_collections()
-    
-    def init_collections(self):
-        """Initialize collections for different project types."""
-        project_types = ["ios_app", "android_app", "react_web", "python_analytics", "javascript_web"]
         
-        for project_type in project_types:
-            collection_name = f"contexts_{project_type}"
-            try:
-                collection = self.client.get_collection(collection_name)
-            except:
-                collection = self.client.create_collection(collection_name)
-            self.collections[project_type] = collection
+        # Queued writes, drained in batches by a background thread
+        self._write_queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+    
+    def _get_or_create(self, project_type: str):
+        """Return the collection for a project type, creating it on first access."""
+        collection = self.collections.get(project_type)
+        if collection is None and project_type in VECTOR_PROJECT_TYPES:
+            collection = self.collections.setdefault(
+                project_type,
+                self.client.get_or_create_collection(
+                    f"contexts_{project_type}", metadata=VECTOR_INDEX_METADATA
+                )
+            )
+        return collection
     
     def store_context_vector(self, context_id: str, content: str, metadata: Dict[str, Any], project_type: str):
         """Store context with vector embedding."""
-        if project_type in self.collections:
-            self.collections[project_type].add(
-                documents=[content],
-                metadatas=[metadata],
-                ids=[context_id]
+        self.store_contexts_vector_bulk([context_id], [content], [metadata], project_type)
+    
+    def store_contexts_vector_bulk(self, context_ids: List[str], contents: List[str],
+                                   metadatas: List[Dict[str, Any]], project_type: str):
+        """Store several contexts of one project type with a single add call."""
+        if not context_ids:
+            return
+        collection = self._get_or_create(project_type)
+        if collection is not None:
+            collection.add(
+                documents=contents,
+                metadatas=metadatas,
+                ids=context_ids
             )
 
+    def enqueue_contexts(self, context_ids: List[str], contents: List[str],
+                         metadatas: List[Dict[str, Any]], project_type: str):
+        """Queue contexts for a batched background upsert and return immediately.
+        
+        The contexts are already committed to SQLite, so a failed upsert is
+        retried by the writer rather than reported to the caller.
+        """
+        if not context_ids:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="vector-writer", daemon=True)
+                self._writer.start()
+        self._write_queue.put((context_ids, contents, metadatas, project_type))
+    
+    def flush(self):
+        """Wait until every queued context has been written."""
+        self._write_queue.join()
+    
+    def close(self):
+        """Write out queued contexts and stop the background writer."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._write_queue.put(None)
+            writer.join()
+    
+    def _write_loop(self):
+        """Drain the write queue, upserting each project type's share of a batch at once.
+        
+        Writes that queue up while an upsert runs go out together in the next
+        batch, so concurrent callers share upserts without waiting on a timer.
+        """
+        while True:
+            batch = [self._write_queue.get()]
+            count = len(batch[0][0]) if batch[0] is not None else 0
+            while batch[-1] is not None and count < VECTOR_WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+                if batch[-1] is not None:
+                    count += len(batch[-1][0])
+            
+            groups = {}
+            for entry in batch:
+                if entry is not None:
+                    context_ids, contents, metadatas, project_type = entry
+                    group = groups.setdefault(project_type, ([], [], []))
+                    group[0].extend(context_ids)
+                    group[1].extend(contents)
+                    group[2].extend(metadatas)
+            
+            for project_type, (context_ids, contents, metadatas) in groups.items():
+                self._upsert_with_retry(project_type, context_ids, contents, metadatas)
+            
+            for _ in batch:
+                self._write_queue.task_done()
+            if batch[-1] is None:
+                return
+    
+    def _upsert_with_retry(self, project_type: str, context_ids: List[str], contents: List[str],
+                           metadatas: List[Dict[str, Any]]):
+        """Upsert one project type's share of a batch, retrying transient failures.
+        
+        Upserts are keyed by context id, so repeating one never duplicates vectors.
+        """
+        for attempt in range(VECTOR_WRITE_RETRIES + 1):
+            try:
+                collection = self._get_or_create(project_type)
+                if collection is not None:
+                    collection.upsert(documents=contents, metadatas=metadatas, ids=context_ids)
+                return
+            except Exception as e:
+                if attempt == VECTOR_WRITE_RETRIES:
+                    logger.error("Giving up on %d context vectors for %s after %d attempts: %s",
+                                 len(context_ids), project_type, attempt + 1, e)
+                    return
+                delay = VECTOR_WRITE_RETRY_DELAY * 2 ** attempt
+                logger.warning("Error writing %d context vectors to %s, retrying in %.1fs: %s",
+                               len(context_ids), project_type, delay, e)
+                time.sleep(delay)
+    
+    def query(self, project_type: str, embedding: List[float], k: int) -> List[Dict[str, Any]]:
+        """Return the k contexts of one project type nearest to an embedding."""
+        collection = self._get_or_create(project_type)
+        if collection is None or k <= 0:
+            return []
+        
+        count = collection.count()
+        if count == 0:
+            return []
+        
+        results = collection.query(query_embeddings=[embedding], n_results=min(k, count))
+        return [
+            {
+                "context_id": context_id,
+                "distance": distance,
+                "content": document,
+                "metadata": metadata,
+                "project_type": project_type
+            }
+            for context_id, distance, document, metadata in zip(
+                results["ids"][0], results["distances"][0],
+                results["documents"][0], results["metadatas"][0]
+            )
+        ]
+    
+    def query_all(self, embedding: List[float], k: int) -> List[Dict[str, Any]]:
+        """Return the k nearest contexts across all project types.
+        
+        Each collection answers from its own HNSW index, and only their
+        top-k lists are merged.
+        """
+        per_type = [self.query(project_type, embedding, k) for project_type in VECTOR_PROJECT_TYPES]
+        return heapq.nsmallest(k, chain.from_iterable(per_type), key=itemgetter("distance"))
+
+# Context Similarity Index
+class ContextSimilarityIndex:
+    """Sparse TF-IDF index over stored contexts for top-k cosine similarity."""
+    
+    def __init__(self, db_manager: DatabaseManager, index_path: str):
+        self.db_manager = db_manager
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        
+        # L2-normalized TF-IDF rows aligned with _ids; rows added since the
+        # last query wait in _pending and are stacked in one go
+        self._vectorizer = None
+        self._matrix = None
+        self._pending = []
+        self._ids = []
+        self._fitted_rows = 0
+        self._dirty = False
+        
+        if not self._load():
+            self._rebuild()
+    
+    def _load(self) -> bool:
+        """Load the persisted index if it still covers every stored context.
+        
+        Only plain data is read back (JSON and pickle-free NumPy files), and
+        the vectorizer is rebuilt from its vocabulary and IDF weights, so a
+        tampered index directory can't run code.
+        """
+        try:
+            state = json.loads((self.index_path / "state.json").read_bytes())
+            idf = np.load(self.index_path / "idf.npy", allow_pickle=False)
+            matrix = sparse.load_npz(self.index_path / "matrix.npz").tocsr()
+            stamp, ids, vocabulary = tuple(state["stamp"]), state["ids"], state["vocabulary"]
+            
+            vectorizer = TfidfVectorizer(dtype=np.float32, vocabulary=vocabulary)
+            vectorizer.idf_ = idf
+        except Exception:
+            return False
+        
+        if (stamp != self.db_manager.get_context_stamp() or matrix.shape != (len(ids), len(vocabulary))
+                or len(ids) != stamp[0]):
+            return False
+        
+        self._vectorizer = vectorizer
+        self._matrix = matrix
+        self._ids = ids
+        self._fitted_rows = state["fitted_rows"]
+        return True
+    
+    def _rebuild(self):
+        """Refit the vocabulary and IDF weights on every stored context."""
+        ids, contents = self.db_manager.get_context_texts()
+        self._vectorizer, self._matrix, self._pending = None, None, []
+        self._ids, self._fitted_rows = [], 0
+        self._dirty = True
+        if not ids:
+            return
+        
+        # float32 weights halve the matrix's memory traffic and on-disk size;
+        # cosine scores only need a few significant digits
+        vectorizer = TfidfVectorizer(dtype=np.float32)
+        try:
+            matrix = vectorizer.fit_transform(contents).tocsr()
+        except ValueError:
+            return  # No usable terms yet (e.g. only stop words)
+        
+        self._vectorizer, self._matrix = vectorizer, matrix
+        self._ids, self._fitted_rows = ids, len(ids)
+    
+    def add(self, context_ids: List[str], contents: List[str]):
+        """Index contexts that have just been stored in the database."""
+        if not context_ids:
+            return
+        with self._lock:
+            # Refit once the store has doubled since the last fit, so new
+            # vocabulary is picked up at amortized constant cost per context
+            if self._vectorizer is None or len(self._ids) + len(context_ids) >= 2 * self._fitted_rows:
+                self._rebuild()
+                return
+            
+            self._pending.append(self._vectorizer.transform(contents))
+            self._ids.extend(context_ids)
+            self._dirty = True
+    
+    def query(self, content: str, limit: int) -> List[Dict[str, Any]]:
+        """Return up to `limit` indexed contexts most similar to `content`."""
+        with self._lock:
+            if self._matrix is None or limit <= 0:
+                return []
+            if self._pending:
+                self._matrix = sparse.vstack([self._matrix, *self._pending], format="csr")
+                self._pending = []
+            
+            # One sparse mat-vec scores every context; rows and the query are
+            # unit length, so dot products are cosine similarities
+            query_vec = self._vectorizer.transform([content])
+            similarities = (self._matrix @ query_vec.T).toarray().ravel()
+            
+            if limit < len(similarities):
+                top = np.argpartition(-similarities, limit - 1)[:limit]
+            else:
+                top = np.arange(len(similarities))
+            top = top[np.argsort(-similarities[top], kind="stable")]
+            
+            return [
+                {"context_id": self._ids[i], "similarity": float(similarities[i])}
+                for i in top
+                if similarities[i] > 0
+            ]
+    
+    def save(self):
+        """Persist the index so the next start can skip refitting."""
+        with self._lock:
+            if not self._dirty or self._matrix is None:
+                return
+            if self._pending:
+                self._matrix = sparse.vstack([self._matrix, *self._pending], format="csr")
+                self._pending = []
+            
+            # Every indexed context is already in the database, so equal
+            # counts mean the index covers exactly the stored contexts
+            stamp = self.db_manager.get_context_stamp()
+            if stamp[0] != len(self._ids):
+                return  # A store was still in flight; the next start refits
+            
+            self.index_path.mkdir(parents=True, exist_ok=True)
+            sparse.save_npz(self.index_path / "matrix.npz", self._matrix)
+            np.save(self.index_path / "idf.npy", self._vectorizer.idf_, allow_pickle=False)
+            (self.index_path / "state.json").write_text(json.dumps({
+                "vocabulary": {term: int(column) for term, column in self._vectorizer.vocabulary_.items()},
+                "ids": self._ids,
+                "fitted_rows": self._fitted_rows,
+                "stamp": stamp
+            }))
+            self._dirty = False
+
 # Intelligence Engine
+def _compile_pattern_scanner(words: List[str]):
+    """Build a function mapping each word found in lowercased content to its offsets.
+    
+    The words are written into the function body as constants, so the search
+    loop does no table lookups; this is the fallback when neither Hyperscan
+    nor Aho-Corasick is installed.
+    """
+    lines = ["def scan(content_lower):", "    offsets = {}", "    find = content_lower.find"]
+    for word in words:
+        lines += [
+            f"    start = find({word!r})",
+            "    if start != -1:",
+            f"        hits = offsets[{word!r}] = []",
+            "        while start != -1:",
+            "            hits.append(start)",
+            f"            start = find({word!r}, start + 1)",
+        ]
+    lines.append("    return offsets")
+    
+    namespace = {}
+    exec(compile("\n".join(lines), "<pattern scanner>", "exec"), namespace)
+    return namespace["scan"]
+
 class IntelligenceEngine:
     """Core intelligence engine for pattern recognition and learning."""
     
+    # Key of the matchers built over every technology's patterns at once
+    _ALL_TECHS = "*"
+    
+    # Per-project-type suggestions, built once and shared by every call; the
+    # entries are read-only views and callers get their own copies
+    _TYPE_SUGGESTIONS = {
+        ProjectType.IOS_APP: (
+            {
+                "type": "ui_suggestion",
+                "suggestion": "Use SwiftUI for modern iOS development",
+                "rationale": "SwiftUI provides declarative UI development",
+                "confidence": 0.9
+            },
+            {
+                "type": "architecture_suggestion",
+                "suggestion": "Implement MVVM pattern with ObservableObject",
+                "rationale": "Works well with SwiftUI reactive patterns",
+                "confidence": 0.8
+            }
+        ),
+        ProjectType.ANDROID_APP: (
+            {
+                "type": "ui_suggestion",
+                "suggestion": "Consider Jetpack Compose for modern Android UI",
+                "rationale": "Modern declarative UI toolkit for Android",
+                "confidence": 0.8
+            },
+            {
+                "type": "architecture_suggestion",
+                "suggestion": "Use MVVM with ViewModel and LiveData",
+                "rationale": "Recommended architecture for Android apps",
+                "confidence": 0.9
+            }
+        ),
+        ProjectType.REACT_WEB: (
+            {
+                "type": "ui_suggestion",
+                "suggestion": "Use functional components with hooks",
+                "rationale": "Modern React development approach",
+                "confidence": 0.9
+            },
+            {
+                "type": "styling_suggestion",
+                "suggestion": "Consider Tailwind CSS for utility-first styling",
+                "rationale": "Rapid development with consistent design",
+                "confidence": 0.7
+            }
+        ),
+        ProjectType.PYTHON_ANALYTICS: (
+            {
+                "type": "data_suggestion",
+                "suggestion": "Use pandas for data manipulation and analysis",
+                "rationale": "Standard library for data science workflows",
+                "confidence": 0.9
+            },
+            {
+                "type": "visualization_suggestion",
+                "suggestion": "Combine matplotlib and seaborn for visualizations",
+                "rationale": "Powerful combination for data visualization",
+                "confidence": 0.8
+            }
+        ),
+    }
+    _TYPE_SUGGESTIONS = MappingProxyType({
+        project_type: tuple(MappingProxyType(suggestion) for suggestion in suggestions)
+        for project_type, suggestions in _TYPE_SUGGESTIONS.items()
+    })
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.technology_patterns = {
@@ -368,6 +1030,83 @@ class IntelligenceEngine:
             "python": self._init_python_patterns(),
             "javascript": self._init_javascript_patterns()
         }
+        # Pattern lists are read-only after construction
+        for tech_patterns in self.technology_patterns.values():
+            for pattern_type, pattern_list in tech_patterns.items():
+                tech_patterns[pattern_type] = tuple(pattern_list)
+        
+        # Common spellings of each technology name, so lookups usually skip
+        # allocating a lowercased copy
+        self._tech_canonical = {
+            spelling: tech
+            for tech in self.technology_patterns
+            for spelling in (tech, tech.capitalize(), tech.upper())
+        }
+        self._tech_canonical["JavaScript"] = "javascript"
+        
+        # Flat (pattern, type, lowercased pattern) lists per technology, so
+        # matching doesn't re-lowercase every pattern on every call
+        self._pattern_table = {
+            tech: [
+                (pattern, pattern_type, pattern.lower())
+                for pattern_type, pattern_list in tech_patterns.items()
+                for pattern in pattern_list
+            ]
+            for tech, tech_patterns in self.technology_patterns.items()
+        }
+        
+        # Byte-level prefilters: a case-insensitive search over a file's raw
+        # (e.g. memory-mapped) bytes that rules out files with no pattern at
+        # all before they are decoded. Any non-ASCII byte also counts as a
+        # possible hit, since str.lower() may map such text onto a pattern.
+        self._pattern_prefilters = {
+            tech: re.compile(
+                b"|".join(re.escape(pattern_lower.encode()) for _, _, pattern_lower in pattern_table) + b"|[\x80-\xff]",
+                re.IGNORECASE
+            )
+            for tech, pattern_table in self._pattern_table.items()
+        }
+        
+        # Distinct lowercased patterns per technology, plus their union under
+        # _ALL_TECHS so content tagged with several technologies is scanned once
+        self._pattern_words = {
+            tech: list(dict.fromkeys(pattern_lower for _, _, pattern_lower in pattern_table))
+            for tech, pattern_table in self._pattern_table.items()
+        }
+        self._pattern_word_sets = {tech: frozenset(words) for tech, words in self._pattern_words.items()}
+        self._pattern_words[self._ALL_TECHS] = list(dict.fromkeys(chain.from_iterable(self._pattern_words.values())))
+        
+        # One automaton per technology matches all its patterns in a single
+        # scan of the content instead of one substring search per pattern
+        self._pattern_automata = {}
+        if ahocorasick is not None:
+            for tech, words in self._pattern_words.items():
+                automaton = ahocorasick.Automaton()
+                for word in words:
+                    automaton.add_word(word, word)
+                automaton.make_automaton()
+                self._pattern_automata[tech] = automaton
+        
+        # Per-technology search functions with the patterns baked in
+        self._pattern_scanners = {
+            tech: _compile_pattern_scanner(words)
+            for tech, words in self._pattern_words.items()
+        }
+        
+        # Hyperscan databases, preferred over the automata for ASCII content.
+        # Scratch space is per thread, as Hyperscan requires.
+        self._pattern_databases = {}
+        self._hyperscan_scratch = threading.local()
+        if hyperscan is not None:
+            for tech, words in self._pattern_words.items():
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[word.encode() for word in words],
+                    ids=list(range(len(words))),
+                    elements=len(words),
+                    literal=True
+                )
+                self._pattern_databases[tech] = (database, words)
     
     def _init_swift_patterns(self) -> Dict[str, Any]:
         """Initialize Swift/iOS pattern recognition."""
@@ -414,36 +1153,142 @@ class IntelligenceEngine:
             "common_frameworks": ["Express", "Node.js", "Webpack", "Babel"]
         }
     
+    def _canonical_tech(self, technology: str) -> str:
+        """Return the technology_patterns key for a technology name."""
+        return self._tech_canonical.get(technology) or technology.lower()
+    
     def analyze_code_patterns(self, content: str, technology: str) -> List[Dict[str, Any]]:
         """Analyze code content for patterns specific to technology."""
+        return self.analyze_code_patterns_multi(content, [technology])
+    
+    def analyze_code_patterns_multi(self, content: str, technologies: List[str]) -> List[Dict[str, Any]]:
+        """Analyze code content for the patterns of several technologies at once.
+        
+        Equivalent to concatenating analyze_code_patterns for each technology,
+        but the content is lowercased, scanned and split into lines only once.
+        """
         patterns = []
+        requested = [(technology, self._canonical_tech(technology)) for technology in technologies]
+        requested = [(technology, tech) for technology, tech in requested if self._pattern_table.get(tech)]
+        if not requested:
+            return patterns
+        
+        content_lower = content.lower()
+        offsets_by_tech = self._find_offsets_by_tech({tech for _, tech in requested}, content_lower)
+        if not any(offsets_by_tech.values()):
+            return patterns
+        
+        # Split once per content and map match offsets to line numbers,
+        # rather than rescanning every line for every pattern
+        lines = content.split('\n')
+        hit_lines = {}
+        if len(content_lower) == len(content):
+            line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+            for offsets in offsets_by_tech.values():
+                for pattern_lower, pattern_offsets in offsets.items():
+                    if pattern_lower not in hit_lines:
+                        hit_lines[pattern_lower] = sorted({bisect_right(line_starts, offset) - 1 for offset in pattern_offsets})
+        else:
+            # Lowercasing changed the length (rare non-ASCII text), so
+            # offsets don't line up with the original content
+            lines_lower = content_lower.split('\n')
+            for offsets in offsets_by_tech.values():
+                for pattern_lower in offsets:
+                    if pattern_lower not in hit_lines:
+                        hit_lines[pattern_lower] = [i for i, line in enumerate(lines_lower) if pattern_lower in line]
+        
+        # Report in table order, once per (pattern, type) like before
+        for technology, tech in requested:
+            offsets = offsets_by_tech[tech]
+            for pattern, pattern_type, pattern_lower in self._pattern_table[tech]:
+                if pattern_lower in offsets:
+                    patterns.append({
+                        "pattern": pattern,
+                        "type": pattern_type,
+                        "technology": technology,
+                        "confidence": 0.8,  # Basic confidence scoring
+                        "context": self._extract_pattern_context(lines, hit_lines[pattern_lower])
+                    })
         
-        if technology.lower() in self.technology_patterns:
-            tech_patterns = self.technology_patterns[technology.lower()]
+        return patterns
+    
+    def may_contain_patterns(self, data, technology: str) -> bool:
+        """Cheap check on raw bytes; False means analyze_code_patterns would find nothing."""
+        prefilter = self._pattern_prefilters.get(self._canonical_tech(technology))
+        return prefilter is not None and prefilter.search(data) is not None
+    
+    def scan_file(self, file_path: str, technology: str) -> List[Dict[str, Any]]:
+        """Analyze one source file; unreadable or undecodable files yield no patterns."""
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []  # Empty files can't be mapped and have no patterns
+                
+                # Scan the mapped pages in place; only candidates get copied and decoded
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if not self.may_contain_patterns(mapped, technology):
+                        return []
+                    content = mapped[:].decode('utf-8')
             
-            for pattern_type, pattern_list in tech_patterns.items():
-                for pattern in pattern_list:
-                    if pattern.lower() in content.lower():
-                        patterns.append({
-                            "pattern": pattern,
-                            "type": pattern_type,
-                            "technology": technology,
-                            "confidence": 0.8,  # Basic confidence scoring
-                            "context": self._extract_pattern_context(content, pattern)
-                        })
+            # Same newline handling as reading in text mode
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            return self.analyze_code_patterns(content, technology)
+        except Exception:
+            return []  # Skip files that can't be read
+    
+    def _find_offsets_by_tech(self, techs: Set[str], content_lower: str) -> Dict[str, Dict[str, List[int]]]:
+        """Pattern offsets for several technologies, from one scan when there are several."""
+        if len(techs) == 1:
+            tech, = techs
+            return {tech: self._find_pattern_offsets(tech, content_lower)}
         
-        return patterns
+        all_offsets = self._find_pattern_offsets(self._ALL_TECHS, content_lower)
+        return {
+            tech: {word: offsets for word, offsets in all_offsets.items() if word in self._pattern_word_sets[tech]}
+            for tech in techs
+        }
     
-    def _extract_pattern_context(self, content: str, pattern: str) -> str:
-        """Extract context around a detected pattern."""
-        lines = content.split('\n')
+    def _find_pattern_offsets(self, tech: str, content_lower: str) -> Dict[str, List[int]]:
+        """Map each pattern found in lowercased content to its start offsets."""
+        offsets = {}
+        automaton = self._pattern_automata.get(tech)
+        
+        if tech in self._pattern_databases and content_lower.isascii():
+            # Byte offsets equal string offsets for ASCII content
+            database, words = self._pattern_databases[tech]
+            
+            def on_match(word_id, start, end, flags, context):
+                word = words[word_id]
+                offsets.setdefault(word, []).append(end - len(word))
+            
+            database.scan(content_lower.encode(), match_event_handler=on_match,
+                          scratch=self._get_scratch(tech, database))
+        elif automaton is not None:
+            for end, pattern_lower in automaton.iter(content_lower):
+                offsets.setdefault(pattern_lower, []).append(end - len(pattern_lower) + 1)
+        else:
+            offsets = self._pattern_scanners[tech](content_lower)
+        
+        return offsets
+    
+    def _get_scratch(self, tech: str, database):
+        """Return this thread's Hyperscan scratch space for a technology's database."""
+        scratch = getattr(self._hyperscan_scratch, tech, None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(database)
+            setattr(self._hyperscan_scratch, tech, scratch)
+        return scratch
+    
+    def _extract_pattern_context(self, lines: List[str], hit_lines: List[int]) -> str:
+        """Extract context around the lines where a pattern was detected."""
         pattern_lines = []
         
-        for i, line in enumerate(lines):
-            if pattern.lower() in line.lower():
-                start = max(0, i - 2)
-                end = min(len(lines), i + 3)
-                pattern_lines.extend(lines[start:end])
+        # Each hit contributes at least one line, so later hits can't
+        # reach the 10-line limit
+        for i in hit_lines[:10]:
+            start = max(0, i - 2)
+            end = min(len(lines), i + 3)
+            pattern_lines.extend(lines[start:end])
         
         return '\n'.join(pattern_lines[:10])  # Limit context size
     
@@ -453,8 +1298,8 @@ class IntelligenceEngine:
         
         # Technology-specific suggestions
         for tech in technologies:
-            if tech.lower() in self.technology_patterns:
-                tech_patterns = self.technology_patterns[tech.lower()]
+            tech_patterns = self.technology_patterns.get(self._canonical_tech(tech))
+            if tech_patterns is not None:
                 suggestions.append({
                     "type": "architecture_suggestion",
                     "technology": tech,
@@ -464,84 +1309,9 @@ class IntelligenceEngine:
                 })
         
         # Cross-project suggestions based on project type
-        if project_type == ProjectType.IOS_APP:
-            suggestions.extend(self._get_ios_suggestions())
-        elif project_type == ProjectType.ANDROID_APP:
-            suggestions.extend(self._get_android_suggestions())
-        elif project_type == ProjectType.REACT_WEB:
-            suggestions.extend(self._get_react_suggestions())
-        elif project_type == ProjectType.PYTHON_ANALYTICS:
-            suggestions.extend(self._get_python_suggestions())
+        suggestions.extend(dict(suggestion) for suggestion in self._TYPE_SUGGESTIONS.get(project_type, ()))
         
         return suggestions
-    
-    def _get_ios_suggestions(self) -> List[Dict[str, Any]]:
-        """Get iOS-specific suggestions."""
-        return [
-            {
-                "type": "ui_suggestion",
-                "suggestion": "Use SwiftUI for modern iOS development",
-                "rationale": "SwiftUI provides declarative UI development",
-                "confidence": 0.9
-            },
-            {
-                "type": "architecture_suggestion", 
-                "suggestion": "Implement MVVM pattern with ObservableObject",
-                "rationale": "Works well with SwiftUI reactive patterns",
-                "confidence": 0.8
-            }
-        ]
-    
-    def _get_android_suggestions(self) -> List[Dict[str, Any]]:
-        """Get Android-specific suggestions."""
-        return [
-            {
-                "type": "ui_suggestion",
-                "suggestion": "Consider Jetpack Compose for modern Android UI",
-                "rationale": "Modern declarative UI toolkit for Android",
-                "confidence": 0.8
-            },
-            {
-                "type": "architecture_suggestion",
-                "suggestion": "Use MVVM with ViewModel and LiveData",
-                "rationale": "Recommended architecture for Android apps",
-                "confidence": 0.9
-            }
-        ]
-    
-    def _get_react_suggestions(self) -> List[Dict[str, Any]]:
-        """Get React-specific suggestions."""
-        return [
-            {
-                "type": "ui_suggestion",
-                "suggestion": "Use functional components with hooks",
-                "rationale": "Modern React development approach",
-                "confidence": 0.9
-            },
-            {
-                "type": "styling_suggestion",
-                "suggestion": "Consider Tailwind CSS for utility-first styling",
-                "rationale": "Rapid development with consistent design",
-                "confidence": 0.7
-            }
-        ]
-    
-    def _get_python_suggestions(self) -> List[Dict[str, Any]]:
-        """Get Python analytics-specific suggestions."""
-        return [
-            {
-                "type": "data_suggestion",
-                "suggestion": "Use pandas for data manipulation and analysis",
-                "rationale": "Standard library for data science workflows",
-                "confidence": 0.9
-            },
-            {
-                "type": "visualization_suggestion",
-                "suggestion": "Combine matplotlib and seaborn for visualizations",
-                "rationale": "Powerful combination for data visualization",
-                "confidence": 0.8
-            }
-        ]
 
 # Project Bootstrap Engine
 class ProjectBootstrapEngine:
@@ -549,8 +1319,53 @@ class ProjectBootstrapEngine:
     
     def __init__(self, intelligence_engine: IntelligenceEngine):
         self.intelligence_engine = intelligence_engine
+        
+        # Recent analyses, least recently used first: key -> (timestamp, analysis)
+        self._analysis_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def analyze_existing_project(self, project_path: str) -> Dict[str, Any]:
+        """Analyze existing project, reusing a recent analysis of the same repository state.
+        
+        The result is shared between callers and must not be mutated.
+        """
+        key = self._analysis_key(project_path)
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._analysis_cache.get(key)
+            if entry is not None and now - entry[0] < BOOTSTRAP_CACHE_TTL:
+                self._analysis_cache.move_to_end(key)
+                return entry[1]
+        
+        analysis = self._analyze_project(project_path)
+        
+        with self._cache_lock:
+            self._analysis_cache[key] = (now, analysis)
+            self._analysis_cache.move_to_end(key)
+            while len(self._analysis_cache) > BOOTSTRAP_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        return analysis
+    
+    def invalidate(self, project_path: str):
+        """Drop cached analyses of a project, e.g. after changing its files."""
+        real_path = os.path.realpath(project_path)
+        with self._cache_lock:
+            for key in [key for key in self._analysis_cache if key[0] == real_path]:
+                del self._analysis_cache[key]
+    
+    def _analysis_key(self, project_path: str) -> Tuple[str, Optional[int], Optional[int]]:
+        """Identify a repository state by path and the mtimes of git's HEAD and index."""
+        real_path = os.path.realpath(project_path)
+        mtimes = []
+        for name in ("HEAD", "index"):
+            try:
+                mtimes.append(os.stat(os.path.join(real_path, ".git", name)).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (real_path, *mtimes)
+    
+    def _analyze_project(self, project_path: str) -> Dict[str, Any]:
         """Analyze existing project to extract patterns and intelligence."""
         project_analysis = {
             "technologies": [],
@@ -579,24 +1394,31 @@ class ProjectBootstrapEngine:
         """Detect technologies used in the project."""
         technologies = []
         
-        # Check for different project types
-        if os.path.exists(os.path.join(project_path, "Package.swift")):
+        # Check for different project types' marker files in one directory read
+        try:
+            with os.scandir(project_path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        
+        if "Package.swift" in names:
             technologies.append("swift")
-        if os.path.exists(os.path.join(project_path, "build.gradle")):
+        if "build.gradle" in names:
             technologies.append("android")
-        if os.path.exists(os.path.join(project_path, "package.json")):
+        if "package.json" in names:
             technologies.append("javascript")
-            # Check if it's React
+            # Check if it's React; most manifests without the name need no parse
             package_json_path = os.path.join(project_path, "package.json")
             try:
-                with open(package_json_path, 'r') as f:
-                    package_data = json.load(f)
+                with open(package_json_path, 'rb') as f:
+                    data = f.read()
+                if b'"react"' in data:
+                    package_data = _json_loads(data)
                     if "react" in package_data.get("dependencies", {}):
                         technologies.append("react")
-            except:
+            except Exception:
                 pass
-        if os.path.exists(os.path.join(project_path, "requirements.txt")) or \
-           os.path.exists(os.path.join(project_path, "pyproject.toml")):
+        if "requirements.txt" in names or "pyproject.toml" in names:
             technologies.append("python")
         
         return technologies
@@ -614,20 +1436,43 @@ class ProjectBootstrapEngine:
             "python": [".py"]
         }
         
+        # Bucket files by (technology, extension) in a single walk; an
+        # extension may belong to several technologies (.jsx)
+        buckets = {}
+        ext_buckets = {}
         for tech in technologies:
-            if tech in tech_extensions:
-                for ext in tech_extensions[tech]:
-                    for root, dirs, files in os.walk(project_path):
-                        for file in files:
-                            if file.endswith(ext):
-                                file_path = os.path.join(root, file)
-                                try:
-                                    with open(file_path, 'r', encoding='utf-8') as f:
-                                        content = f.read()
-                                        file_patterns = self.intelligence_engine.analyze_code_patterns(content, tech)
-                                        patterns.extend(file_patterns)
-                                except:
-                                    continue  # Skip files that can't be read
+            for ext in tech_extensions.get(tech, []):
+                bucket = buckets.setdefault((tech, ext), [])
+                ext_buckets.setdefault(ext, []).append(bucket)
+        
+        if not buckets:
+            return patterns
+        
+        for root, dirs, files in os.walk(project_path):
+            # Prune dependency, build and VCS directories in place
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for file in files:
+                dot = file.rfind('.')
+                targets = ext_buckets.get(file[dot:]) if dot != -1 else None
+                if targets:
+                    file_path = os.path.join(root, file)
+                    for bucket in targets:
+                        bucket.append(file_path)
+        
+        # Same order as scanning technology by technology, extension by extension
+        work = [(tech, file_path) for (tech, ext), file_paths in buckets.items() for file_path in file_paths]
+        
+        scan_file = self.intelligence_engine.scan_file
+        if len(work) >= PARALLEL_SCAN_MIN_FILES:
+            # Threads share the compiled pattern engine and overlap file reads
+            # with Hyperscan scans, which release the GIL; map() keeps results
+            # in submission order
+            with ThreadPoolExecutor(thread_name_prefix="code-scan") as executor:
+                results = executor.map(lambda item: scan_file(item[1], item[0]), work)
+                return list(chain.from_iterable(results))
+        
+        for tech, file_path in work:
+            patterns.extend(scan_file(file_path, tech))
         
         return patterns
     
@@ -646,26 +1491,27 @@ class ProjectBootstrapEngine:
             if result.returncode == 0:
                 git_insights["commit_count"] = int(result.stdout.strip())
             
-            # Get recent commit messages
-            result = subprocess.run(
-                ["git", "log", "--oneline", "-10"],
+            # Recent commit messages and the files they touched, from one
+            # git process whose output is consumed as it streams in
+            recent_commits = []
+            change_counts = Counter()
+            with subprocess.Popen(
+                ["git", "log", "--name-only", "--pretty=format:%x00%h %s", "-10"],
                 cwd=project_path,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True
-            )
-            if result.returncode == 0:
-                git_insights["recent_commits"] = result.stdout.strip().split('\n')
+            ) as process:
+                for line in process.stdout:
+                    line = line.rstrip('\n')
+                    if line.startswith('\0'):
+                        recent_commits.append(line[1:])
+                    elif line.strip():
+                        change_counts[line] += 1
             
-            # Get file change patterns
-            result = subprocess.run(
-                ["git", "log", "--name-only", "--pretty=format:", "-10"],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                changed_files = [f for f in result.stdout.split('\n') if f.strip()]
-                git_insights["frequently_changed_files"] = list(set(changed_files))
+            if process.returncode == 0:
+                git_insights["recent_commits"] = recent_commits
+                git_insights["frequently_changed_files"] = [path for path, _ in change_counts.most_common()]
         
         except Exception as e:
             git_insights["error"] = str(e)
@@ -702,6 +1548,7 @@ class ProjectBootstrapEngine:
 # Initialize components
 db_manager = DatabaseManager(DATABASE_PATH)
 vector_store = VectorStoreManager(VECTOR_DB_PATH)
+similarity_index = ContextSimilarityIndex(db_manager, SIMILARITY_INDEX_PATH)
 intelligence_engine = IntelligenceEngine(db_manager)
 bootstrap_engine = ProjectBootstrapEngine(intelligence_engine)
 
@@ -782,11 +1629,11 @@ def create_intelligent_project(
             message=f"Successfully created intelligent project: {project_name}"
         )
         
-        return json.dumps(asdict(result), indent=2)
+        return result.model_dump_json(indent=2)
         
     except Exception as e:
-        logger.error(f"Error creating intelligent project: {str(e)}")
-        result = ProjectCreationResult(
+        logger.error("Error creating intelligent project: %s", e)
+        return _error_json(
             project_id="",
             project_name=project_name,
             intelligent_suggestions=[],
@@ -795,7 +1642,6 @@ def create_intelligent_project(
             success=False,
             message=f"Error creating project: {str(e)}"
         )
-        return json.dumps(asdict(result), indent=2)
 
 @mcp.tool
 def store_context_with_intelligence(
@@ -822,57 +1668,113 @@ def store_context_with_intelligence(
         JSON string with IntelligentStorageResult containing storage confirmation and insights
     """
     try:
+        # Arguments were already validated against the tool signature
+        context = ContextInput.model_construct(
+            project_id=project_id,
+            context_type=context_type,
+            content=content,
+            metadata=metadata,
+            cross_project_relevance=cross_project_relevance
+        )
+        return _store_contexts([context])[0].model_dump_json(indent=2)
+        
+    except Exception as e:
+        logger.error("Error storing context: %s", e)
+        return _error_json(
+            context_id="",
+            cross_project_relevance_score=0.0,
+            pattern_insights=[],
+            similar_contexts=[],
+            success=False,
+            message=f"Error storing context: {str(e)}"
+        )
+
+@mcp.tool
+def store_contexts_batch(contexts: List[ContextInput]) -> str:
+    """
+    Store many contexts at once, e.g. when replaying a conversation or bootstrap output.
+    
+    All contexts are written to the database in one transaction and to the vector
+    store with one add per project type, instead of one of each per context.
+    
+    Args:
+        contexts: Contexts with the same fields as store_context_with_intelligence
+        
+    Returns:
+        JSON string with BatchStorageResult holding one IntelligentStorageResult per context
+    """
+    try:
+        results = _store_contexts(contexts)
+        result = BatchStorageResult(
+            results=results,
+            success=True,
+            message=f"Stored {len(results)} contexts with intelligent analysis"
+        )
+        return result.model_dump_json(indent=2)
+        
+    except Exception as e:
+        logger.error("Error storing contexts: %s", e)
+        return _error_json(
+            results=[],
+            success=False,
+            message=f"Error storing contexts: {str(e)}"
+        )
+
+def _store_contexts(contexts: List[ContextInput]) -> List[IntelligentStorageResult]:
+    """Analyze and store contexts with one database transaction and batched vector writes."""
+    context_rows = []
+    relevances = []
+    insights = []
+    vector_groups = {}
+    
+    for index, context in enumerate(contexts):
         # Calculate cross-project relevance if not provided
+        cross_project_relevance = context.cross_project_relevance
         if cross_project_relevance is None:
             cross_project_relevance = 0.5  # Default relevance
+        relevances.append(cross_project_relevance)
         
         # Analyze content for patterns
-        technologies = metadata.get("technologies", [])
-        pattern_insights = []
-        
-        for tech in technologies:
-            patterns = intelligence_engine.analyze_code_patterns(content, tech)
-            pattern_insights.extend(patterns)
+        technologies = context.metadata.get("technologies", [])
+        insights.append(intelligence_engine.analyze_code_patterns_multi(context.content, technologies))
         
         # Prepare context data
-        context_data = {
-            "project_id": project_id,
-            "context_type": context_type,
-            "content": content,
-            "metadata": metadata,
+        context_rows.append({
+            "project_id": context.project_id,
+            "context_type": context.context_type,
+            "content": context.content,
+            "metadata": context.metadata,
             "cross_project_relevance": cross_project_relevance,
             "technology_tags": technologies,
-            "importance_score": 0.7 if context_type == "bug_fix" else 0.5  # Higher importance for bug fixes
-        }
+            "importance_score": 0.7 if context.context_type == "bug_fix" else 0.5  # Higher importance for bug fixes
+        })
         
-        # Store in database
-        context_id = db_manager.store_context(context_data)
-        
-        # Store in vector database
+        # Group for vector storage by primary project type
         if technologies:
-            # Determine primary project type for vector storage
-            primary_tech = technologies[0] if technologies else "general"
-            project_type_map = {
-                "swift": "ios_app",
-                "kotlin": "android_app", 
-                "java": "android_app",
-                "react": "react_web",
-                "javascript": "javascript_web",
-                "python": "python_analytics"
-            }
-            project_type = project_type_map.get(primary_tech.lower(), "react_web")
-            
-            vector_store.store_context_vector(
-                context_id, 
-                content, 
-                {"project_id": project_id, "context_type": context_type, **metadata},
-                project_type
-            )
-        
-        # Find similar contexts (placeholder)
-        similar_contexts = []
-        
-        result = IntelligentStorageResult(
+            project_type = TECH_PROJECT_TYPES.get(technologies[0].lower(), "react_web")
+            vector_groups.setdefault(project_type, []).append(index)
+    
+    # Store in database
+    context_ids = db_manager.store_contexts_bulk(context_rows)
+    
+    # Queue for the vector database; embedding happens in the background
+    for project_type, indexes in vector_groups.items():
+        vector_store.enqueue_contexts(
+            [context_ids[i] for i in indexes],
+            [contexts[i].content for i in indexes],
+            [
+                {"project_id": contexts[i].project_id, "context_type": contexts[i].context_type, **contexts[i].metadata}
+                for i in indexes
+            ],
+            project_type
+        )
+    
+    # Find similar contexts, then index these for later lookups
+    similar = [similarity_index.query(context.content, SIMILAR_CONTEXTS_LIMIT) for context in contexts]
+    similarity_index.add(context_ids, [context.content for context in contexts])
+    
+    return [
+        IntelligentStorageResult(
             context_id=context_id,
             cross_project_relevance_score=cross_project_relevance,
             pattern_insights=pattern_insights,
@@ -880,20 +1782,9 @@ def store_context_with_intelligence(
             success=True,
             message="Context stored successfully with intelligent analysis"
         )
-        
-        return json.dumps(asdict(result), indent=2)
-        
-    except Exception as e:
-        logger.error(f"Error storing context: {str(e)}")
-        result = IntelligentStorageResult(
-            context_id="",
-            cross_project_relevance_score=0.0,
-            pattern_insights=[],
-            similar_contexts=[],
-            success=False,
-            message=f"Error storing context: {str(e)}"
-        )
-        return json.dumps(asdict(result), indent=2)
+        for context_id, cross_project_relevance, pattern_insights, similar_contexts
+        in zip(context_ids, relevances, insights, similar)
+    ]
 
 @mcp.tool
 def analyze_developer_patterns(
@@ -919,88 +1810,21 @@ def analyze_developer_patterns(
         # Get existing developer profile
         existing_profile = db_manager.get_developer_profile(developer_id)
         
-        # Initialize pattern analysis
-        technology_patterns = {}
-        cross_technology_insights = []
-        success_patterns = []
-        anti_patterns = []
-        recommendations = []
-        confidence_scores = {}
-        
         # Analyze technology-specific patterns
-        technologies_to_analyze = technology_focus or ["swift", "android", "react", "python", "javascript"]
-        
-        for tech in technologies_to_analyze:
-            tech_patterns = intelligence_engine.technology_patterns.get(tech, {})
-            technology_patterns[tech] = {
-                "detected_patterns": tech_patterns,
-                "usage_frequency": 0.5,  # Placeholder
-                "success_correlation": 0.7  # Placeholder
-            }
-            confidence_scores[tech] = 0.6  # Placeholder confidence
-        
-        # Generate cross-technology insights
-        if len(technologies_to_analyze) > 1:
-            cross_technology_insights = [
-                {
-                    "insight": "UI patterns from Swift can be adapted to React components",
-                    "source_technology": "swift",
-                    "target_technology": "react",
-                    "confidence": 0.7
-                },
-                {
-                    "insight": "Data handling patterns from Python analytics apply to mobile backends",
-                    "source_technology": "python", 
-                    "target_technology": "android",
-                    "confidence": 0.6
-                }
-            ]
-        
-        # Generate success patterns
-        success_patterns = [
-            {
-                "pattern": "Component-based architecture",
-                "technologies": ["swift", "react", "android"],
-                "success_rate": 0.85,
-                "description": "Modular component architecture works well across platforms"
-            }
-        ]
+        technologies_to_analyze = tuple(technology_focus) if technology_focus else DEFAULT_ANALYSIS_TECHNOLOGIES
+        analysis_json, profile_update = _compute_developer_patterns(technologies_to_analyze)
         
-        # Generate recommendations
-        recommendations = [
-            "Continue using component-based architecture across all projects",
-            "Consider applying React state management patterns to iOS/Android",
-            "Leverage Python analytics insights for mobile app features"
-        ]
-        
-        # Update developer profile
-        profile_update = {
-            "swift_patterns": technology_patterns.get("swift", {}),
-            "android_patterns": technology_patterns.get("android", {}),
-            "react_patterns": technology_patterns.get("react", {}),
-            "python_patterns": technology_patterns.get("python", {}),
-            "javascript_patterns": technology_patterns.get("javascript", {}),
-            "pattern_confidence_scores": confidence_scores,
-            "success_correlations": {"overall": 0.75},
-            "anti_patterns": anti_patterns
-        }
-        
-        db_manager.update_developer_profile(developer_id, profile_update)
-        
-        result = DeveloperPatternAnalysis(
-            technology_patterns=technology_patterns,
-            cross_technology_insights=cross_technology_insights,
-            success_patterns=success_patterns,
-            anti_patterns=anti_patterns,
-            recommendations=recommendations,
-            confidence_scores=confidence_scores
-        )
+        # Only write the profile back when this analysis changes it
+        if existing_profile is None or any(
+            existing_profile.get(column) != profile_update.get(column, {}) for column in PROFILE_JSON_COLUMNS
+        ):
+            db_manager.update_developer_profile(developer_id, profile_update)
         
-        return json.dumps(asdict(result), indent=2)
+        return analysis_json
         
     except Exception as e:
-        logger.error(f"Error analyzing developer patterns: {str(e)}")
-        result = DeveloperPatternAnalysis(
+        logger.error("Error analyzing developer patterns: %s", e)
+        return _error_json(
             technology_patterns={},
             cross_technology_insights=[],
             success_patterns=[],
@@ -1008,10 +1832,93 @@ def analyze_developer_patterns(
             recommendations=[f"Error analyzing patterns: {str(e)}"],
             confidence_scores={}
         )
-        return json.dumps(asdict(result), indent=2)
+
+@lru_cache(maxsize=128)
+def _compute_developer_patterns(technologies: Tuple[str, ...]) -> Tuple[str, Dict[str, Any]]:
+    """Build the pattern analysis JSON and matching profile update for a set of technologies.
+    
+    Both are derived only from the technologies and the engine's fixed pattern
+    tables, so each distinct tuple is computed once. Callers must not mutate
+    the returned profile update.
+    """
+    # Initialize pattern analysis
+    technology_patterns = {}
+    cross_technology_insights = []
+    success_patterns = []
+    anti_patterns = []
+    recommendations = []
+    confidence_scores = {}
+    
+    for tech in technologies:
+        tech_patterns = intelligence_engine.technology_patterns.get(tech, {})
+        technology_patterns[tech] = {
+            "detected_patterns": tech_patterns,
+            "usage_frequency": 0.5,  # Placeholder
+            "success_correlation": 0.7  # Placeholder
+        }
+        confidence_scores[tech] = 0.6  # Placeholder confidence
+    
+    # Generate cross-technology insights
+    if len(technologies) > 1:
+        cross_technology_insights = [
+            {
+                "insight": "UI patterns from Swift can be adapted to React components",
+                "source_technology": "swift",
+                "target_technology": "react",
+                "confidence": 0.7
+            },
+            {
+                "insight": "Data handling patterns from Python analytics apply to mobile backends",
+                "source_technology": "python", 
+                "target_technology": "android",
+                "confidence": 0.6
+            }
+        ]
+    
+    # Generate success patterns
+    success_patterns = [
+        {
+            "pattern": "Component-based architecture",
+            "technologies": ["swift", "react", "android"],
+            "success_rate": 0.85,
+            "description": "Modular component architecture works well across platforms"
+        }
+    ]
+    
+    # Generate recommendations
+    recommendations = [
+        "Continue using component-based architecture across all projects",
+        "Consider applying React state management patterns to iOS/Android",
+        "Leverage Python analytics insights for mobile app features"
+    ]
+    
+    # Developer profile update
+    profile_update = {
+        "swift_patterns": technology_patterns.get("swift", {}),
+        "android_patterns": technology_patterns.get("android", {}),
+        "react_patterns": technology_patterns.get("react", {}),
+        "python_patterns": technology_patterns.get("python", {}),
+        "javascript_patterns": technology_patterns.get("javascript", {}),
+        "pattern_confidence_scores": confidence_scores,
+        "success_correlations": {"overall": 0.75},
+        "anti_patterns": anti_patterns
+    }
+    # In stored JSON form (tuples become lists), so it compares equal to a loaded profile
+    profile_update = {column: _json_loads(_json_dumps(value)) for column, value in profile_update.items()}
+    
+    result = DeveloperPatternAnalysis(
+        technology_patterns=technology_patterns,
+        cross_technology_insights=cross_technology_insights,
+        success_patterns=success_patterns,
+        anti_patterns=anti_patterns,
+        recommendations=recommendations,
+        confidence_scores=confidence_scores
+    )
+    
+    return result.model_dump_json(indent=2), profile_update
 
 @mcp.tool  
-def bootstrap_existing_project(
+async def bootstrap_existing_project(
     project_path: str,
     analysis_depth: Literal["basic", "comprehensive", "full_history"] = "comprehensive"
 ) -> str:
@@ -1033,8 +1940,10 @@ def bootstrap_existing_project(
         if not os.path.exists(project_path):
             raise ValueError(f"Project path does not exist: {project_path}")
         
-        # Analyze the project
-        analysis = bootstrap_engine.analyze_existing_project(project_path)
+        # Analyze the project in a worker thread; the directory walk and git
+        # calls block, and other tool calls shouldn't wait behind them
+        loop = asyncio.get_running_loop()
+        analysis = await loop.run_in_executor(None, bootstrap_engine.analyze_existing_project, project_path)
         
         # Create project entry based on analysis
         project_name = os.path.basename(project_path)
@@ -1059,22 +1968,17 @@ def bootstrap_existing_project(
             "description": f"Bootstrapped project from {project_path}",
             "repository_path": project_path,
             "developer_id": DEVELOPER_ID,
-            "intelligence_profile": analysis,
-            "cross_project_patterns": analysis["patterns"]
+            # Patterns go to their own table rather than into this JSON blob
+            "intelligence_profile": {key: value for key, value in analysis.items() if key != "patterns"}
         }
         
         # Create project in database
         project_id = db_manager.create_project(project_data)
+        db_manager.insert_patterns_batch(project_id, analysis["patterns"])
         
         # Extract key insights
         extracted_patterns = analysis["patterns"]
-        architectural_decisions = [
-            {
-                "decision": f"Uses {tech} technology",
-                "rationale": "Detected from project structure",
-                "confidence": 0.8
-            } for tech in technologies
-        ]
+        architectural_decisions = [dict(decision) for decision in _architectural_decisions(tuple(technologies))]
         
         technology_analysis = {
             "detected_technologies": technologies,
@@ -1095,11 +1999,11 @@ def bootstrap_existing_project(
             message=f"Successfully bootstrapped project from {project_path}"
         )
         
-        return json.dumps(asdict(result), indent=2)
+        return result.model_dump_json(indent=2)
         
     except Exception as e:
-        logger.error(f"Error bootstrapping project: {str(e)}")
-        result = ProjectBootstrapResult(
+        logger.error("Error bootstrapping project: %s", e)
+        return _error_json(
             project_id="",
             extracted_patterns=[],
             architectural_decisions=[],
@@ -1109,15 +2013,51 @@ def bootstrap_existing_project(
             success=False,
             message=f"Error bootstrapping project: {str(e)}"
         )
-        return json.dumps(asdict(result), indent=2)
+
+@lru_cache(maxsize=256)
+def _architectural_decisions(technologies: Tuple[str, ...]) -> Tuple[MappingProxyType, ...]:
+    """Architectural decisions implied by a detected technology stack, as shared read-only views."""
+    return tuple(
+        MappingProxyType({
+            "decision": f"Uses {tech} technology",
+            "rationale": "Detected from project structure",
+            "confidence": 0.8
+        }) for tech in technologies
+    )
+
+_shut_down = False
+
+def _shutdown():
+    """Flush queued vector writes, save the similarity index and close the database (once)."""
+    global _shut_down
+    if _shut_down:
+        return
+    _shut_down = True
+    vector_store.close()
+    similarity_index.save()
+    db_manager.close()
+
+def _exit_on_signal(signum, frame):
+    """Turn a termination signal into SystemExit so cleanup handlers run."""
+    raise SystemExit(128 + signum)
 
 async def main():
     """Main server function"""
     port = int(os.getenv('CONTEXT_STORAGE_PORT', 8001))
-    logger.info(f"Starting Context Storage Server on port {port}")
+    logger.info("Starting Context Storage Server on port %s", port)
     logger.info("Features: Multi-project intelligent storage, vector embeddings, project bootstrap engine")
+    logger.info("SQLite: WAL journal, synchronous=NORMAL, 256 MiB mmap "
+                "(an OS crash or power loss may roll back the last few commits; the database stays consistent)")
+    
+    # The orchestrator stops servers with SIGTERM, which would otherwise skip
+    # the cleanup below and drop queued vector writes
+    atexit.register(_shutdown)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
     
-    await mcp.run(transport="stdio")
+    try:
+        await mcp.run(transport="stdio")
+    finally:
+        _shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -10,23 +10,34 @@ Port: 8003
 """
 
 import asyncio
+import copy
+import hashlib
+import heapq
 import sqlite3
 import json
 import logging
+import time
 from typing import List, Dict, Any, Optional, Tuple, Set
 from datetime import datetime, timedelta
 from pathlib import Path
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from operator import itemgetter
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import PCA, LatentDirichletAllocation
-from sklearn.metrics.pairwise import cosine_similarity
 from collections import defaultdict, Counter
 import os
 from dotenv import load_dotenv
 
 from fastmcp import FastMCP
 
+# Optional: Aho-Corasick automaton finds every anti-pattern indicator in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 load_dotenv()
 
 # Initialize FastMCP
@@ -35,14 +46,95 @@ mcp = FastMCP("Intelligence Engine Server")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Developer DNA profiles are reused for identical activity data within this many seconds
+DNA_CACHE_TTL = float(os.getenv('DNA_CACHE_TTL', 60))
+DNA_CACHE_SIZE = 64
+
+@dataclass
+class ActivityViews:
+    """Columns of one developer activity payload, extracted in a single pass for the analyzers"""
+    project_techs: np.ndarray
+    durations_weeks: np.ndarray
+    completion_rates: np.ndarray
+    quality_scores: np.ndarray
+    patterns_counter: Counter
+    techs_set: Set[str]
+    session_durations: np.ndarray
+    session_lines: np.ndarray
+    bugs_in: np.ndarray
+    bugs_fix: np.ndarray
+    research_times: np.ndarray
+    search_queries: List[str]
+    search_success: np.ndarray
+
+def _pass_memoized(method):
+    """Reuse a views-only helper's result for the rest of the current compute pass"""
+    name = method.__name__
+    
+    @wraps(method)
+    def wrapper(self, views):
+        memo = self._pass_memo
+        if memo is None:
+            return method(self, views)
+        if name not in memo:
+            memo[name] = method(self, views)
+        return memo[name]
+    
+    return wrapper
+
 class DeveloperProfileAnalyzer:
     """Analyzes developer patterns and creates intelligence profiles"""
     
+    # Technology similarity matrix
+    _TECH_SIMILARITY = {
+        ('swift', 'react'): 0.7,  # Both have component-based architecture
+        ('swift', 'javascript'): 0.6,  # Similar syntax patterns
+        ('android', 'python'): 0.8,  # Similar paradigms
+        ('python', 'javascript'): 0.7,  # Both scripting languages
+        ('react', 'javascript'): 0.9   # React is JavaScript
+    }
+    
+    # Concepts that carry over between two technologies, in either direction
+    _TRANSFER_MAP = {
+        frozenset(('swift', 'react')): ('Component architecture', 'State management', 'Property binding'),
+        frozenset(('android', 'python')): ('Object-oriented patterns', 'Async programming', 'Data structures'),
+        frozenset(('python', 'javascript')): ('Functions as first-class objects', 'Dynamic typing', 'List comprehensions')
+    }
+    
+    # Search query categories in precedence order, with the substrings that select them;
+    # queries matching none are 'general'
+    _SEARCH_CATEGORIES = (
+        ('best_practices', ('best practice', 'pattern')),
+        ('debugging', ('error', 'fix', 'debug')),
+        ('learning', ('how to', 'tutorial'))
+    )
+    
     def __init__(self):
         self.coding_patterns = defaultdict(list)
         self.technology_preferences = defaultdict(float)
         self.problem_solving_patterns = defaultdict(list)
         self.efficiency_metrics = defaultdict(dict)
+        self._dna_cache = OrderedDict()
+        self._pass_memo = None
+        
+        # Dense symmetric form of the similarity table for whole-matrix scoring
+        known_techs = sorted({tech for pair in self._TECH_SIMILARITY for tech in pair})
+        self._tech_index = {tech: i for i, tech in enumerate(known_techs)}
+        self._sim_matrix = np.zeros((len(known_techs), len(known_techs)))
+        for (tech1, tech2), similarity in self._TECH_SIMILARITY.items():
+            i, j = self._tech_index[tech1], self._tech_index[tech2]
+            self._sim_matrix[i, j] = self._sim_matrix[j, i] = similarity
+        self._sim_pairs = np.triu(self._sim_matrix > 0, k=1)
+        
+        # One automaton over every category term classifies a whole search history in one scan
+        self._search_automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for rank, (_, terms) in enumerate(self._SEARCH_CATEGORIES):
+                for term in terms:
+                    automaton.add_word(term, rank)
+            automaton.make_automaton()
+            self._search_automaton = automaton
         
     async def analyze_developer_dna(self, user_id: str = "default") -> Dict[str, Any]:
         """Generate comprehensive developer DNA profile"""
@@ -50,20 +142,67 @@ class DeveloperProfileAnalyzer:
         # Fetch developer activity data (would connect to Context Storage Server)
         activity_data = await self._fetch_developer_activity(user_id)
         
+        # Unchanged activity within the TTL yields the same profile
+        key = (user_id, self._activity_fingerprint(activity_data))
+        now = time.monotonic()
+        entry = self._dna_cache.get(key)
+        if entry is not None and now - entry[0] < DNA_CACHE_TTL:
+            self._dna_cache.move_to_end(key)
+            return self._copy_profile(entry[1])
+        
+        with self._compute_pass():
+            developer_dna = self._compute_developer_dna(user_id, activity_data)
+        
+        self._dna_cache[key] = (now, developer_dna)
+        self._dna_cache.move_to_end(key)
+        while len(self._dna_cache) > DNA_CACHE_SIZE:
+            self._dna_cache.popitem(last=False)
+        
+        return self._copy_profile(developer_dna)
+    
+    @staticmethod
+    def _copy_profile(developer_dna: Dict[str, Any]) -> Dict[str, Any]:
+        """Independent copy of a cached profile, stamped with the time it is handed out"""
+        # Callers add, drop and edit nested keys, none of which may reach the cache
+        profile = copy.deepcopy(developer_dna)
+        profile['profile_generated'] = datetime.now().isoformat()
+        return profile
+    
+    @staticmethod
+    def _activity_fingerprint(activity_data: Dict[str, Any]) -> bytes:
+        """Digest of the activity payload, so profiles are only reused for identical data"""
+        encoded = json.dumps(activity_data, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+    
+    @contextmanager
+    def _compute_pass(self):
+        """Share memoized helper results between the analyzers of one profile computation"""
+        self._pass_memo = {}
+        try:
+            yield
+        finally:
+            self._pass_memo = None
+    
+    def _compute_developer_dna(self, user_id: str, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run every analyzer over the activity data and assemble the DNA profile"""
+        
+        # Extract every column the analyzers need in one traversal
+        views = self._precompute_activity_views(activity_data)
+        
         # Analyze coding patterns
-        coding_analysis = self._analyze_coding_patterns(activity_data)
+        coding_analysis = self._analyze_coding_patterns(views)
         
         # Analyze technology preferences and expertise
-        tech_analysis = self._analyze_technology_patterns(activity_data)
+        tech_analysis = self._analyze_technology_patterns(views)
         
         # Analyze problem-solving approaches
-        problem_solving_analysis = self._analyze_problem_solving(activity_data)
+        problem_solving_analysis = self._analyze_problem_solving(views)
         
         # Identify learning patterns
-        learning_analysis = self._analyze_learning_patterns(activity_data)
+        learning_analysis = self._analyze_learning_patterns(views)
         
         # Calculate developer efficiency metrics
-        efficiency_analysis = self._calculate_efficiency_metrics(activity_data)
+        efficiency_analysis = self._calculate_efficiency_metrics(views)
         
         # Generate cross-technology insights
         cross_tech_insights = self._generate_cross_tech_insights(tech_analysis)
@@ -129,39 +268,92 @@ class DeveloperProfileAnalyzer:
             ]
         }
     
-    def _analyze_coding_patterns(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze developer's coding patterns and preferences"""
+    @staticmethod
+    def _precompute_activity_views(activity_data: Dict[str, Any]) -> ActivityViews:
+        """Walk the projects, sessions and searches once, collecting the columns every analyzer uses"""
         
-        patterns_used = []
+        techs, weeks, completion_rates, quality_scores = [], [], [], []
+        patterns_counter = Counter()
         for project in activity_data.get('projects', []):
-            patterns_used.extend(project.get('patterns_used', []))
+            techs.append(project['technology'])
+            weeks.append(project['duration_weeks'])
+            completion_rates.append(project['completion_rate'])
+            quality_scores.append(project['code_quality_score'])
+            patterns_counter.update(project.get('patterns_used', ()))
+        
+        # One row per session; the columns below are views into this block
+        sessions = np.array([
+            (s.get('duration_minutes', 0), s.get('lines_written', 0), s.get('bugs_introduced', 0),
+             s.get('bugs_fixed', 0), s.get('research_time_minutes', 0))
+            for s in activity_data.get('code_sessions', [])
+        ], dtype=np.float64).reshape(-1, 5)
+        
+        searches = activity_data.get('search_history', [])
+        
+        return ActivityViews(
+            project_techs=np.array(techs, dtype=object),
+            durations_weeks=np.array(weeks),
+            completion_rates=np.array(completion_rates, dtype=np.float64),
+            quality_scores=np.array(quality_scores, dtype=np.float64),
+            patterns_counter=patterns_counter,
+            techs_set=set(techs),
+            session_durations=sessions[:, 0],
+            session_lines=sessions[:, 1],
+            bugs_in=sessions[:, 2],
+            bugs_fix=sessions[:, 3],
+            research_times=sessions[:, 4],
+            search_queries=[s['query'] for s in searches],
+            search_success=np.array([s['success'] for s in searches], dtype=np.float64)
+        )
+    
+    def _analyze_coding_patterns(self, views: ActivityViews) -> Dict[str, Any]:
+        """Analyze developer's coding patterns and preferences"""
         
-        pattern_frequency = Counter(patterns_used)
+        pattern_frequency = views.patterns_counter
         
         # Analyze session productivity
-        sessions = activity_data.get('code_sessions', [])
+        durations = views.session_durations
+        lines = views.session_lines
         productivity_metrics = {
-            'avg_session_duration': np.mean([s['duration_minutes'] for s in sessions]) if sessions else 0,
-            'avg_lines_per_minute': np.mean([s['lines_written'] / s['duration_minutes'] for s in sessions if s['duration_minutes'] > 0]) if sessions else 0,
-            'bug_introduction_rate': np.mean([s['bugs_introduced'] / s['lines_written'] for s in sessions if s['lines_written'] > 0]) if sessions else 0,
-            'bug_fix_rate': np.mean([s['bugs_fixed'] / s['duration_minutes'] for s in sessions if s['duration_minutes'] > 0]) if sessions else 0
+            'avg_session_duration': float(durations.mean()) if len(durations) else 0,
+            'avg_lines_per_minute': self._mean_ratio(lines, durations, 0),
+            'bug_introduction_rate': self._mean_ratio(views.bugs_in, lines, 0),
+            'bug_fix_rate': self._mean_ratio(views.bugs_fix, durations, 0)
         }
         
         return {
             'preferred_patterns': dict(pattern_frequency.most_common(5)),
-            'coding_style': self._determine_coding_style(patterns_used),
+            'coding_style': self._determine_coding_style(pattern_frequency),
             'productivity_metrics': productivity_metrics,
-            'consistency_score': self._calculate_consistency_score(sessions)
+            'consistency_score': self._calculate_consistency_score(views)
         }
     
-    def _analyze_technology_patterns(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _mean_ratio(numerator: np.ndarray, denominator: np.ndarray, default: float) -> float:
+        """Mean of numerator / denominator over the entries with a positive denominator"""
+        mask = denominator > 0
+        if not mask.any():
+            return default
+        ratios = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=mask)
+        return float(ratios[mask].mean())
+    
+    @staticmethod
+    def _mean_std(values: np.ndarray) -> Tuple[float, float]:
+        """Mean and population standard deviation, reusing the mean that np.std would recompute"""
+        mean = values.mean()
+        deviations = values - mean
+        return float(mean), float(np.sqrt(deviations.dot(deviations) / len(values)))
+    
+    def _analyze_technology_patterns(self, views: ActivityViews) -> Dict[str, Any]:
         """Analyze technology expertise and preferences"""
         
         tech_experience = {}
         tech_proficiency = {}
         
-        for project in activity_data.get('projects', []):
-            tech = project['technology']
+        for tech, duration_weeks, completion_rate, quality_score in zip(
+            views.project_techs.tolist(), views.durations_weeks.tolist(),
+            views.completion_rates.tolist(), views.quality_scores.tolist()
+        ):
             if tech not in tech_experience:
                 tech_experience[tech] = {
                     'projects_count': 0,
@@ -171,11 +363,12 @@ class DeveloperProfileAnalyzer:
                 }
             
             tech_experience[tech]['projects_count'] += 1
-            tech_experience[tech]['total_weeks'] += project['duration_weeks']
-            tech_experience[tech]['avg_completion_rate'] += project['completion_rate']
-            tech_experience[tech]['avg_quality_score'] += project['code_quality_score']
+            tech_experience[tech]['total_weeks'] += duration_weeks
+            tech_experience[tech]['avg_completion_rate'] += completion_rate
+            tech_experience[tech]['avg_quality_score'] += quality_score
         
-        # Calculate averages
+        # Calculate averages, tracking the most proficient technology as we go
+        primary_technology, best_proficiency = None, float('-inf')
         for tech, data in tech_experience.items():
             count = data['projects_count']
             data['avg_completion_rate'] /= count
@@ -188,60 +381,57 @@ class DeveloperProfileAnalyzer:
                 data['avg_quality_score'] * 0.3   # Quality factor
             )
             tech_proficiency[tech] = proficiency
+            if proficiency > best_proficiency:
+                primary_technology, best_proficiency = tech, proficiency
         
         return {
             'technology_experience': tech_experience,
             'proficiency_scores': tech_proficiency,
-            'primary_technology': max(tech_proficiency.items(), key=lambda x: x[1])[0] if tech_proficiency else None,
+            'primary_technology': primary_technology,
             'technology_versatility': len(tech_proficiency),
             'cross_tech_correlation': self._calculate_cross_tech_correlation(tech_proficiency)
         }
     
-    def _analyze_problem_solving(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_problem_solving(self, views: ActivityViews) -> Dict[str, Any]:
         """Analyze problem-solving approaches and preferences"""
         
-        search_patterns = activity_data.get('search_history', [])
-        research_patterns = []
-        
-        for session in activity_data.get('code_sessions', []):
-            if session.get('research_time_minutes', 0) > 0:
-                research_ratio = session['research_time_minutes'] / session['duration_minutes']
-                research_patterns.append(research_ratio)
+        researched = (views.research_times > 0) & (views.session_durations > 0)
+        research_patterns = views.research_times[researched] / views.session_durations[researched]
+        avg_research_ratio = float(research_patterns.mean()) if len(research_patterns) else 0
         
         problem_solving_style = {
-            'research_to_code_ratio': np.mean(research_patterns) if research_patterns else 0,
-            'search_success_rate': np.mean([s['success'] for s in search_patterns]) if search_patterns else 0,
-            'preferred_search_types': self._analyze_search_types(search_patterns),
-            'debugging_efficiency': self._calculate_debugging_efficiency(activity_data),
-            'solution_approach': self._determine_solution_approach(research_patterns, search_patterns)
+            'research_to_code_ratio': avg_research_ratio,
+            'search_success_rate': float(views.search_success.mean()) if len(views.search_success) else 0,
+            'preferred_search_types': self._analyze_search_types(views.search_queries),
+            'debugging_efficiency': self._calculate_debugging_efficiency(views),
+            'solution_approach': self._determine_solution_approach(avg_research_ratio, views.search_queries)
         }
         
         return problem_solving_style
     
-    def _analyze_learning_patterns(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_learning_patterns(self, views: ActivityViews) -> Dict[str, Any]:
         """Analyze how the developer learns and adopts new concepts"""
         
         learning_indicators = {
-            'new_pattern_adoption_rate': self._calculate_pattern_adoption_rate(activity_data),
-            'technology_exploration_frequency': self._calculate_tech_exploration(activity_data),
-            'knowledge_retention_score': self._calculate_knowledge_retention(activity_data),
-            'preferred_learning_style': self._determine_learning_style(activity_data)
+            'new_pattern_adoption_rate': self._calculate_pattern_adoption_rate(views),
+            'technology_exploration_frequency': self._calculate_tech_exploration(views),
+            'knowledge_retention_score': self._calculate_knowledge_retention(views),
+            'preferred_learning_style': self._determine_learning_style(views)
         }
         
         return learning_indicators
     
-    def _calculate_efficiency_metrics(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_efficiency_metrics(self, views: ActivityViews) -> Dict[str, Any]:
         """Calculate various efficiency metrics"""
         
-        projects = activity_data.get('projects', [])
-        sessions = activity_data.get('code_sessions', [])
+        has_projects = len(views.project_techs) > 0
         
         efficiency_metrics = {
-            'project_completion_efficiency': np.mean([p['completion_rate'] / p['duration_weeks'] for p in projects]) if projects else 0,
-            'code_quality_consistency': np.std([p['code_quality_score'] for p in projects]) if projects else 0,
-            'debugging_to_development_ratio': self._calculate_debug_ratio(sessions),
-            'knowledge_reuse_efficiency': self._calculate_knowledge_reuse(activity_data),
-            'overall_productivity_score': self._calculate_overall_productivity(projects, sessions)
+            'project_completion_efficiency': float((views.completion_rates / views.durations_weeks).mean()) if has_projects else 0,
+            'code_quality_consistency': self._mean_std(views.quality_scores)[1] if has_projects else 0,
+            'debugging_to_development_ratio': self._calculate_debug_ratio(views),
+            'knowledge_reuse_efficiency': self._calculate_knowledge_reuse(views),
+            'overall_productivity_score': self._calculate_overall_productivity(views)
         }
         
         return efficiency_metrics
@@ -251,31 +441,35 @@ class DeveloperProfileAnalyzer:
         
         proficiency_scores = tech_analysis.get('proficiency_scores', {})
         
-        # Technology similarity matrix
-        tech_similarity = {
-            ('swift', 'react'): 0.7,  # Both have component-based architecture
-            ('swift', 'javascript'): 0.6,  # Similar syntax patterns
-            ('android', 'python'): 0.8,  # Similar paradigms
-            ('python', 'javascript'): 0.7,  # Both scripting languages
-            ('react', 'javascript'): 0.9   # React is JavaScript
-        }
+        # Knowledge flows from a strong technology (rows) to a similar weak one (columns);
+        # the symmetric matrix covers both directions of every pair
+        p, known = self._proficiency_vector(proficiency_scores)
+        transfer_potential = self._sim_matrix * p[:, None]
+        mask = (
+            (known & (p > 0.7))[:, None] & (known & (p < 0.5))[None, :] & (self._sim_matrix > 0)
+        )
+        sources, targets = np.nonzero(mask)
+        potentials = transfer_potential[sources, targets]
+        order = np.argsort(-potentials, kind='stable')
         
-        transfer_opportunities = []
-        for (tech1, tech2), similarity in tech_similarity.items():
-            if tech1 in proficiency_scores and tech2 in proficiency_scores:
-                if proficiency_scores[tech1] > 0.7 and proficiency_scores[tech2] < 0.5:
-                    transfer_opportunities.append({
-                        'from_technology': tech1,
-                        'to_technology': tech2,
-                        'transfer_potential': similarity * proficiency_scores[tech1],
-                        'recommended_concepts': self._get_transferable_concepts(tech1, tech2)
-                    })
+        techs = list(self._tech_index)
+        transfer_opportunities = [
+            {
+                'from_technology': techs[source],
+                'to_technology': techs[target],
+                'transfer_potential': potential,
+                'recommended_concepts': self._get_transferable_concepts(techs[source], techs[target])
+            }
+            for source, target, potential in zip(
+                sources[order].tolist(), targets[order].tolist(), potentials[order].tolist()
+            )
+        ]
         
         return {
             'transfer_opportunities': transfer_opportunities,
             'strongest_tech_combination': self._find_strongest_combination(proficiency_scores),
             'knowledge_gaps': self._identify_knowledge_gaps(proficiency_scores),
-            'synergy_score': self._calculate_synergy_score(proficiency_scores, tech_similarity)
+            'synergy_score': self._calculate_synergy_score(proficiency_scores)
         }
     
     def _calculate_intelligence_score(self, coding: Dict, tech: Dict, problem_solving: Dict, efficiency: Dict) -> float:
@@ -354,7 +548,7 @@ class DeveloperProfileAnalyzer:
         return recommendations
     
     # Helper methods (simplified implementations)
-    def _determine_coding_style(self, patterns: List[str]) -> str:
+    def _determine_coding_style(self, patterns: Counter) -> str:
         if 'MVVM' in patterns or 'MVC' in patterns:
             return 'architecture-focused'
         elif 'Hooks' in patterns or 'Functional' in patterns:
@@ -362,17 +556,17 @@ class DeveloperProfileAnalyzer:
         else:
             return 'pragmatic'
     
-    def _calculate_consistency_score(self, sessions: List[Dict]) -> float:
-        if not sessions:
+    @_pass_memoized
+    def _calculate_consistency_score(self, views: ActivityViews) -> float:
+        durations = views.session_durations
+        mask = durations > 0
+        if not mask.any():
             return 0.5
         
-        productivities = [s['lines_written'] / s['duration_minutes'] for s in sessions if s['duration_minutes'] > 0]
-        if not productivities:
-            return 0.5
+        productivities = views.session_lines[mask] / durations[mask]
         
         # Lower standard deviation = higher consistency
-        std_dev = np.std(productivities)
-        mean_productivity = np.mean(productivities)
+        mean_productivity, std_dev = self._mean_std(productivities)
         
         if mean_productivity == 0:
             return 0.5
@@ -386,34 +580,36 @@ class DeveloperProfileAnalyzer:
         if len(proficiency) < 2:
             return 0.0
         
-        scores = list(proficiency.values())
-        return 1.0 - (max(scores) - min(scores))  # Higher correlation = less variance
-    
-    def _analyze_search_types(self, searches: List[Dict]) -> Dict[str, int]:
-        types = defaultdict(int)
-        for search in searches:
-            query = search['query'].lower()
-            if 'best practice' in query or 'pattern' in query:
-                types['best_practices'] += 1
-            elif 'error' in query or 'fix' in query or 'debug' in query:
-                types['debugging'] += 1
-            elif 'how to' in query or 'tutorial' in query:
-                types['learning'] += 1
-            else:
-                types['general'] += 1
-        return dict(types)
-    
-    def _calculate_debugging_efficiency(self, activity_data: Dict) -> float:
-        sessions = activity_data.get('code_sessions', [])
-        if not sessions:
-            return 0.5
-        
-        fix_rates = [s['bugs_fixed'] / s['duration_minutes'] for s in sessions if s['duration_minutes'] > 0]
-        return np.mean(fix_rates) if fix_rates else 0.5
-    
-    def _determine_solution_approach(self, research_patterns: List[float], search_patterns: List[Dict]) -> str:
-        avg_research_ratio = np.mean(research_patterns) if research_patterns else 0
-        
+        scores = np.fromiter(proficiency.values(), dtype=np.float64, count=len(proficiency))
+        return 1.0 - float(np.ptp(scores))  # Higher correlation = less variance
+    
+    def _analyze_search_types(self, queries: List[str]) -> Dict[str, int]:
+        categories = [category for category, _ in self._SEARCH_CATEGORIES] + ['general']
+        if self._search_automaton is None:
+            return dict(Counter(self._classify_search(query.lower()) for query in queries))
+        
+        # Scan all queries joined by newlines (no term contains one), map each hit
+        # back to its query by offset and keep the highest-precedence category
+        lowered = [query.lower() for query in queries]
+        query_ends = np.cumsum([len(query) + 1 for query in lowered])
+        ranks = np.full(len(lowered), len(categories) - 1)
+        hits = list(self._search_automaton.iter('\n'.join(lowered)))
+        if hits:
+            positions, hit_ranks = zip(*hits)
+            np.minimum.at(ranks, np.searchsorted(query_ends, positions, side='right'), hit_ranks)
+        return dict(Counter(categories[rank] for rank in ranks.tolist()))
+    
+    def _classify_search(self, query_lower: str) -> str:
+        for category, terms in self._SEARCH_CATEGORIES:
+            if any(term in query_lower for term in terms):
+                return category
+        return 'general'
+    
+    @_pass_memoized
+    def _calculate_debugging_efficiency(self, views: ActivityViews) -> float:
+        return self._mean_ratio(views.bugs_fix, views.session_durations, 0.5)
+    
+    def _determine_solution_approach(self, avg_research_ratio: float, search_queries: List[str]) -> str:
         if avg_research_ratio > 0.3:
             return 'research-first'
         elif avg_research_ratio > 0.1:
@@ -421,48 +617,37 @@ class DeveloperProfileAnalyzer:
         else:
             return 'trial-and-error'
     
-    def _calculate_pattern_adoption_rate(self, activity_data: Dict) -> float:
+    @_pass_memoized
+    def _calculate_pattern_adoption_rate(self, views: ActivityViews) -> float:
         # Simplified: count unique patterns used across projects
-        all_patterns = set()
-        for project in activity_data.get('projects', []):
-            all_patterns.update(project.get('patterns_used', []))
-        
-        project_count = len(activity_data.get('projects', []))
+        project_count = len(views.project_techs)
         if project_count == 0:
             return 0.0
         
-        return len(all_patterns) / project_count
+        return len(views.patterns_counter) / project_count
     
-    def _calculate_tech_exploration(self, activity_data: Dict) -> float:
-        techs_used = set()
-        for project in activity_data.get('projects', []):
-            techs_used.add(project['technology'])
-        
+    @_pass_memoized
+    def _calculate_tech_exploration(self, views: ActivityViews) -> float:
         # Normalize by expected exploration (assume 5 techs is high exploration)
-        return min(1.0, len(techs_used) / 5.0)
+        return min(1.0, len(views.techs_set) / 5.0)
     
-    def _calculate_knowledge_retention(self, activity_data: Dict) -> float:
+    @_pass_memoized
+    def _calculate_knowledge_retention(self, views: ActivityViews) -> float:
         # Simplified: measure pattern reuse across projects
-        pattern_usage = defaultdict(int)
-        for project in activity_data.get('projects', []):
-            for pattern in project.get('patterns_used', []):
-                pattern_usage[pattern] += 1
+        pattern_usage = views.patterns_counter
         
         if not pattern_usage:
             return 0.5
         
-        reused_patterns = sum(1 for count in pattern_usage.values() if count > 1)
-        total_patterns = len(pattern_usage)
-        
-        return reused_patterns / total_patterns if total_patterns > 0 else 0.5
+        reused_patterns = sum(count > 1 for count in pattern_usage.values())
+        return reused_patterns / len(pattern_usage)
     
-    def _determine_learning_style(self, activity_data: Dict) -> str:
+    def _determine_learning_style(self, views: ActivityViews) -> str:
         # Simplified determination based on research patterns
-        sessions = activity_data.get('code_sessions', [])
-        if not sessions:
+        if not len(views.research_times):
             return 'unknown'
         
-        avg_research_time = np.mean([s.get('research_time_minutes', 0) for s in sessions])
+        avg_research_time = views.research_times.mean()
         
         if avg_research_time > 45:
             return 'research-heavy'
@@ -471,23 +656,21 @@ class DeveloperProfileAnalyzer:
         else:
             return 'hands-on'
     
-    def _calculate_debug_ratio(self, sessions: List[Dict]) -> float:
-        if not sessions:
+    @_pass_memoized
+    def _calculate_debug_ratio(self, views: ActivityViews) -> float:
+        lines = views.session_lines
+        if not len(lines):
             return 0.5
         
-        debug_indicators = []
-        for session in sessions:
-            bugs_fixed = session.get('bugs_fixed', 0)
-            lines_written = session.get('lines_written', 1)
-            debug_ratio = bugs_fixed / lines_written if lines_written > 0 else 0
-            debug_indicators.append(debug_ratio)
-        
-        return np.mean(debug_indicators)
+        # Sessions without written lines count as a zero debug ratio
+        debug_indicators = np.divide(views.bugs_fix, lines, out=np.zeros_like(lines), where=lines > 0)
+        return float(debug_indicators.mean())
     
-    def _calculate_knowledge_reuse(self, activity_data: Dict) -> float:
+    @_pass_memoized
+    def _calculate_knowledge_reuse(self, views: ActivityViews) -> float:
         # Measure how often previous patterns/solutions are reused
-        pattern_reuse = self._calculate_pattern_adoption_rate(activity_data)
-        search_diversity = len(set(s['query'] for s in activity_data.get('search_history', [])))
+        pattern_reuse = self._calculate_pattern_adoption_rate(views)
+        search_diversity = len(set(views.search_queries))
         
         if search_diversity == 0:
             return pattern_reuse
@@ -496,12 +679,13 @@ class DeveloperProfileAnalyzer:
         reuse_efficiency = pattern_reuse / (1 + search_diversity / 10)
         return min(1.0, reuse_efficiency)
     
-    def _calculate_overall_productivity(self, projects: List[Dict], sessions: List[Dict]) -> float:
-        if not projects or not sessions:
+    @_pass_memoized
+    def _calculate_overall_productivity(self, views: ActivityViews) -> float:
+        if not len(views.project_techs) or not len(views.session_durations):
             return 0.5
         
-        project_efficiency = np.mean([p['completion_rate'] / p['duration_weeks'] for p in projects])
-        session_efficiency = np.mean([s['lines_written'] / s['duration_minutes'] for s in sessions if s['duration_minutes'] > 0])
+        project_efficiency = (views.completion_rates / views.durations_weeks).mean()
+        session_efficiency = self._mean_ratio(views.session_lines, views.session_durations, 0)
         
         # Normalize and combine
         normalized_project = min(1.0, project_efficiency / 0.2)  # Assume 0.2 is good efficiency
@@ -511,51 +695,86 @@ class DeveloperProfileAnalyzer:
     
     def _get_transferable_concepts(self, from_tech: str, to_tech: str) -> List[str]:
         """Get concepts that can transfer between technologies"""
-        transfer_map = {
-            ('swift', 'react'): ['Component architecture', 'State management', 'Property binding'],
-            ('android', 'python'): ['Object-oriented patterns', 'Async programming', 'Data structures'],
-            ('python', 'javascript'): ['Functions as first-class objects', 'Dynamic typing', 'List comprehensions']
-        }
-        
-        return transfer_map.get((from_tech, to_tech), ['General programming concepts'])
+        return list(self._TRANSFER_MAP.get(frozenset((from_tech, to_tech)), ('General programming concepts',)))
+    
+    @staticmethod
+    def _proficiency_arrays(proficiency: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Technology names and their proficiency scores as parallel arrays"""
+        techs = np.array(list(proficiency), dtype=object)
+        scores = np.fromiter(proficiency.values(), dtype=np.float64, count=len(proficiency))
+        return techs, scores
     
     def _find_strongest_combination(self, proficiency: Dict[str, float]) -> Optional[Tuple[str, str]]:
         """Find the strongest technology combination"""
         if len(proficiency) < 2:
             return None
         
-        sorted_techs = sorted(proficiency.items(), key=lambda x: x[1], reverse=True)
-        return (sorted_techs[0][0], sorted_techs[1][0])
+        # Partial selection of the top two; ties keep insertion order, as a stable sort would
+        (first, _), (second, _) = heapq.nlargest(2, proficiency.items(), key=itemgetter(1))
+        return (first, second)
     
     def _identify_knowledge_gaps(self, proficiency: Dict[str, float]) -> List[str]:
         """Identify technologies with knowledge gaps"""
-        gaps = []
-        for tech, score in proficiency.items():
-            if score < 0.6:
-                gaps.append(tech)
-        return gaps
+        techs, scores = self._proficiency_arrays(proficiency)
+        return techs[scores < 0.6].tolist()
     
-    def _calculate_synergy_score(self, proficiency: Dict[str, float], similarity: Dict[Tuple[str, str], float]) -> float:
+    def _calculate_synergy_score(self, proficiency: Dict[str, float]) -> float:
         """Calculate how well technologies work together"""
         if len(proficiency) < 2:
             return 0.0
         
-        synergy_scores = []
-        techs = list(proficiency.keys())
-        
-        for i, tech1 in enumerate(techs):
-            for tech2 in techs[i+1:]:
-                key = (tech1, tech2) if (tech1, tech2) in similarity else (tech2, tech1)
-                if key in similarity:
-                    combined_proficiency = (proficiency[tech1] + proficiency[tech2]) / 2
-                    synergy = similarity[key] * combined_proficiency
-                    synergy_scores.append(synergy)
+        p, known = self._proficiency_vector(proficiency)
         
-        return np.mean(synergy_scores) if synergy_scores else 0.0
+        # Each similar pair's average proficiency, weighted by how similar the technologies are
+        synergy = (p[:, None] + p[None, :]) * 0.5 * self._sim_matrix
+        mask = known[:, None] & known[None, :] & self._sim_pairs
+        return float(synergy[mask].mean()) if mask.any() else 0.0
+    
+    def _proficiency_vector(self, proficiency: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Proficiency scores aligned with the similarity matrix, and which of them the developer has"""
+        n = len(self._tech_index)
+        p = np.fromiter((proficiency.get(tech, 0.0) for tech in self._tech_index), dtype=np.float64, count=n)
+        known = np.fromiter((tech in proficiency for tech in self._tech_index), dtype=bool, count=n)
+        return p, known
 
 class AntiPatternDetector:
     """Detects anti-patterns and problematic code practices"""
     
+    # Simplified pattern detection: substrings of the lowercased code that hint at each anti-pattern
+    _PATTERN_INDICATORS = {
+        'force_unwrapping_abuse': ('!', 'force', 'unwrap'),
+        'retain_cycles': ('weak', 'unowned', 'closure', 'self'),
+        'prop_drilling': ('props.', 'prop'),
+        'useEffect_hell': ('useEffect', 'dependency'),
+        'callback_hell': ('callback', 'function(', ').function('),
+        'global_pollution': ('var ', 'window.', 'global'),
+        'memory_leaks': ('listener', 'timeout', 'interval'),
+        'circular_imports': ('import', 'from')
+    }
+    
+    _DESCRIPTIONS = {
+        'retain_cycles': 'Strong reference cycles that prevent memory deallocation',
+        'force_unwrapping_abuse': 'Excessive use of force unwrapping without proper nil checking',
+        'prop_drilling': 'Passing props through multiple component layers unnecessarily',
+        'useEffect_hell': 'Complex useEffect dependencies causing performance issues',
+        'callback_hell': 'Nested callbacks making code difficult to read and maintain',
+        'memory_leaks': 'References or listeners not properly cleaned up'
+    }
+    
+    _SUGGESTIONS = {
+        'retain_cycles': 'Use weak references or break the cycle with proper cleanup',
+        'force_unwrapping_abuse': 'Use optional binding (if let) or guard statements',
+        'prop_drilling': 'Consider using Context API or state management library',
+        'useEffect_hell': 'Split into multiple useEffect hooks with specific dependencies',
+        'callback_hell': 'Use async/await or Promises to flatten the callback structure',
+        'memory_leaks': 'Implement proper cleanup in componentWillUnmount or useEffect return'
+    }
+    
+    _SEVERITY_WEIGHTS = {'high': 1.0, 'medium': 0.6, 'low': 0.3}
+    
+    # Patterns that are high severity regardless of snippet size
+    _PATTERN_SEVERITY = dict.fromkeys(('memory_leaks', 'retain_cycles', 'blocking_main_thread'), 'high')
+    
     def __init__(self):
         self.anti_patterns = {
             'swift': [
@@ -589,6 +808,26 @@ class AntiPatternDetector:
                 'bitmap_overload'
             ]
         }
+        
+        # Each technology's anti-patterns paired with their indicator substrings
+        self._tech_indicators = {
+            tech: [(pattern, self._PATTERN_INDICATORS.get(pattern, ())) for pattern in patterns]
+            for tech, patterns in self.anti_patterns.items()
+        }
+        
+        # One automaton over every indicator reports all matching anti-patterns
+        # in a single scan of the code instead of one substring search each
+        self._indicator_automaton = None
+        if ahocorasick is not None:
+            indicator_patterns = defaultdict(list)
+            for pattern, indicators in self._PATTERN_INDICATORS.items():
+                for indicator in indicators:
+                    indicator_patterns[indicator].append(pattern)
+            automaton = ahocorasick.Automaton()
+            for indicator, patterns in indicator_patterns.items():
+                automaton.add_word(indicator, tuple(patterns))
+            automaton.make_automaton()
+            self._indicator_automaton = automaton
     
     async def detect_anti_patterns(
         self, 
@@ -599,19 +838,28 @@ class AntiPatternDetector:
         """Detect anti-patterns in code snippet"""
         
         detected_patterns = []
-        tech_patterns = self.anti_patterns.get(technology, [])
+        tech_indicators = self._tech_indicators.get(technology, [])
+        code_lower = code_snippet.lower()
         
         # Simplified pattern detection logic
-        for pattern in tech_patterns:
-            if self._check_pattern(code_snippet, pattern, technology):
-                severity = self._calculate_severity(pattern, code_snippet, context)
-                detected_patterns.append({
-                    'pattern': pattern,
-                    'severity': severity,
-                    'description': self._get_pattern_description(pattern, technology),
-                    'suggestion': self._get_pattern_suggestion(pattern, technology),
-                    'confidence': self._calculate_confidence(pattern, code_snippet)
-                })
+        if self._indicator_automaton is not None:
+            matched_patterns = self._scan_indicators(code_lower)
+            found_patterns = [pattern for pattern, _ in tech_indicators if pattern in matched_patterns]
+        else:
+            found_patterns = [
+                pattern for pattern, indicators in tech_indicators
+                if self._check_pattern_fast(code_lower, indicators)
+            ]
+        
+        for pattern in found_patterns:
+            severity = self._calculate_severity(pattern, code_snippet, context)
+            detected_patterns.append({
+                'pattern': pattern,
+                'severity': severity,
+                'description': self._get_pattern_description(pattern, technology),
+                'suggestion': self._get_pattern_suggestion(pattern, technology),
+                'confidence': self._calculate_confidence(pattern, code_lower)
+            })
         
         return {
             'technology': technology,
@@ -621,67 +869,42 @@ class AntiPatternDetector:
             'recommendations': self._generate_anti_pattern_recommendations(detected_patterns)
         }
     
+    def _scan_indicators(self, code_lower: str) -> Set[str]:
+        """Names of all anti-patterns with an indicator in the lowercased code, from one automaton pass"""
+        matched = set()
+        for _, patterns in self._indicator_automaton.iter(code_lower):
+            matched.update(patterns)
+        return matched
+    
     def _check_pattern(self, code: str, pattern: str, technology: str) -> bool:
         """Check if specific anti-pattern exists in code"""
-        # Simplified pattern detection
-        pattern_indicators = {
-            'force_unwrapping_abuse': ['!', 'force', 'unwrap'],
-            'retain_cycles': ['weak', 'unowned', 'closure', 'self'],
-            'prop_drilling': ['props.', 'prop'],
-            'useEffect_hell': ['useEffect', 'dependency'],
-            'callback_hell': ['callback', 'function(', ').function('],
-            'global_pollution': ['var ', 'window.', 'global'],
-            'memory_leaks': ['listener', 'timeout', 'interval'],
-            'circular_imports': ['import', 'from']
-        }
-        
-        indicators = pattern_indicators.get(pattern, [])
-        return any(indicator in code.lower() for indicator in indicators)
+        return self._check_pattern_fast(code.lower(), self._PATTERN_INDICATORS.get(pattern, ()))
+    
+    @staticmethod
+    def _check_pattern_fast(code_lower: str, indicators: Tuple[str, ...]) -> bool:
+        """Check already-lowercased code for any of an anti-pattern's indicators"""
+        return any(indicator in code_lower for indicator in indicators)
     
     def _calculate_severity(self, pattern: str, code: str, context: Dict[str, Any] = None) -> str:
         """Calculate severity of detected anti-pattern"""
-        high_severity_patterns = ['memory_leaks', 'retain_cycles', 'blocking_main_thread']
-        
-        if pattern in high_severity_patterns:
-            return 'high'
-        elif len(code) > 1000:  # Large code snippets with patterns are more concerning
-            return 'medium'
-        else:
-            return 'low'
+        # Large code snippets with patterns are more concerning
+        return self._PATTERN_SEVERITY.get(pattern) or ('medium' if len(code) > 1000 else 'low')
     
     def _get_pattern_description(self, pattern: str, technology: str) -> str:
         """Get description of the anti-pattern"""
-        descriptions = {
-            'retain_cycles': 'Strong reference cycles that prevent memory deallocation',
-            'force_unwrapping_abuse': 'Excessive use of force unwrapping without proper nil checking',
-            'prop_drilling': 'Passing props through multiple component layers unnecessarily',
-            'useEffect_hell': 'Complex useEffect dependencies causing performance issues',
-            'callback_hell': 'Nested callbacks making code difficult to read and maintain',
-            'memory_leaks': 'References or listeners not properly cleaned up'
-        }
-        
-        return descriptions.get(pattern, f'Anti-pattern detected in {technology} code')
+        return self._DESCRIPTIONS.get(pattern, f'Anti-pattern detected in {technology} code')
     
     def _get_pattern_suggestion(self, pattern: str, technology: str) -> str:
         """Get suggestion to fix the anti-pattern"""
-        suggestions = {
-            'retain_cycles': 'Use weak references or break the cycle with proper cleanup',
-            'force_unwrapping_abuse': 'Use optional binding (if let) or guard statements',
-            'prop_drilling': 'Consider using Context API or state management library',
-            'useEffect_hell': 'Split into multiple useEffect hooks with specific dependencies',
-            'callback_hell': 'Use async/await or Promises to flatten the callback structure',
-            'memory_leaks': 'Implement proper cleanup in componentWillUnmount or useEffect return'
-        }
-        
-        return suggestions.get(pattern, 'Review code structure and apply best practices')
+        return self._SUGGESTIONS.get(pattern, 'Review code structure and apply best practices')
     
-    def _calculate_confidence(self, pattern: str, code: str) -> float:
-        """Calculate confidence in anti-pattern detection"""
+    def _calculate_confidence(self, pattern: str, code_lower: str) -> float:
+        """Calculate confidence in anti-pattern detection from the lowercased code"""
         # Simplified confidence calculation
         base_confidence = 0.7
         
         # Increase confidence based on code length and pattern frequency
-        pattern_count = code.lower().count(pattern.replace('_', ' '))
+        pattern_count = code_lower.count(pattern.replace('_', ' '))
         confidence_boost = min(0.3, pattern_count * 0.1)
         
         return min(1.0, base_confidence + confidence_boost)
@@ -691,10 +914,8 @@ class AntiPatternDetector:
         if not patterns:
             return 0.0
         
-        severity_weights = {'high': 1.0, 'medium': 0.6, 'low': 0.3}
-        
         total_risk = sum(
-            severity_weights.get(p['severity'], 0.5) * p['confidence']
+            self._SEVERITY_WEIGHTS.get(p['severity'], 0.5) * p['confidence']
             for p in patterns
         )
         
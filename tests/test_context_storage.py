@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+AI Agent Context Management System - Context Storage Server Tests
+
+Unit tests for the context storage server's database, indexing and pattern
+scanning, run in-process against temporary databases.
+"""
+
+import pytest
+import sqlite3
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# The server opens its stores at import time; keep them out of the working tree
+_test_dir = tempfile.mkdtemp()
+os.environ.update({
+    'DATABASE_URL': f'sqlite:///{_test_dir}/test_context.db',
+    'VECTOR_DB_PATH': f'{_test_dir}/test_chroma',
+    'SIMILARITY_INDEX_PATH': f'{_test_dir}/test_similarity_index',
+})
+
+from src.servers import context_storage_server as storage
+
+def _project(name, developer_id, **fields):
+    return {"name": name, "type": "react_web", "technologies": ["react"], "developer_id": developer_id, **fields}
+
+@pytest.fixture
+def db(tmp_path):
+    manager = storage.DatabaseManager(str(tmp_path / "context.db"))
+    yield manager
+    manager.close()
+
+class TestProjects:
+    """Project creation and the per-developer name constraint"""
+
+    @pytest.mark.parametrize("first, second, same_project", [
+        (("app", "dev_a"), ("app", "dev_a"), True),
+        (("app", "dev_a"), ("app", "dev_b"), False),
+        (("app", "dev_a"), ("other", "dev_a"), False),
+    ])
+    def test_create_project_upserts_per_developer(self, db, first, second, same_project):
+        first_id = db.create_project(_project(*first, description="first"))
+        second_id = db.create_project(_project(*second, description="second"))
+
+        assert (first_id == second_id) == same_project
+        with db._conn() as conn:
+            rows = conn.execute("SELECT id, description FROM projects ORDER BY rowid").fetchall()
+        assert len(rows) == (1 if same_project else 2)
+        assert rows[-1] == (second_id, "second")
+
+    def test_migrates_globally_unique_project_names(self, tmp_path):
+        db_path = tmp_path / "legacy.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE projects (
+                    id TEXT PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    type TEXT NOT NULL,
+                    technologies TEXT NOT NULL,
+                    description TEXT,
+                    repository_path TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    developer_id TEXT NOT NULL,
+                    intelligence_profile TEXT,
+                    cross_project_patterns TEXT
+                )
+            """)
+            conn.execute("""
+                INSERT INTO projects (id, name, type, technologies, developer_id)
+                VALUES ('legacy-id', 'app', 'react_web', '["react"]', 'dev_a')
+            """)
+        conn.close()
+
+        db = storage.DatabaseManager(str(db_path))
+        try:
+            assert db.create_project(_project("app", "dev_a")) == "legacy-id"
+            assert db.create_project(_project("app", "dev_b")) != "legacy-id"
+            with db._conn() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 2
+        finally:
+            db.close()
+
+class TestDeveloperProfiles:
+    """Developer profile reads, the profile cache and its invalidation"""
+
+    def test_mutating_a_profile_does_not_change_cached_reads(self, db):
+        db.update_developer_profile("dev_a", {"react_patterns": {"hooks": {"count": 1}}})
+        profile = db.get_developer_profile("dev_a")
+        profile["react_patterns"]["hooks"]["count"] = 99
+
+        assert db.get_developer_profile("dev_a")["react_patterns"] == {"hooks": {"count": 1}}
+
+    def test_update_invalidates_cached_profile(self, db):
+        assert db.get_developer_profile("dev_a") is None
+        db.update_developer_profile("dev_a", {"swift_patterns": {"mvvm": 1}})
+        assert db.get_developer_profile("dev_a")["swift_patterns"] == {"mvvm": 1}
+        db.update_developer_profile("dev_a", {"swift_patterns": {"mvvm": 2}})
+        assert db.get_developer_profile("dev_a")["swift_patterns"] == {"mvvm": 2}
+
+    def test_unchanged_analysis_skips_profile_write(self, db, monkeypatch):
+        writes = []
+        update = db.update_developer_profile
+        monkeypatch.setattr(storage, "db_manager", db)
+        monkeypatch.setattr(db, "update_developer_profile", lambda *args: writes.append(args) or update(*args))
+
+        storage.analyze_developer_patterns("dev_a", ["react", "swift"])
+        storage.analyze_developer_patterns("dev_a", ["react", "swift"])
+        assert len(writes) == 1
+
+        storage.analyze_developer_patterns("dev_a", ["python"])
+        assert len(writes) == 2
+
+def _store(db, contents):
+    return db.store_contexts_bulk([
+        {
+            "project_id": "project", "context_type": "conversation", "content": content, "metadata": {},
+            "cross_project_relevance": 0.5, "technology_tags": [], "importance_score": 0.5
+        }
+        for content in contents
+    ])
+
+SIMILARITY_CONTENTS = [
+    "react useState hook keeps component state",
+    "swift combine publisher for view model state",
+    "python pandas dataframe groupby aggregation",
+    "react useEffect hook cleanup on unmount",
+    "android room database migration",
+]
+
+class TestContextSimilarityIndex:
+    """TF-IDF similar_contexts lookups and index persistence"""
+
+    @pytest.fixture
+    def index(self, db, tmp_path):
+        index = storage.ContextSimilarityIndex(db, str(tmp_path / "similarity_index"))
+        index.add(_store(db, SIMILARITY_CONTENTS), SIMILARITY_CONTENTS)
+        return index
+
+    @pytest.mark.parametrize("query, limit, expected_first", [
+        ("react hook state", 5, 0),
+        ("react useEffect cleanup", 2, 3),
+        ("pandas dataframe", 1, 2),
+        ("room migration", 3, 4),
+    ])
+    def test_query_ranks_most_similar_first(self, index, query, limit, expected_first):
+        results = index.query(query, limit)
+
+        assert 0 < len(results) <= limit
+        assert results[0]["context_id"] == index._ids[expected_first]
+        similarities = [result["similarity"] for result in results]
+        assert similarities == sorted(similarities, reverse=True)
+        assert all(0 < similarity <= 1.0 + 1e-6 for similarity in similarities)
+
+    def test_unrelated_query_finds_nothing(self, index):
+        assert index.query("kubernetes helm chart", 5) == []
+
+    def test_saved_index_is_reused_until_contexts_change(self, db, index, tmp_path):
+        index.save()
+        expected = index.query("react hook state", 3)
+
+        reloaded = storage.ContextSimilarityIndex(db, str(tmp_path / "similarity_index"))
+        assert not reloaded._dirty
+        assert reloaded.query("react hook state", 3) == expected
+
+        _store(db, ["vue component props"])
+        rebuilt = storage.ContextSimilarityIndex(db, str(tmp_path / "similarity_index"))
+        assert rebuilt._dirty
+        assert len(rebuilt._ids) == len(SIMILARITY_CONTENTS) + 1
+
+    def test_saved_index_is_plain_data(self, db, index, tmp_path):
+        index.save()
+
+        index_dir = tmp_path / "similarity_index"
+        assert sorted(path.name for path in index_dir.iterdir()) == ["idf.npy", "matrix.npz", "state.json"]
+        assert storage.ContextSimilarityIndex(db, str(index_dir))._vectorizer.vocabulary_ == index._vectorizer.vocabulary_
+
+    def test_corrupt_state_falls_back_to_rebuild(self, db, index, tmp_path):
+        index.save()
+        (tmp_path / "similarity_index" / "state.json").write_text("not json")
+
+        rebuilt = storage.ContextSimilarityIndex(db, str(tmp_path / "similarity_index"))
+        assert rebuilt._dirty
+        assert len(rebuilt._ids) == len(SIMILARITY_CONTENTS)
+
+def _reference_patterns(engine, content, technology):
+    """Substring-per-pattern matching, as the engine did before its scanners"""
+    patterns = []
+    lines = content.split('\n')
+    for pattern_type, pattern_list in engine.technology_patterns.get(technology.lower(), {}).items():
+        for pattern in pattern_list:
+            if pattern.lower() in content.lower():
+                context_lines = []
+                for i, line in enumerate(lines):
+                    if pattern.lower() in line.lower():
+                        context_lines.extend(lines[max(0, i - 2):i + 3])
+                patterns.append({
+                    "pattern": pattern, "type": pattern_type, "technology": technology,
+                    "confidence": 0.8, "context": '\n'.join(context_lines[:10])
+                })
+    return patterns
+
+PATTERN_CONTENTS = [
+    "",
+    "no known patterns here",
+    "struct ContentView: View {\n    @StateObject var model = ViewModel()\n    var body: some View {\n        NavigationView { List { VStack { HStack {} } } }\n    }\n}",
+    "const [count, setCount] = useState(0);\nuseEffect(() => {}, []);\n// Redux Store via Context API\nexport default Component;",
+    "import pandas\nimport numpy\ndf = pandas.DataFrame()\nnp = numpy.array([1])\n\n\nimport matplotlib\nfrom sklearn import svm",
+    "USESTATE and UseEffect in shouting case\nSWIFTUI\nCOMBINE",
+    "Zwölf Straße: ViewModel and LiveData\nİstanbul ROOM Fragment",
+    "fetch('/api').then(JSON.parse) // Promises, Async/await\nlocalStorage.setItem('k', 'v')\nNode.js Express Webpack Babel",
+    "a\r\nRecyclerView\r\nActivity\n" * 5,
+]
+
+class TestPatternContext:
+    """Context lines located from match offsets agree with rescanning every line"""
+
+    @pytest.fixture
+    def engine(self):
+        return storage.IntelligenceEngine(None)
+
+    @pytest.mark.parametrize("content", PATTERN_CONTENTS)
+    @pytest.mark.parametrize("technology", ["swift", "android", "React", "python", "JavaScript", "rust"])
+    def test_matches_reference(self, engine, content, technology):
+        assert engine.analyze_code_patterns(content, technology) == _reference_patterns(engine, content, technology)
+
+    @pytest.mark.parametrize("content", [
+        "useState\n" * 30,
+        "x\n" * 10 + "useState here\n" + "y\n" * 10,
+        "useState",
+        "useEffect(() => {\n  useState(0)\n})",
+    ])
+    def test_repeated_and_edge_hits(self, engine, content):
+        assert engine.analyze_code_patterns(content, "react") == _reference_patterns(engine, content, "react")
+
+    @pytest.mark.parametrize("hit_lines, expected", [
+        ([], ""),
+        ([0], "l0\nl1\nl2"),
+        ([5], "l3\nl4\nl5\nl6\nl7"),
+        ([19], "l17\nl18\nl19"),
+        ([0, 1, 2, 3, 4], "l0\nl1\nl2\nl0\nl1\nl2\nl3\nl0\nl1\nl2"),
+    ])
+    def test_extract_pattern_context(self, engine, hit_lines, expected):
+        lines = [f"l{i}" for i in range(20)]
+        assert engine._extract_pattern_context(lines, hit_lines) == expected
+
+class TestCodePatternScanning:
+    """Every scanner backend reports the same patterns as plain substring search"""
+
+    @pytest.fixture(params=["hyperscan", "ahocorasick", "without_automaton"])
+    def engine(self, request):
+        engine = storage.IntelligenceEngine(None)
+        if request.param == "hyperscan" and not engine._pattern_databases:
+            pytest.skip("hyperscan not installed")
+        if request.param == "ahocorasick" and not engine._pattern_automata:
+            pytest.skip("pyahocorasick not installed")
+        if request.param != "hyperscan":
+            engine._pattern_databases = {}
+        if request.param == "without_automaton":
+            engine._pattern_automata = {}
+        return engine
+
+    @pytest.mark.parametrize("content", PATTERN_CONTENTS)
+    @pytest.mark.parametrize("technology", ["swift", "android", "React", "python", "JavaScript", "rust"])
+    def test_matches_reference(self, engine, content, technology):
+        assert engine.analyze_code_patterns(content, technology) == _reference_patterns(engine, content, technology)
+
+    @pytest.mark.parametrize("content", PATTERN_CONTENTS)
+    @pytest.mark.parametrize("technologies", [
+        [], ["rust"], ["swift"], ["react", "javascript", "swift"], ["Python", "android", "python"],
+    ])
+    def test_multi_technology_matches_concatenated_reference(self, engine, content, technologies):
+        expected = [pattern for technology in technologies for pattern in _reference_patterns(engine, content, technology)]
+        assert engine.analyze_code_patterns_multi(content, technologies) == expected
+
+    @pytest.mark.parametrize("content", PATTERN_CONTENTS)
+    def test_scan_file_matches_reference(self, engine, tmp_path, content):
+        path = tmp_path / "source.txt"
+        path.write_bytes(content.encode('utf-8'))
+        expected = _reference_patterns(engine, content.replace('\r\n', '\n'), "android")
+        assert engine.scan_file(str(path), "android") == expected
+
+    def test_scan_file_skips_unreadable_files(self, engine, tmp_path):
+        path = tmp_path / "binary.kt"
+        path.write_bytes(b"\xff\xfe Activity")
+        assert engine.scan_file(str(path), "android") == []
+        assert engine.scan_file(str(tmp_path / "missing.kt"), "android") == []
+
+class TestGeneratedPatternScanner:
+    """Scanners generated per word list find every (overlapping) occurrence"""
+
+    @staticmethod
+    def _reference(words, content_lower):
+        offsets = {}
+        for word in words:
+            hits = [i for i in range(len(content_lower)) if content_lower.startswith(word, i)]
+            if hits:
+                offsets[word] = hits
+        return offsets
+
+    @pytest.mark.parametrize("words, content_lower", [
+        ([], "anything"),
+        (["usestate"], ""),
+        (["aa", "a"], "aaaa"),
+        (["it's", 'say "hi"', "back\\slash", "{braces}"], 'it\'s back\\slash: say "hi" {braces} it\'s'),
+        (["straße", "zwölf"], "zwölf straße und straßen"),
+        (["\n", "line\nbreak"], "a line\nbreak\n"),
+    ])
+    def test_matches_reference(self, words, content_lower):
+        assert storage._compile_pattern_scanner(words)(content_lower) == self._reference(words, content_lower)
+
+    @pytest.mark.parametrize("content", PATTERN_CONTENTS)
+    def test_engine_scanners_match_reference(self, content):
+        engine = storage.IntelligenceEngine(None)
+        content_lower = content.lower()
+        for tech, words in engine._pattern_words.items():
+            assert engine._pattern_scanners[tech](content_lower) == self._reference(words, content_lower)
+
+PROJECT_FILES = {
+    "package.json": "{}",
+    "requirements.txt": "pandas",
+    "src/App.jsx": "const [count, setCount] = useState(0);\nuseEffect(() => {}, []);",
+    "src/api.js": "fetch('/api').then(r => r.json()) // Promises\nlocalStorage.getItem('k')",
+    "src/components/List.tsx": "export default function List() { return useContext(Store) }",
+    "src/legacy.JS": "useState in an upper-case extension",
+    "analysis/report.py": "import pandas\nimport numpy\nfrom sklearn import svm",
+    "node_modules/lib/index.js": "Webpack Babel Express",
+    "build/bundle.js": "useState useEffect",
+    "venv/lib/site.py": "import matplotlib",
+}
+
+@pytest.fixture
+def project(tmp_path):
+    for name, content in PROJECT_FILES.items():
+        path = tmp_path / "project" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path / "project"
+
+class TestProjectCodeScan:
+    """Project code analysis walks the tree once and keeps the per-technology order"""
+
+    TECH_EXTENSIONS = {"javascript": [".js", ".jsx"], "react": [".jsx", ".tsx"], "python": [".py"]}
+
+    @pytest.fixture
+    def bootstrap(self):
+        return storage.ProjectBootstrapEngine(storage.IntelligenceEngine(None))
+
+    def _reference(self, bootstrap, project_path, technologies):
+        """One pruned walk per (technology, extension), as before the single walk"""
+        patterns = []
+        for tech in technologies:
+            for ext in self.TECH_EXTENSIONS.get(tech, []):
+                for root, dirs, files in os.walk(project_path):
+                    dirs[:] = [d for d in dirs if d not in storage.SKIP_DIRS]
+                    for file in files:
+                        if file.endswith(ext):
+                            patterns.extend(bootstrap.intelligence_engine.scan_file(os.path.join(root, file), tech))
+        return patterns
+
+    @pytest.mark.parametrize("technologies", [
+        [], ["swift"], ["javascript"], ["react", "javascript"], ["javascript", "react", "python"],
+    ])
+    def test_matches_per_technology_walks(self, bootstrap, project, technologies):
+        assert bootstrap._analyze_code_files(str(project), technologies) == \
+            self._reference(bootstrap, str(project), technologies)
+
+    def test_skips_dependency_and_build_directories(self, bootstrap, project, monkeypatch):
+        scanned = []
+        scan_file = bootstrap.intelligence_engine.scan_file
+        monkeypatch.setattr(bootstrap.intelligence_engine, "scan_file",
+                            lambda path, tech: scanned.append(path) or scan_file(path, tech))
+
+        bootstrap._analyze_code_files(str(project), ["javascript", "react", "python"])
+
+        assert sorted(Path(path).relative_to(project).as_posix() for path in scanned) == [
+            "analysis/report.py", "src/App.jsx", "src/App.jsx", "src/api.js", "src/components/List.tsx",
+        ]
+
+    def test_parallel_scan_matches_serial_scan(self, bootstrap, project, monkeypatch):
+        for i in range(40):
+            (project / "src" / f"module_{i}.js").write_text("Promises\n" * (i % 3) + "useState\nJSON")
+        technologies = ["javascript", "react", "python"]
+
+        monkeypatch.setattr(storage, "PARALLEL_SCAN_MIN_FILES", 10 ** 6)
+        serial = bootstrap._analyze_code_files(str(project), technologies)
+        monkeypatch.setattr(storage, "PARALLEL_SCAN_MIN_FILES", 1)
+        assert bootstrap._analyze_code_files(str(project), technologies) == serial
+
+class TestBootstrapAnalysisCache:
+    """Reuse of recent project analyses, keyed by path and git state"""
+
+    @pytest.fixture
+    def counted(self, monkeypatch):
+        """A bootstrap engine counting full project analyses"""
+        bootstrap = storage.ProjectBootstrapEngine(storage.IntelligenceEngine(None))
+        analyses = []
+        analyze = bootstrap._analyze_project
+        monkeypatch.setattr(bootstrap, "_analyze_project", lambda path: analyses.append(path) or analyze(path))
+        return bootstrap, analyses
+
+    def test_unchanged_project_is_analyzed_once(self, counted, project):
+        bootstrap, analyses = counted
+        first = bootstrap.analyze_existing_project(str(project))
+        second = bootstrap.analyze_existing_project(str(project / "src" / ".."))
+
+        assert second is first
+        assert len(analyses) == 1
+        assert first["technologies"] == ["javascript", "python"]
+
+    def test_git_state_change_reanalyzes(self, counted, project):
+        bootstrap, analyses = counted
+        head = project / ".git" / "HEAD"
+        head.parent.mkdir()
+        head.write_text("ref: refs/heads/main\n")
+        bootstrap.analyze_existing_project(str(project))
+
+        stat = head.stat()
+        os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        bootstrap.analyze_existing_project(str(project))
+        bootstrap.analyze_existing_project(str(project))
+
+        assert len(analyses) == 2
+
+    def test_expired_and_invalidated_entries_are_reanalyzed(self, counted, project, monkeypatch):
+        bootstrap, analyses = counted
+        bootstrap.analyze_existing_project(str(project))
+        bootstrap.invalidate(str(project))
+        bootstrap.analyze_existing_project(str(project))
+        assert len(analyses) == 2
+
+        monkeypatch.setattr(storage, "BOOTSTRAP_CACHE_TTL", 0.0)
+        bootstrap.analyze_existing_project(str(project))
+        assert len(analyses) == 3
+
+    def test_cache_is_bounded(self, counted, tmp_path, monkeypatch):
+        bootstrap, analyses = counted
+        monkeypatch.setattr(storage, "BOOTSTRAP_CACHE_SIZE", 2)
+        for name in ("a", "b", "c", "a"):
+            (tmp_path / name).mkdir(exist_ok=True)
+            bootstrap.analyze_existing_project(str(tmp_path / name))
+
+        assert len(analyses) == 4
+        assert len(bootstrap._analysis_cache) == 2
+
+class TestSharedSuggestionTables:
+    """Suggestion and decision tables are shared; callers get copies they may edit"""
+
+    @pytest.mark.parametrize("project_type", ["ios_app", "android_app", "react_web", "python_analytics"])
+    def test_suggestions_are_copies(self, project_type):
+        engine = storage.IntelligenceEngine(None)
+        first = engine.generate_intelligent_suggestions(project_type, [])
+        for suggestion in first:
+            suggestion["confidence"] = 0.0
+
+        assert first
+        assert all(suggestion["confidence"] > 0 for suggestion in engine.generate_intelligent_suggestions(project_type, []))
+
+    def test_architectural_decisions_are_read_only(self):
+        decisions = storage._architectural_decisions(("react", "python"))
+
+        assert [decision["decision"] for decision in decisions] == ["Uses react technology", "Uses python technology"]
+        with pytest.raises(TypeError):
+            decisions[0]["confidence"] = 0.0
+
+class _FakeCollection:
+    """Records upserts, failing the first `failures` calls"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.upserts = []
+
+    def upsert(self, documents, metadatas, ids):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("vector store unavailable")
+        self.upserts.append(list(ids))
+
+class TestBackgroundVectorWrites:
+    """Queued vector upserts: batching, retries and flushing on close"""
+
+    @pytest.fixture
+    def vectors(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "VECTOR_WRITE_RETRY_DELAY", 0.0)
+        manager = storage.VectorStoreManager(str(tmp_path / "chroma"))
+        collections = {}
+        monkeypatch.setattr(manager, "_get_or_create", lambda project_type: collections.setdefault(project_type, _FakeCollection()))
+        manager.fake_collections = collections
+        yield manager
+        manager.close()
+
+    def test_close_writes_everything_queued(self, vectors):
+        vectors.enqueue_contexts(["a", "b"], ["x", "y"], [{}, {}], "react_web")
+        vectors.enqueue_contexts(["c"], ["z"], [{}], "swift_ios")
+        vectors.enqueue_contexts([], [], [], "react_web")
+        vectors.close()
+
+        written = {project_type: sum(c.upserts, []) for project_type, c in vectors.fake_collections.items()}
+        assert written == {"react_web": ["a", "b"], "swift_ios": ["c"]}
+
+    @pytest.mark.parametrize("failures, written", [(0, True), (2, True), (storage.VECTOR_WRITE_RETRIES + 1, False)])
+    def test_failed_upserts_are_retried(self, vectors, failures, written):
+        vectors.fake_collections["react_web"] = _FakeCollection(failures)
+        vectors.enqueue_contexts(["a"], ["x"], [{}], "react_web")
+        vectors.flush()
+
+        assert vectors.fake_collections["react_web"].upserts == ([["a"]] if written else [])
@@ -105,7 +105,7 @@ class TestSystemIntegration:
         
         # Test restarting context storage server
         server_name = 'context_storage'
-        initial_pid = self.orchestrator.servers[server_name]['process'].pid
+        initial_pid = self.orchestrator.servers[server_name].process.pid
         
         restart_success = await self.orchestrator.restart_server(server_name)
         assert restart_success, f"Should be able to restart {server_name}"
@@ -114,9 +114,9 @@ class TestSystemIntegration:
         await asyncio.sleep(2)
         
         # Verify new process
-        new_pid = self.orchestrator.servers[server_name]['process'].pid
+        new_pid = self.orchestrator.servers[server_name].process.pid
         assert new_pid != initial_pid, "Server should have new PID after restart"
-        assert self.orchestrator.servers[server_name]['status'] == 'running', "Server should be running after restart"
+        assert self.orchestrator.servers[server_name].status == 'running', "Server should be running after restart"
 
 class TestServerCommunication:
     """Tests for inter-server communication and data flow"""
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+AI Agent Context Management System - Intelligence Engine Server Tests
+
+Unit tests for the intelligence engine's developer profiling and anti-pattern
+detection, run in-process without starting the MCP server.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+from collections import Counter
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.servers import intelligence_engine_server as engine
+
+@pytest.fixture
+def analyzer():
+    return engine.DeveloperProfileAnalyzer()
+
+def _activity(lines_written=150):
+    return {
+        'projects': [{
+            'id': 'app', 'technology': 'react', 'duration_weeks': 4, 'completion_rate': 0.8,
+            'patterns_used': ['Hooks'], 'issues_resolved': 3, 'code_quality_score': 0.7
+        }],
+        'code_sessions': [{
+            'session_id': 's1', 'technology': 'react', 'duration_minutes': 60, 'lines_written': lines_written,
+            'bugs_introduced': 1, 'bugs_fixed': 2, 'research_time_minutes': 10
+        }],
+        'search_history': [{'query': 'react hooks tutorial', 'technology': 'react', 'success': True}]
+    }
+
+class TestDeveloperDnaCache:
+    """Reuse of developer DNA profiles for unchanged activity"""
+
+    @pytest.fixture
+    def counted(self, analyzer, monkeypatch):
+        """The analyzer fed from a mutable activity payload, counting profile computations"""
+        state = {'activity': _activity(), 'computed': 0}
+        compute = analyzer._compute_developer_dna
+
+        async def fetch(user_id):
+            return state['activity']
+
+        def counting_compute(*args):
+            state['computed'] += 1
+            return compute(*args)
+
+        monkeypatch.setattr(analyzer, '_fetch_developer_activity', fetch)
+        monkeypatch.setattr(analyzer, '_compute_developer_dna', counting_compute)
+        return state
+
+    @pytest.mark.asyncio
+    async def test_unchanged_activity_is_served_from_cache(self, analyzer, counted):
+        first = await analyzer.analyze_developer_dna('dev')
+        second = await analyzer.analyze_developer_dna('dev')
+
+        assert counted['computed'] == 1
+        assert {k: v for k, v in second.items() if k != 'profile_generated'} == \
+            {k: v for k, v in first.items() if k != 'profile_generated'}
+        assert second['profile_generated'] >= first['profile_generated']
+
+    @pytest.mark.asyncio
+    async def test_mutating_a_profile_does_not_reach_the_cache(self, analyzer, counted):
+        first = await analyzer.analyze_developer_dna('dev')
+        expected = first['coding_patterns']['productivity_metrics']['avg_lines_per_minute']
+        first['coding_patterns']['productivity_metrics']['avg_lines_per_minute'] = -1
+        first['technology_expertise'].clear()
+        del first['recommendations']
+
+        second = await analyzer.analyze_developer_dna('dev')
+        assert second['coding_patterns']['productivity_metrics']['avg_lines_per_minute'] == expected
+        assert second['technology_expertise']
+        assert 'recommendations' in second
+
+    @pytest.mark.asyncio
+    async def test_changed_activity_or_user_recomputes(self, analyzer, counted):
+        await analyzer.analyze_developer_dna('dev')
+        await analyzer.analyze_developer_dna('other')
+        counted['activity'] = _activity(lines_written=300)
+        await analyzer.analyze_developer_dna('dev')
+
+        assert counted['computed'] == 3
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_recomputed(self, analyzer, counted, monkeypatch):
+        monkeypatch.setattr(engine, 'DNA_CACHE_TTL', 0.0)
+        await analyzer.analyze_developer_dna('dev')
+        await analyzer.analyze_developer_dna('dev')
+
+        assert counted['computed'] == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, analyzer, counted, monkeypatch):
+        monkeypatch.setattr(engine, 'DNA_CACHE_SIZE', 2)
+        for user_id in ('a', 'b', 'c', 'a'):
+            await analyzer.analyze_developer_dna(user_id)
+
+        assert counted['computed'] == 4
+        assert len(analyzer._dna_cache) == 2
+
+class TestCrossTechInsights:
+    """Knowledge transfer opportunities between strong and weak technologies"""
+
+    def test_strong_react_weak_swift_yields_react_to_swift(self, analyzer):
+        insights = analyzer._generate_cross_tech_insights({'proficiency_scores': {'react': 0.9, 'swift': 0.3}})
+
+        assert insights['transfer_opportunities'] == [{
+            'from_technology': 'react',
+            'to_technology': 'swift',
+            'transfer_potential': pytest.approx(0.63),
+            'recommended_concepts': ['Component architecture', 'State management', 'Property binding']
+        }]
+
+    @pytest.mark.parametrize("proficiency, expected", [
+        ({'react': 0.9, 'swift': 0.3, 'javascript': 0.2},
+         [('react', 'javascript'), ('react', 'swift')]),
+        ({'android': 0.8, 'python': 0.1, 'javascript': 0.9, 'swift': 0.4},
+         [('android', 'python'), ('javascript', 'python'), ('javascript', 'swift')]),
+        ({'swift': 0.95, 'react': 0.2, 'javascript': 0.1},
+         [('swift', 'react'), ('swift', 'javascript')]),
+    ])
+    def test_opportunities_ordered_by_potential(self, analyzer, proficiency, expected):
+        opportunities = analyzer._generate_cross_tech_insights({'proficiency_scores': proficiency})['transfer_opportunities']
+
+        assert [(o['from_technology'], o['to_technology']) for o in opportunities] == expected
+        potentials = [o['transfer_potential'] for o in opportunities]
+        assert potentials == sorted(potentials, reverse=True)
+
+    @pytest.mark.parametrize("proficiency", [
+        {},
+        {'react': 0.9},
+        {'react': 0.6, 'swift': 0.6},
+        {'android': 0.9, 'swift': 0.1},
+    ])
+    def test_no_opportunities_without_a_similar_strong_and_weak_pair(self, analyzer, proficiency):
+        insights = analyzer._generate_cross_tech_insights({'proficiency_scores': proficiency})
+
+        assert insights['transfer_opportunities'] == []
+
+class TestSynergyScore:
+    """Whole-matrix synergy scoring against the pairwise definition"""
+
+    @staticmethod
+    def _reference(analyzer, proficiency):
+        if len(proficiency) < 2:
+            return 0.0
+        similarity = analyzer._TECH_SIMILARITY
+        scores = []
+        techs = list(proficiency)
+        for i, tech1 in enumerate(techs):
+            for tech2 in techs[i + 1:]:
+                key = (tech1, tech2) if (tech1, tech2) in similarity else (tech2, tech1)
+                if key in similarity:
+                    scores.append(similarity[key] * (proficiency[tech1] + proficiency[tech2]) / 2)
+        return sum(scores) / len(scores) if scores else 0.0
+
+    @pytest.mark.parametrize("proficiency", [
+        {},
+        {'react': 0.9},
+        {'react': 0.9, 'swift': 0.3},
+        {'go': 0.9, 'rust': 0.4},
+        {'react': 0.9, 'go': 0.5},
+        {'swift': 0.2, 'react': 0.8, 'javascript': 0.6, 'python': 0.4, 'android': 1.0},
+        {'javascript': 0.0, 'python': 0.0, 'kotlin': 0.7},
+    ])
+    def test_matches_pairwise_reference(self, analyzer, proficiency):
+        assert analyzer._calculate_synergy_score(proficiency) == pytest.approx(self._reference(analyzer, proficiency))
+
+class TestProficiencyRanking:
+    """Strongest combination and knowledge gaps from a proficiency map"""
+
+    @pytest.mark.parametrize("proficiency, expected", [
+        ({}, None),
+        ({'swift': 0.9}, None),
+        ({'a': 0.5, 'b': 0.5, 'c': 0.5, 'd': 0.5}, ('a', 'b')),
+        ({'a': 0.2, 'b': 0.9, 'c': 0.9, 'd': 0.1}, ('b', 'c')),
+        ({'swift': 0.4, 'react': 0.8, 'python': 0.6}, ('react', 'python')),
+    ])
+    def test_strongest_combination_matches_stable_sort(self, analyzer, proficiency, expected):
+        assert analyzer._find_strongest_combination(proficiency) == expected
+
+    @pytest.mark.parametrize("proficiency, expected", [
+        ({}, []),
+        ({'swift': 0.59, 'react': 0.6, 'python': 0.1}, ['swift', 'python']),
+    ])
+    def test_knowledge_gaps_keep_insertion_order(self, analyzer, proficiency, expected):
+        assert analyzer._identify_knowledge_gaps(proficiency) == expected
+
+class TestSearchClassification:
+    """Search history categories from the joined automaton scan and the per-query fallback"""
+
+    QUERIES = [
+        "How to center a div",
+        "fix TypeError in reducer",
+        "react best practices for hooks",
+        "debug tutorial",
+        "design pattern error handling",
+        "swiftui list performance",
+        "",
+        "HOW TO write a Tutorial",
+        "best\npractice",
+        "prefix-fix-suffix",
+    ]
+
+    @pytest.mark.parametrize("queries", [[], QUERIES[:1], QUERIES, QUERIES * 3, ["general query"] * 4])
+    def test_automaton_matches_fallback(self, analyzer, queries):
+        if analyzer._search_automaton is None:
+            pytest.skip("pyahocorasick not installed")
+        expected = dict(Counter(analyzer._classify_search(query.lower()) for query in queries))
+
+        assert analyzer._analyze_search_types(queries) == expected
+        analyzer._search_automaton = None
+        assert analyzer._analyze_search_types(queries) == expected
+
+    @pytest.mark.parametrize("query, category", [
+        ("best practice for errors", "best_practices"),
+        ("how to fix a crash", "debugging"),
+        ("react tutorial", "learning"),
+        ("swiftui layout", "general"),
+    ])
+    def test_category_precedence(self, analyzer, query, category):
+        assert analyzer._analyze_search_types([query]) == {category: 1}
+
+ANTI_PATTERN_SNIPPETS = [
+    "",
+    "let value = optional!  // force unwrap",
+    "closure { [weak self] in self.update() }",
+    "function(a) { callback(function(b) { window.x = b; }) }",
+    "useEffect(() => { setTimeout(f, 10) }, [dependency])",
+    "from module import thing\nglobal counter",
+    "props.user.props.name passed as prop",
+    "addEventListener listener; setInterval(tick, 1000)" * 40,
+    "VAR X = 1; WINDOW.Y = 2",
+]
+
+class TestAntiPatternDetection:
+    """Anti-pattern detection with and without the indicator automaton"""
+
+    @staticmethod
+    def _reference(detector, code, technology):
+        code_lower = code.lower()
+        return [
+            pattern for pattern in detector.anti_patterns.get(technology, [])
+            if any(indicator in code_lower for indicator in detector._PATTERN_INDICATORS.get(pattern, ()))
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_automaton", [True, False])
+    @pytest.mark.parametrize("code", ANTI_PATTERN_SNIPPETS)
+    @pytest.mark.parametrize("technology", ["swift", "react", "python", "javascript", "android", "go"])
+    async def test_detects_reference_patterns(self, code, technology, use_automaton):
+        detector = engine.AntiPatternDetector()
+        if use_automaton and detector._indicator_automaton is None:
+            pytest.skip("pyahocorasick not installed")
+        if not use_automaton:
+            detector._indicator_automaton = None
+
+        result = await detector.detect_anti_patterns(code, technology)
+
+        expected = self._reference(detector, code, technology)
+        assert [p['pattern'] for p in result['patterns']] == expected
+        assert result['anti_patterns_detected'] == len(expected)
+        for p in result['patterns']:
+            assert p['severity'] == detector._calculate_severity(p['pattern'], code)
+            assert p['confidence'] == detector._calculate_confidence(p['pattern'], code.lower())
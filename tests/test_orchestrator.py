@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+AI Agent Context Management System - Orchestrator Tests
+
+Unit tests for the MCP server orchestrator's registry, configuration and
+server lifecycle. Lifecycle tests launch small stand-in server modules
+instead of the real MCP servers.
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+import json
+import logging
+import signal
+import time
+from pathlib import Path
+import sys
+import os
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import orchestrator as orchestration
+from src.orchestrator import MCPServerOrchestrator
+
+ALL_SERVERS = ['context_storage', 'retrieval_engine', 'intelligence_engine', 'session_manager']
+
+@pytest.fixture(autouse=True)
+def in_project_root(monkeypatch):
+    """Server scripts are registered relative to the project root"""
+    monkeypatch.chdir(project_root)
+
+# Stand-in server modules: one that keeps serving, one that dies on start-up
+FAKE_SERVERS = {
+    'fake_idle_server': "import time\nprint('serving', flush=True)\ntime.sleep(60)\n",
+    'fake_crashing_server': "import sys\nprint('cannot bind port', flush=True)\nsys.exit(3)\n",
+}
+
+@pytest.fixture
+def fake_servers(tmp_path, monkeypatch):
+    """Launch stand-in modules instead of the MCP servers, logging under tmp_path
+
+    Returns a function taking an orchestrator and a {server name: module}
+    map; any process still alive after the test is killed.
+    """
+    for module, source in FAKE_SERVERS.items():
+        (tmp_path / f"{module}.py").write_text(source)
+    monkeypatch.setattr(orchestration, 'LOG_DIR', tmp_path / 'logs')
+    orchestrators = []
+
+    def use(orchestrator, modules):
+        for name, module in modules.items():
+            config = orchestrator.servers[name]
+            config.module = module
+            config.env = {**config.env, 'PYTHONPATH': str(tmp_path)}
+        orchestrators.append(orchestrator)
+        return orchestrator
+
+    yield use
+
+    for orchestrator in orchestrators:
+        for config in orchestrator.servers.values():
+            if config.process is not None and config.process.returncode is None:
+                try:
+                    os.kill(config.process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+async def _signal_when_running(orchestrator, sig):
+    """Deliver a signal to this process once the orchestrator is up"""
+    while not orchestrator.running:
+        await asyncio.sleep(0.05)
+    os.kill(os.getpid(), sig)
+
+IDLE_PAIR = {'context_storage': 'fake_idle_server', 'retrieval_engine': 'fake_idle_server'}
+
+class TestServerSelection:
+    """Managing all servers or only a named subset"""
+
+    def test_manages_every_server_by_default(self):
+        orchestrator = MCPServerOrchestrator()
+
+        assert list(orchestrator.servers) == ALL_SERVERS
+        assert orchestrator.startup_order == ['context_storage', 'retrieval_engine']
+        assert orchestrator.shutdown_order == ['retrieval_engine', 'context_storage']
+
+    @pytest.mark.parametrize("servers, startup_order", [
+        (['session_manager'], []),
+        (['retrieval_engine'], ['retrieval_engine']),
+        (['retrieval_engine', 'context_storage'], ['context_storage', 'retrieval_engine']),
+    ])
+    def test_subset_keeps_only_named_servers(self, servers, startup_order):
+        orchestrator = MCPServerOrchestrator(servers=servers)
+
+        assert list(orchestrator.servers) == servers
+        assert orchestrator.startup_order == startup_order
+        assert [row[0] for row in orchestrator._static_rows] == servers
+
+    def test_subset_still_exports_every_port(self):
+        orchestrator = MCPServerOrchestrator(servers=['context_storage'])
+        env = orchestrator.servers['context_storage'].env
+
+        for name in ALL_SERVERS:
+            assert f"{name.upper()}_PORT" in env
+
+    def test_unknown_server_is_rejected(self):
+        with pytest.raises(ValueError, match="web_ui"):
+            MCPServerOrchestrator(servers=['context_storage', 'web_ui'])
+
+class TestConfigLoading:
+    """--config files feed per-server environment defaults"""
+
+    def test_missing_file_gives_empty_config(self, tmp_path, caplog):
+        assert orchestration.load_config(str(tmp_path / "missing.json")) == {}
+        assert "not found" in caplog.text
+
+    @pytest.mark.parametrize("content", ["{not json", "", "\xff"])
+    def test_malformed_file_is_logged_and_ignored(self, tmp_path, caplog, content):
+        path = tmp_path / "config.json"
+        path.write_bytes(content.encode('latin-1'))
+
+        assert orchestration.load_config(str(path)) == {}
+        assert "Could not load config" in caplog.text
+
+    def test_config_env_applies_to_matching_servers(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('MCP_TEST_SETTING', raising=False)
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"mcpServers": {
+            "context-storage": {"env": {"MCP_TEST_SETTING": "storage"}},
+            "unknown-server": {"env": {"MCP_TEST_SETTING": "ignored"}},
+        }}))
+
+        orchestrator = MCPServerOrchestrator(config_path=str(path))
+
+        assert orchestrator.servers['context_storage'].env['MCP_TEST_SETTING'] == "storage"
+        assert 'MCP_TEST_SETTING' not in orchestrator.servers['retrieval_engine'].env
+
+    def test_shipped_config_loads(self):
+        assert set(orchestration.load_config('config/claude_mcp_config.json')['mcpServers']) >= {
+            'context-storage', 'retrieval-engine'
+        }
+
+class TestShutdownSignals:
+    """Signals wake run() through its shutdown event"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sig", [signal.SIGTERM, signal.SIGINT])
+    async def test_signal_stops_a_running_system(self, fake_servers, sig):
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+        signaller = asyncio.ensure_future(_signal_when_running(orchestrator, sig))
+        try:
+            assert await asyncio.wait_for(orchestrator.run(), timeout=20) is True
+        finally:
+            signaller.cancel()
+
+        assert not orchestrator.running
+        assert {config.status for config in orchestrator.servers.values()} == {'stopped'}
+
+    @pytest.mark.asyncio
+    async def test_second_signal_force_kills(self, fake_servers):
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+        orchestrator._shutdown_event = asyncio.Event()
+        assert await orchestrator.start_all()
+
+        orchestrator._request_shutdown(signal.SIGTERM)
+        assert orchestrator._shutdown_event.is_set()
+        assert all(config.process.returncode is None for config in orchestrator.servers.values() if config.process)
+
+        orchestrator._request_shutdown(signal.SIGTERM)
+        for name in IDLE_PAIR:
+            assert await asyncio.wait_for(orchestrator.servers[name].process.wait(), timeout=5) == -signal.SIGKILL
+
+class TestConcurrentLifecycle:
+    """Servers start and stop together, and a failed start-up is rolled back"""
+
+    @pytest.mark.asyncio
+    async def test_start_and_shutdown_all(self, fake_servers):
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+
+        assert await orchestrator.start_all()
+        assert orchestrator.running
+        assert [orchestrator.servers[name].status for name in IDLE_PAIR] == ['running', 'running']
+
+        assert await orchestrator.shutdown_all()
+        assert not orchestrator.running
+        assert {config.status for config in orchestrator.servers.values()} == {'stopped'}
+
+    @pytest.mark.asyncio
+    async def test_failed_start_stops_the_others(self, fake_servers):
+        orchestrator = fake_servers(MCPServerOrchestrator(), {
+            'context_storage': 'fake_idle_server', 'retrieval_engine': 'fake_crashing_server'
+        })
+
+        assert not await orchestrator.start_all()
+        assert not orchestrator.running
+        assert orchestrator.servers['context_storage'].status == 'stopped'
+        assert orchestrator.servers['retrieval_engine'].status == 'failed'
+
+    @pytest.mark.asyncio
+    async def test_start_probes_overlap(self, fake_servers, monkeypatch):
+        monkeypatch.setattr(orchestration, 'STARTUP_GRACE_PERIOD', 1.0)
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await orchestrator.start_all()
+        # Back to back, the two grace periods alone would take 2s
+        assert loop.time() - started < 1.9
+
+class TestStartupProbe:
+    """Start-up waits on the process instead of sleeping out the grace period"""
+
+    @pytest.mark.asyncio
+    async def test_early_exit_is_reported_without_waiting_out_the_grace_period(self, fake_servers, monkeypatch):
+        monkeypatch.setattr(orchestration, 'STARTUP_GRACE_PERIOD', 30.0)
+        orchestrator = fake_servers(MCPServerOrchestrator(servers=['context_storage']),
+                                    {'context_storage': 'fake_crashing_server'})
+
+        assert not await asyncio.wait_for(orchestrator.start_server('context_storage'), timeout=10)
+        assert orchestrator.servers['context_storage'].status == 'failed'
+        assert orchestrator.servers['context_storage'].process.returncode == 3
+
+    @pytest.mark.asyncio
+    async def test_live_process_counts_as_started(self, fake_servers):
+        orchestrator = fake_servers(MCPServerOrchestrator(servers=['context_storage']),
+                                    {'context_storage': 'fake_idle_server'})
+
+        assert await orchestrator.start_server('context_storage')
+        assert orchestrator.servers['context_storage'].status == 'running'
+        assert orchestrator.servers['context_storage'].process.returncode is None
+        assert await orchestrator.start_server('context_storage')  # Already running
+
+class TestServerLogs:
+    """Server output goes to per-server log files instead of pipes"""
+
+    @pytest.mark.asyncio
+    async def test_output_is_appended_to_the_server_log(self, fake_servers, tmp_path):
+        orchestrator = fake_servers(MCPServerOrchestrator(servers=['context_storage']),
+                                    {'context_storage': 'fake_idle_server'})
+
+        for _ in range(2):
+            assert await orchestrator.start_server('context_storage')
+            assert await orchestrator.stop_server('context_storage')
+
+        assert (tmp_path / 'logs' / 'context_storage.log').read_text().splitlines() == ['serving', 'serving']
+
+    @pytest.mark.asyncio
+    async def test_failure_reports_only_this_run_output(self, fake_servers, tmp_path, caplog):
+        orchestrator = fake_servers(MCPServerOrchestrator(servers=['context_storage']),
+                                    {'context_storage': 'fake_crashing_server'})
+
+        for _ in range(2):
+            caplog.clear()
+            assert not await orchestrator.start_server('context_storage')
+            errors = [record.getMessage() for record in caplog.records if record.levelname == 'ERROR']
+            assert len(errors) == 1
+            assert errors[0].count('cannot bind port') == 1
+            assert 'exit code 3' in errors[0]
+
+        assert (tmp_path / 'logs' / 'context_storage.log').read_text().count('cannot bind port') == 2
+
+async def _wait_for(condition, timeout=10.0):
+    """Wait until condition() holds, failing the test after timeout seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.05)
+
+class TestServerMonitor:
+    """The monitor restarts servers as soon as they exit unexpectedly"""
+
+    @pytest_asyncio.fixture
+    async def monitored(self, fake_servers):
+        """A running orchestrator with its monitor task, stopped afterwards"""
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+        orchestrator._monitor_wakeup = asyncio.Event()
+        assert await orchestrator.start_all()
+        monitor = asyncio.ensure_future(orchestrator.monitor_servers())
+
+        yield orchestrator
+
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+        await orchestrator.shutdown_all()
+
+    @pytest.mark.asyncio
+    async def test_crashed_server_is_restarted(self, monitored):
+        server = monitored.servers['retrieval_engine']
+        crashed = server.process
+        crashed.kill()
+
+        await _wait_for(lambda: server.process is not crashed and server.status == 'running')
+        assert server.process.returncode is None
+
+    @pytest.mark.asyncio
+    async def test_intentional_stop_is_not_restarted(self, monitored):
+        assert await monitored.stop_server('retrieval_engine')
+        await asyncio.sleep(0.5)
+
+        assert monitored.servers['retrieval_engine'].status == 'stopped'
+        assert monitored.servers['retrieval_engine'].process is None
+
+    @pytest.mark.asyncio
+    async def test_servers_started_later_are_watched(self, monitored):
+        assert await monitored.stop_server('retrieval_engine')
+        assert await monitored.start_server('retrieval_engine')
+        server = monitored.servers['retrieval_engine']
+        restarted = server.process
+        restarted.kill()
+
+        await _wait_for(lambda: server.process is not restarted and server.status == 'running')
+
+class TestChildEnvironment:
+    """Child environments are resolved once, with the real environment winning"""
+
+    def test_real_environment_overrides_config_defaults(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('DEBUG', 'false')
+        monkeypatch.setenv('RETRIEVAL_ENGINE_PORT', '9102')
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"mcpServers": {
+            "context-storage": {"env": {"DEBUG": "true", "STORAGE_ONLY": "1"}},
+        }}))
+
+        env = MCPServerOrchestrator(config_path=str(path)).servers['context_storage'].env
+
+        assert env['DEBUG'] == 'false'
+        assert env['STORAGE_ONLY'] == '1'
+        assert env['RETRIEVAL_ENGINE_PORT'] == '9102'
+        assert env['PYTHONPATH'] == str(project_root.resolve())
+
+    def test_servers_without_defaults_share_one_environment(self):
+        orchestrator = MCPServerOrchestrator()
+        envs = [config.env for config in orchestrator.servers.values()]
+
+        assert all(env is envs[0] for env in envs)
+        assert {f"{name.upper()}_PORT" for name in ALL_SERVERS} <= set(envs[0])
+
+class TestScriptValidation:
+    """Server scripts are checked once, when the orchestrator is built"""
+
+    def test_missing_scripts_fail_construction(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        with pytest.raises(FileNotFoundError, match="context_storage_server.py"):
+            MCPServerOrchestrator()
+
+    def test_only_managed_scripts_must_exist(self, tmp_path, monkeypatch):
+        script = tmp_path / 'src' / 'servers' / 'context_storage_server.py'
+        script.parent.mkdir(parents=True)
+        script.touch()
+        monkeypatch.chdir(tmp_path)
+
+        orchestrator = MCPServerOrchestrator(servers=['context_storage'])
+        assert orchestrator.servers['context_storage'].module == 'src.servers.context_storage_server'
+
+def _without_uptime(health):
+    """Health entries minus uptime, which moves between two snapshots"""
+    return {name: {**entry, 'uptime': None} for name, entry in health.items()}
+
+class TestStatusViews:
+    """Status and health reports built from one snapshot of the registry"""
+
+    @pytest_asyncio.fixture
+    async def half_running(self, fake_servers):
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+        assert await orchestrator.start_server('context_storage')
+        yield orchestrator
+        await orchestrator.shutdown_all()
+
+    @pytest.mark.asyncio
+    async def test_status_and_health_agree(self, half_running):
+        status = half_running.get_server_status()
+        health = await half_running.health_check()
+        report = await orchestration.MCPServerManager(half_running).status()
+
+        assert status['system_status'] == 'stopped'
+        assert status['servers'] == report['servers']
+        assert _without_uptime(health['servers']) == _without_uptime(report['health_details'])
+        assert not health['system_healthy'] and not report['system_info']['healthy']
+        assert report['system_info']['server_count'] == len(ALL_SERVERS)
+
+        running = status['servers']['context_storage']
+        assert running['status'] == 'running'
+        assert running['pid'] == half_running.servers['context_storage'].process.pid
+        assert health['servers']['context_storage']['status'] == 'healthy'
+        assert status['servers']['retrieval_engine'] == {
+            'status': 'stopped', 'port': half_running.servers['retrieval_engine'].port,
+            'description': 'Intelligent context retrieval', 'pid': None
+        }
+        assert health['servers']['retrieval_engine']['status'] == 'unhealthy'
+
+    @pytest.mark.asyncio
+    async def test_uptime_comes_from_the_monotonic_clock(self, half_running):
+        half_running.servers['context_storage'].started_ns = time.monotonic_ns() - 5 * 10 ** 9
+        health = await half_running.health_check()
+
+        assert 5.0 <= health['servers']['context_storage']['uptime'] < 6.0
+        assert health['servers']['retrieval_engine']['uptime'] == 0
+
+class TestStatusTable:
+    """The start-up status table"""
+
+    def test_table_lists_every_server_with_its_emoji(self, caplog):
+        orchestrator = MCPServerOrchestrator()
+        orchestrator.servers['context_storage'].status = 'running'
+        orchestrator.servers['retrieval_engine'].status = 'failed'
+        orchestrator.servers['session_manager'].status = 'unknown'
+
+        with caplog.at_level(logging.INFO, logger=orchestration.logger.name):
+            orchestrator._print_server_status()
+
+        assert len(caplog.records) == 1
+        table = caplog.records[0].getMessage()
+        assert "🟢 running" in table and "❌ failed" in table and "🔴 stopped" in table and "⚪ unknown" in table
+        assert ', '.join(str(config.port) for config in orchestrator.servers.values()) in table
+
+    def test_table_is_skipped_below_info(self, caplog, monkeypatch):
+        orchestrator = MCPServerOrchestrator()
+        monkeypatch.setattr(orchestrator, '_static_rows', None)  # Building the table would fail
+
+        with caplog.at_level(logging.WARNING, logger=orchestration.logger.name):
+            orchestrator._print_server_status()
+
+        assert not caplog.records
+
+class TestSupervision:
+    """The monitor is always finished before run() stops the servers"""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_and_awaits_the_monitor(self):
+        orchestrator = MCPServerOrchestrator()
+        orchestrator._shutdown_event = asyncio.Event()
+        finished = []
+
+        async def monitor():
+            try:
+                await asyncio.sleep(60)
+            finally:
+                await asyncio.sleep(0.1)  # Cleanup that must complete before _supervise returns
+                finished.append(True)
+
+        asyncio.get_running_loop().call_later(0.1, orchestrator._shutdown_event.set)
+        await asyncio.wait_for(orchestrator._supervise(monitor()), timeout=5)
+
+        assert finished == [True]
+
+    @pytest.mark.asyncio
+    async def test_monitor_errors_end_the_run(self):
+        orchestrator = MCPServerOrchestrator()
+        orchestrator._shutdown_event = asyncio.Event()
+
+        async def monitor():
+            raise RuntimeError("monitor failed")
+
+        with pytest.raises(RuntimeError, match="monitor failed"):
+            await orchestrator._supervise(monitor())
+
+    @pytest.mark.asyncio
+    async def test_failing_monitor_still_shuts_servers_down(self, fake_servers, monkeypatch):
+        orchestrator = fake_servers(MCPServerOrchestrator(), IDLE_PAIR)
+
+        async def monitor():
+            raise RuntimeError("monitor failed")
+
+        monkeypatch.setattr(orchestrator, 'monitor_servers', monitor)
+
+        assert await asyncio.wait_for(orchestrator.run(), timeout=20) is False
+        assert {config.status for config in orchestrator.servers.values()} == {'stopped'}
+
+    @pytest.mark.asyncio
+    async def test_run_removes_its_signal_handlers(self, fake_servers):
+        orchestrator = fake_servers(MCPServerOrchestrator(), {'context_storage': 'fake_crashing_server'})
+        before = signal.getsignal(signal.SIGTERM)
+
+        assert await asyncio.wait_for(orchestrator.run(), timeout=20) is False
+
+        assert signal.getsignal(signal.SIGTERM) == before
+
+class TestServerManager:
+    """MCPServerManager's per-server actions"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("action", ['start_server', 'stop_server', 'restart_server'])
+    async def test_action_reports_orchestrator_result(self, action):
+        manager = orchestration.MCPServerManager(MCPServerOrchestrator())
+
+        result = await getattr(manager, action)('web_ui')
+
+        assert {key: result[key] for key in ('action', 'server', 'success')} == {
+            'action': action, 'server': 'web_ui', 'success': False
+        }
+        assert isinstance(result['timestamp'], float)
+
+    @pytest.mark.asyncio
+    async def test_actions_drive_the_server(self, fake_servers):
+        manager = orchestration.MCPServerManager(fake_servers(
+            MCPServerOrchestrator(servers=['context_storage']), {'context_storage': 'fake_idle_server'}
+        ))
+        server = manager.orchestrator.servers['context_storage']
+
+        assert (await manager.start_server('context_storage'))['success']
+        first = server.process
+        assert (await manager.restart_server('context_storage'))['success']
+        assert server.process is not first and server.status == 'running'
+        assert (await manager.stop_server('context_storage'))['success']
+        assert server.status == 'stopped'
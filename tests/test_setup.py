@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+AI Agent Context Management System - Setup Script Tests
+
+Unit tests for scripts/setup.py, run inside temporary directories.
+"""
+
+import asyncio
+import pytest
+import importlib.util
+import shlex
+import time
+import os
+import threading
+from pathlib import Path
+import sys
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Loaded by path: a plain "import setup" could pick up another setup module
+_spec = importlib.util.spec_from_file_location("setup_script", project_root / "scripts" / "setup.py")
+setup_script = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(setup_script)
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    """Setup steps work relative to the current directory"""
+    monkeypatch.chdir(tmp_path)
+
+class TestRunCommand:
+    """Setup commands run as argv lists, never through a shell"""
+
+    def test_arguments_are_not_shell_interpreted(self, tmp_path):
+        target = "out; touch injected $(touch substituted)"
+        argv = [sys.executable, "-c", "import sys; open(sys.argv[1], 'w').close()", target]
+
+        assert setup_script.run_command(argv, "Writing a file")
+        assert sorted(path.name for path in tmp_path.iterdir()) == [target]
+
+    def test_failure_reports_stderr(self, capsys):
+        argv = [sys.executable, "-c", "import sys; print('visible', file=sys.stderr); sys.exit(2)"]
+
+        assert not setup_script.run_command(argv, "Failing step")
+        assert "visible" in capsys.readouterr().out
+
+    def test_missing_executable_fails_cleanly(self, tmp_path):
+        assert not setup_script.run_command([str(tmp_path / "no-such-tool")], "Missing tool")
+
+    def test_runs_in_the_given_directory(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        argv = [sys.executable, "-c", "open('here', 'w').close()"]
+
+        assert setup_script.run_command(argv, "Writing a file", cwd=str(tmp_path / "sub"))
+        assert (tmp_path / "sub" / "here").exists()
+
+    def test_command_output_is_discarded(self, capfd):
+        argv = [sys.executable, "-c", "import sys; sys.stdout.write('chatty ' * 200000)"]
+
+        assert setup_script.run_command(argv, "Noisy step")
+        assert "chatty" not in capfd.readouterr().out
+
+class TestPrerequisites:
+    """Prerequisite probes run concurrently"""
+
+    def test_reports_missing_tools(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(setup_script, 'PREREQUISITE_ARGV', (
+            ((sys.executable, "--version"), "Python"),
+            ((str(tmp_path / "no-such-tool"),), "Missing tool"),
+            ((sys.executable, "-c", "raise SystemExit(1)"), "Broken tool"),
+        ))
+
+        assert not setup_script.check_prerequisites()
+        out = capsys.readouterr().out
+        assert "✅ Python is installed" in out
+        assert "Missing prerequisites: Missing tool, Broken tool" in out
+
+    def test_probes_overlap(self, monkeypatch):
+        sleeper = (sys.executable, "-c", "import time; time.sleep(0.5)")
+        monkeypatch.setattr(setup_script, 'PREREQUISITE_ARGV', tuple((sleeper, f"Tool {i}") for i in range(4)))
+
+        started = time.monotonic()
+        assert setup_script.check_prerequisites()
+        assert time.monotonic() - started < 1.5
+
+    def test_argv_is_split_from_the_commands(self):
+        assert setup_script.PREREQUISITE_ARGV == tuple(
+            (tuple(shlex.split(command)), name) for command, name in setup_script.PREREQUISITES
+        )
+
+
+class TestCachedSteps:
+    """Successful steps are skipped until their inputs change"""
+
+    @pytest.fixture
+    def step(self):
+        """A cached step recording its runs; set step.succeeds to make it fail"""
+        def body(*args):
+            body.runs.append(args)
+            return body.succeeds
+
+        body.runs = []
+        body.succeeds = True
+        wrapped = setup_script.cached_step("Demo step", invalidated_by="marker")(body)
+        wrapped.runs = body.runs
+        wrapped.body = body
+        return wrapped
+
+    def test_success_is_cached_per_arguments(self, step, tmp_path):
+        (tmp_path / "marker").touch()
+
+        assert step() and step() and step(True) and step(True)
+        assert step.runs == [(), (True,)]
+
+    def test_failures_are_not_cached(self, step, tmp_path):
+        (tmp_path / "marker").touch()
+        step.body.succeeds = False
+
+        assert not step() and not step()
+        assert len(step.runs) == 2
+
+    def test_changed_inputs_rerun_the_step(self, step, tmp_path):
+        (tmp_path / "marker").touch()
+        step()
+        (tmp_path / "requirements.txt").write_text("requests\n")
+        step()
+        step()
+
+        assert len(step.runs) == 2
+
+    def test_newer_or_missing_marker_reruns_the_step(self, step, tmp_path):
+        marker = tmp_path / "marker"
+        marker.touch()
+        step()
+        cache_mtime = setup_script.SETUP_CACHE_FILE.stat().st_mtime
+        os.utime(marker, (cache_mtime + 10, cache_mtime + 10))
+        step()
+        marker.unlink()
+        step()
+
+        assert len(step.runs) == 3
+
+    def test_no_cache_and_corrupt_cache_rerun_the_step(self, step, tmp_path, monkeypatch):
+        (tmp_path / "marker").touch()
+        step()
+        setup_script.SETUP_CACHE_FILE.write_text("{not json")
+        step()
+        monkeypatch.setattr(setup_script, 'USE_SETUP_CACHE', False)
+        step()
+
+        assert len(step.runs) == 3
+
+    def test_prerequisites_are_probed_every_time(self, monkeypatch):
+        probes = []
+        monkeypatch.setattr(setup_script, 'probe_command', lambda argv: probes.append(argv) or True)
+
+        assert setup_script.check_prerequisites() and setup_script.check_prerequisites()
+        assert len(probes) == 2 * len(setup_script.PREREQUISITE_ARGV)
+
+class TestDirectories:
+    """The project skeleton is created from its distinct path components"""
+
+    EXPECTED = [
+        "src/servers", "src/intelligence", "src/bootstrap", "src/integration", "config/environments",
+        "config/schemas", "tests/unit", "tests/integration", "tests/e2e", "examples/projects",
+        "examples/patterns", "logs",
+    ]
+
+    def test_creates_every_directory(self, tmp_path):
+        assert setup_script.create_basic_directories()
+
+        for directory in self.EXPECTED:
+            assert (tmp_path / directory).is_dir()
+
+    def test_is_idempotent_and_keeps_existing_content(self, tmp_path):
+        (tmp_path / "src" / "servers").mkdir(parents=True)
+        (tmp_path / "src" / "servers" / "server.py").write_text("pass")
+
+        assert setup_script.create_basic_directories()
+        assert setup_script.create_basic_directories()
+        assert (tmp_path / "src" / "servers" / "server.py").read_text() == "pass"
+
+    def test_each_component_is_created_once(self, monkeypatch):
+        created = []
+        mkdir = os.mkdir
+        monkeypatch.setattr(setup_script.os, 'mkdir', lambda path: created.append(path) or mkdir(path))
+
+        setup_script.create_basic_directories()
+
+        assert len(created) == len(set(created))
+        assert set(map(str, created)) == {
+            str(Path(directory).parents[depth]) for directory in self.EXPECTED
+            for depth in range(len(Path(directory).parts) - 1)
+        } | set(self.EXPECTED)
+
+class TestSetupSteps:
+    """Setup steps run along their dependency graph"""
+
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        steps = {
+            "first": (lambda: barrier.wait() is not None, ()),
+            "second": (lambda: barrier.wait() is not None, ()),
+        }
+
+        assert asyncio.run(setup_script.run_setup_steps(steps)) == []
+
+    def test_dependents_wait_for_their_dependencies(self):
+        finished = []
+
+        def step(name, delay=0.0):
+            def run():
+                time.sleep(delay)
+                finished.append(name)
+                return True
+            return run
+
+        steps = {
+            "install": (step("install"), ("venv",)),
+            "venv": (step("venv", 0.2), ()),
+            "hooks": (step("hooks"), ("install",)),
+        }
+
+        assert asyncio.run(setup_script.run_setup_steps(steps)) == []
+        assert finished == ["venv", "install", "hooks"]
+
+    def test_failed_dependency_skips_its_dependents(self):
+        ran = []
+        steps = {
+            "venv": (lambda: ran.append("venv") or False, ()),
+            "install": (lambda: ran.append("install") or True, ("venv",)),
+            "hooks": (lambda: ran.append("hooks") or True, ("install",)),
+            "env": (lambda: ran.append("env") or True, ()),
+        }
+
+        assert asyncio.run(setup_script.run_setup_steps(steps)) == ["venv", "install", "hooks"]
+        assert sorted(ran) == ["env", "venv"]
+
+class TestVenvPip:
+    """pip runs through the venv interpreter without its version check"""
+
+    def test_run_pip_uses_the_venv_interpreter(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(setup_script, 'run_command',
+                            lambda argv, description, cwd=None, env=None: calls.append((argv, env)) or True)
+
+        assert setup_script.install_dependencies.__wrapped__(True)
+
+        (argv, env), = calls
+        assert argv == [str(setup_script.venv_python()), "-m", "pip", "--disable-pip-version-check",
+                        "install", "--no-input", "-r", "requirements-dev.txt"]
+        assert env["PIP_DISABLE_PIP_VERSION_CHECK"] == "1"
+
+class TestWriteFile:
+    """Generated files are written from byte segments in one call"""
+
+    @pytest.mark.parametrize("segments", [(b"",), (b"one segment",), (b"first ", b"second ", b"third")])
+    def test_writes_the_joined_segments(self, tmp_path, segments):
+        path = tmp_path / "out.txt"
+        path.write_bytes(b"previous, longer content that must be truncated")
+
+        setup_script.write_file(path, *segments)
+
+        assert path.read_bytes() == b"".join(segments)
+
+    def test_mode_applies_to_new_files(self, tmp_path):
+        previous = os.umask(0)
+        try:
+            setup_script.write_file(tmp_path / "secret", b"x", mode=0o600)
+        finally:
+            os.umask(previous)
+
+        assert (tmp_path / "secret").stat().st_mode & 0o777 == 0o600
+
+class TestEnvFile:
+    """.env is created atomically and never overwritten"""
+
+    def test_creates_private_env_from_template(self, tmp_path):
+        assert setup_script.create_env_file()
+
+        env_file = tmp_path / ".env"
+        assert env_file.read_bytes() == setup_script.ENV_TEMPLATE
+        assert env_file.stat().st_mode & 0o077 == 0
+
+    def test_existing_env_is_kept(self, tmp_path, capsys):
+        (tmp_path / ".env").write_text("OPENAI_API_KEY=mine\n")
+
+        assert setup_script.create_env_file()
+        assert (tmp_path / ".env").read_text() == "OPENAI_API_KEY=mine\n"
+        assert "already exists" in capsys.readouterr().out
+
+    def test_unwritable_location_fails(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise PermissionError("read-only file system")
+
+        monkeypatch.setattr(setup_script, 'write_file', fail)
+
+        assert not setup_script.create_env_file()
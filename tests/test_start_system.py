@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+AI Agent Context Management System - Startup Script Tests
+
+Unit tests for scripts/start_system.py: argument handling, mode dispatch
+and the shutdown path, run against a stand-in orchestrator.
+"""
+
+import asyncio
+import pytest
+import signal
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+import os
+
+# Add project root and scripts to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "scripts"))
+
+import start_system
+
+class TestLazyImports:
+    """The orchestrator is only imported once it is needed"""
+
+    @pytest.mark.parametrize("argv", [["--help"], ["--mode", "bogus"]])
+    def test_help_and_usage_errors_skip_the_orchestrator(self, argv):
+        code = (
+            "import runpy, sys\n"
+            f"sys.argv = ['start_system.py', *{argv!r}]\n"
+            "try:\n"
+            "    runpy.run_path('scripts/start_system.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('src.orchestrator' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                                capture_output=True, text=True, timeout=60)
+
+        assert result.stdout.strip().splitlines()[-1] == "False"
+
+class TestFastArgs:
+    """Bare --status/--stop skip argparse but parse the same"""
+
+    @pytest.mark.parametrize("argv", [["--status"], ["--stop"]])
+    def test_matches_argparse(self, argv):
+        assert vars(start_system.parse_fast_args(argv)) == vars(start_system.create_parser().parse_args(argv))
+
+    @pytest.mark.parametrize("argv", [
+        [], ["--status", "--debug"], ["--stop", "--config", "other.json"], ["--mode", "testing"], ["--restart"],
+        ["--status=1"],
+    ])
+    def test_other_arguments_fall_back_to_argparse(self, argv):
+        assert start_system.parse_fast_args(argv) is None
+
+class TestChoiceTables:
+    """Module-level mode and server tables drive the parser"""
+
+    def test_parser_choices_come_from_the_tables(self):
+        actions = {action.dest: action for action in start_system.create_parser()._actions}
+
+        assert tuple(actions['mode'].choices) == start_system.MODES
+        assert tuple(actions['server'].choices) == start_system.SERVERS
+
+    def test_servers_match_the_orchestrator_registry(self, monkeypatch):
+        from src.orchestrator import MCPServerOrchestrator
+        monkeypatch.chdir(project_root)
+
+        assert start_system.SERVERS == tuple(MCPServerOrchestrator().servers)
+
+class TestModeDispatch:
+    """Each --mode maps to its mode coroutine through MODE_HANDLERS"""
+
+    def test_every_mode_has_a_handler(self):
+        assert tuple(start_system.MODE_HANDLERS) == start_system.MODES
+
+    @pytest.mark.parametrize("argv, expected", [
+        ([], ('production',)),
+        (["--mode", "production"], ('production',)),
+        (["--mode", "development"], ('development', None)),
+        (["--mode", "development", "--server", "session_manager"], ('development', 'session_manager')),
+        (["--mode", "testing", "--debug"], ('testing',)),
+    ])
+    def test_handler_calls_its_mode(self, monkeypatch, argv, expected):
+        orchestrator = object()
+        monkeypatch.setattr(start_system, 'production_mode', lambda o: o is orchestrator and ('production',))
+        monkeypatch.setattr(start_system, 'development_mode', lambda o, server: o is orchestrator and ('development', server))
+        monkeypatch.setattr(start_system, 'testing_mode', lambda o: o is orchestrator and ('testing',))
+        args = start_system.create_parser().parse_args(argv)
+
+        assert start_system.MODE_HANDLERS[args.mode](orchestrator, args) == expected
+
+class TestPrintBlock:
+    """Multi-line reports go out in one stdout write"""
+
+    def test_single_write(self, monkeypatch):
+        writes = []
+        monkeypatch.setattr(sys, 'stdout', type('Stdout', (), {
+            'write': lambda self, text: writes.append(text), 'flush': lambda self: None
+        })())
+
+        start_system.print_block("first", "", "third")
+
+        assert writes == ["first\n\nthird\n"]
+
+class _StubOrchestrator:
+    """Stand-in orchestrator recording stop_server calls; each stop takes stop_delay seconds"""
+
+    def __init__(self, statuses, stop_delay=0.0):
+        self.servers = {name: SimpleNamespace(status=status, process=None) for name, status in statuses.items()}
+        self.running = True
+        self.stop_delay = stop_delay
+        self.stopped = []
+        self.running_at_stop = []
+
+    async def stop_server(self, name):
+        self.running_at_stop.append(self.running)
+        await asyncio.sleep(self.stop_delay)
+        self.stopped.append(name)
+        self.servers[name].status = 'stopped'
+        return True
+
+class TestShutdownPath:
+    """One bounded, concurrent shutdown however a mode ends"""
+
+    @pytest.mark.asyncio
+    async def test_stops_running_servers_concurrently(self):
+        orchestrator = _StubOrchestrator(
+            {'a': 'running', 'b': 'failed', 'c': 'running', 'd': 'running'}, stop_delay=0.5
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        await start_system.shutdown_servers(orchestrator)
+
+        assert loop.time() - started < 1.0
+        assert sorted(orchestrator.stopped) == ['a', 'c', 'd']
+        assert orchestrator.running_at_stop == [False, False, False]
+
+    @pytest.mark.asyncio
+    async def test_shutdown_is_bounded(self, monkeypatch, capsys):
+        monkeypatch.setattr(start_system, 'SHUTDOWN_TIMEOUT', 0.2)
+        orchestrator = _StubOrchestrator({'a': 'running'}, stop_delay=60)
+
+        await asyncio.wait_for(start_system.shutdown_servers(orchestrator), timeout=5)
+
+        assert "did not stop" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("outcome, expected", [(True, True), (False, False), (RuntimeError("boom"), False)])
+    async def test_mode_result_and_single_shutdown(self, outcome, expected):
+        orchestrator = _StubOrchestrator({'a': 'running'})
+
+        async def mode():
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert await start_system.run_until_stopped(orchestrator, mode()) is expected
+        assert orchestrator.stopped == ['a']
+        assert not orchestrator.running
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sig", [signal.SIGTERM, signal.SIGINT])
+    async def test_stop_signal_cancels_the_mode(self, sig):
+        orchestrator = _StubOrchestrator({'a': 'running'})
+        before = signal.getsignal(signal.SIGTERM)
+        asyncio.get_running_loop().call_later(0.2, os.kill, os.getpid(), sig)
+
+        idle = asyncio.Event().wait()
+        assert await asyncio.wait_for(start_system.run_until_stopped(orchestrator, idle), timeout=5) is True
+
+        assert orchestrator.stopped == ['a']
+        assert signal.getsignal(signal.SIGTERM) == before
+
+class TestWatchServers:
+    """Idle modes wake when a server process exits"""
+
+    @pytest.mark.asyncio
+    async def test_reports_exits_until_none_are_left(self, capsys):
+        orchestrator = _StubOrchestrator({'a': 'running', 'b': 'running', 'c': 'stopped'})
+        for name, code in (('a', 0), ('b', 4)):
+            orchestrator.servers[name].process = await asyncio.create_subprocess_exec(
+                sys.executable, '-c', f'import time, sys; time.sleep(0.2); sys.exit({code})'
+            )
+
+        assert await asyncio.wait_for(start_system.watch_servers(orchestrator, ['a', 'b', 'c']), timeout=10) is False
+
+        assert [orchestrator.servers[name].status for name in 'abc'] == ['failed', 'failed', 'stopped']
+        out = capsys.readouterr().out
+        assert "a server exited with code 0" in out and "b server exited with code 4" in out
+
+    @pytest.mark.asyncio
+    async def test_cancelling_leaves_servers_alone(self):
+        orchestrator = _StubOrchestrator({'a': 'running'})
+        process = orchestrator.servers['a'].process = await asyncio.create_subprocess_exec(
+            sys.executable, '-c', 'import time; time.sleep(60)'
+        )
+        try:
+            watcher = asyncio.ensure_future(start_system.watch_servers(orchestrator, ['a']))
+            await asyncio.sleep(0.2)
+            watcher.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await watcher
+
+            assert process.returncode is None
+            assert orchestrator.servers['a'].status == 'running'
+        finally:
+            process.kill()
+            await process.wait()
+
+class TestExecOrchestrator:
+    """Plain production runs exec into the orchestrator"""
+
+    @pytest.fixture
+    def execs(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(os, 'execvpe', lambda file, argv, env: calls.append((file, argv, env)))
+        return calls
+
+    @pytest.mark.parametrize("debug", [False, True])
+    def test_execs_the_orchestrator_module(self, execs, monkeypatch, debug):
+        monkeypatch.setenv('PYTHONPATH', '/existing')
+        monkeypatch.delenv('LOG_LEVEL', raising=False)
+        args = start_system.create_parser().parse_args(['--config', 'custom.json'] + (['--debug'] if debug else []))
+
+        start_system.exec_orchestrator(args)
+
+        (file, argv, env), = execs
+        assert file == sys.executable
+        assert argv == [sys.executable, '-m', 'src.orchestrator', '--config', 'custom.json']
+        assert env['PYTHONPATH'] == os.pathsep.join([str(start_system.project_root), '/existing'])
+        assert (env.get('LOG_LEVEL') == 'DEBUG') is debug
+
+    @pytest.mark.parametrize("argv, execs_orchestrator", [
+        ([], True),
+        (['--mode', 'production', '--config', 'custom.json'], True),
+        (['--mode', 'testing'], False),
+        (['--mode', 'development', '--server', 'context_storage'], False),
+        (['--restart'], False),
+        (['--status'], False),
+    ])
+    def test_only_plain_production_runs_exec(self, monkeypatch, argv, execs_orchestrator):
+        from src import orchestrator as orchestration
+
+        class Exec(Exception):
+            pass
+
+        class Constructed(Exception):
+            pass
+
+        def fake_exec(args):
+            raise Exec
+
+        def fake_orchestrator(**kwargs):
+            raise Constructed
+
+        monkeypatch.setattr(start_system, 'exec_orchestrator', fake_exec)
+        monkeypatch.setattr(orchestration, 'MCPServerOrchestrator', fake_orchestrator)
+        monkeypatch.setattr(orchestration, 'print_banner', lambda: None)
+        monkeypatch.setattr(sys, 'argv', ['start_system.py', *argv])
+
+        with pytest.raises(Exec if execs_orchestrator else Constructed):
+            asyncio.run(start_system.main())